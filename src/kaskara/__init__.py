@@ -3,7 +3,9 @@ __all__ = (
     "Analysis",
     "InsertionPoint",
     "KaskaraException",
+    "LocalProject",
     "ProgramLoops",
+    "ProgramSnippets",
     "Project",
     "Statement",
     "clang",
@@ -21,7 +23,8 @@ from .exceptions import KaskaraException
 from .insertions import InsertionPoint
 from .loops import ProgramLoops
 from .post_install import post_install
-from .project import Project
+from .project import LocalProject, Project
+from .snippets import ProgramSnippets
 from .statements import Statement
 from .version import __version__
 
@@ -9,10 +9,13 @@ import typing as t
 import attr
 
 if t.TYPE_CHECKING:
+    from collections.abc import Collection
+
     from kaskara.core import FileLocation
     from kaskara.functions import ProgramFunctions
     from kaskara.insertions import ProgramInsertionPoints
     from kaskara.loops import ProgramLoops
+    from kaskara.snippets import ProgramSnippets
     from kaskara.statements import ProgramStatements
 
 
@@ -30,12 +33,18 @@ class Analysis:
         The set of functions within the program.
     statements: ProgramStatements
         The set of statements within the program.
+    insertions: ProgramInsertionPoints
+        The set of points within the program at which statements may be inserted.
+    snippets: ProgramSnippets, optional
+        The distinct snippets within the program, indexed by their content,
+        or :code:`None` if snippets were not extracted by the analyser.
     """
     files: frozenset[str]
     loops: ProgramLoops
     functions: ProgramFunctions
     statements: ProgramStatements
     insertions: ProgramInsertionPoints
+    snippets: ProgramSnippets | None = attr.ib(default=None)
 
     def with_relative_locations(self, base: str) -> Analysis:
         files: set[str] = set()
@@ -51,16 +60,36 @@ class Analysis:
             functions=self.functions.with_relative_locations(base),
             statements=self.statements.with_relative_locations(base),
             insertions=self.insertions.with_relative_locations(base),
+            snippets=self.snippets.with_relative_locations(base) if self.snippets is not None else None,
+        )
+
+    def without_files(self, filenames: Collection[str]) -> Analysis:
+        """Removes the results for the given files, which are relative to the project directory."""
+        return attr.evolve(
+            self,
+            files=frozenset(self.files).difference(filenames),
+            loops=self.loops.without_files(filenames),
+            functions=self.functions.without_files(filenames),
+            statements=self.statements.without_files(filenames),
+            insertions=self.insertions.without_files(filenames),
+            snippets=self.snippets.without_files(filenames) if self.snippets is not None else None,
         )
 
     def merge(self, other: Analysis) -> Analysis:
-        """Merges the results of this analysis and another analysis together."""
+        """Merges the results of this analysis and another analysis together.
+
+        Snippets are only retained if both analyses extracted them.
+        """
+        snippets: ProgramSnippets | None = None
+        if self.snippets is not None and other.snippets is not None:
+            snippets = self.snippets.merge(other.snippets)
         return Analysis(
             files=self.files.union(other.files),
             loops=self.loops.merge(other.loops),
             functions=self.functions.merge(other.functions),
             statements=self.statements.merge(other.statements),
             insertions=self.insertions.merge(other.insertions),
+            snippets=snippets,
         )
 
     def is_inside_loop(self, location: FileLocation) -> bool:
@@ -74,11 +103,14 @@ class Analysis:
         return f is not None and f.return_type == "void"
 
     def to_dict(self) -> dict[str, t.Any]:
-        return {
+        dict_ = {
             "loops": self.loops.to_dict(),
             "functions": self.functions.to_dict(),
             "statements": self.statements.to_dict(),
         }
+        if self.snippets is not None:
+            dict_["snippets"] = self.snippets.to_dict()
+        return dict_
 
     def to_json(self, *, indent: int = 2) -> str:
         return json.dumps(self.to_dict(), indent=indent)
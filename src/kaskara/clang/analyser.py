@@ -2,61 +2,468 @@ from __future__ import annotations
 
 __all__ = ("ClangAnalyser",)
 
+import collections
+import collections.abc
 import contextlib
 import json
+import math
 import os
 import typing as t
 from dataclasses import dataclass, field
 from typing import Any
 
+import attr
 import dockerblade as _dockerblade
 from loguru import logger
 from overrides import overrides
 
 from kaskara.analyser import Analyser
 from kaskara.analysis import Analysis
-from kaskara.clang.analysis import ClangFunction, ClangStatement
-from kaskara.core import FileLocationRange
+from kaskara.clang.analysis import ClangFunction, ClangStatement, StatementFacts
+from kaskara.clang.common import AST_CACHE_LOCATION
+from kaskara.clang.incremental import IncrementalIndex
+from kaskara.compact import decode_compact, require_msgpack
+from kaskara.container import LocalProjectContainer, ProjectContainer
 from kaskara.exceptions import KaskaraException
 from kaskara.functions import ProgramFunctions
+from kaskara.insertions import InsertionPoint, ProgramInsertionPoints
 from kaskara.loops import ProgramLoops
+from kaskara.snippets import ProgramSnippets, Snippet
 from kaskara.statements import ProgramStatements
-from kaskara.util import abs_to_rel_flocrange
+from kaskara.symbols import SymbolTable
+from kaskara.util import abs_to_rel_floc, abs_to_rel_flocrange, as_floc, as_flocrange
 
 if t.TYPE_CHECKING:
-    from collections.abc import Mapping, Sequence
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
 
-    from kaskara.container import ProjectContainer
-    from kaskara.project import Project
+    from kaskara.core import FileLocationRange
+    from kaskara.project import LocalProject, Project
 
 PATH_KASKARA_CLANG = "/opt/kaskara/scripts/kaskara-clang"
 
+# the exit code of a command that is terminated by timeout(1)
+_EXIT_CODE_TIMEOUT = 124
+
 
 @dataclass
 class ClangAnalyser(Analyser):
-    _project: Project
-    _container: ProjectContainer
+    _project: Project | LocalProject
+    _container: ProjectContainer | LocalProjectContainer
     _workdir: str | None = field(default=None)
+    _jobs: int = field(default=1)
+    _use_ast_cache: bool = field(default=False)
+    _compact: bool = field(default=False)
+    _batch_size: int | None = field(default=None)
+    _timeout: int | None = field(default=None)
+    _statement_facts: StatementFacts = field(default_factory=StatementFacts)
+    _failed: set[str] = field(default_factory=set, init=False, repr=False)
+    _argument_files: dict[frozenset[str], str] = field(default_factory=dict, init=False, repr=False)
+    _symbols: SymbolTable = field(default_factory=SymbolTable, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self._jobs < 1:
+            message = f"number of jobs must be positive: {self._jobs}"
+            raise ValueError(message)
+        if self._batch_size is not None and self._batch_size < 1:
+            message = f"batch size must be positive: {self._batch_size}"
+            raise ValueError(message)
+        if self._timeout is not None and self._timeout < 1:
+            message = f"timeout must be positive: {self._timeout}"
+            raise ValueError(message)
+        if self._compact:
+            # fail before the backend is run, rather than once its results are read
+            require_msgpack()
+
+    @property
+    def failed_files(self) -> frozenset[str]:
+        """The files that could not be indexed during the last run of this analyser."""
+        return frozenset(self._failed)
 
     @classmethod
     @contextlib.contextmanager
     @overrides
-    def for_project(cls, project: Project) -> t.Iterator[t.Self]:
-        with project.provision() as container:
-            yield cls(project, container)
+    def for_project(
+        cls,
+        project: Project,
+        *,
+        jobs: int = 1,
+        ast_cache_volume: str | None = None,
+        compact: bool = False,
+        batch_size: int | None = None,
+        timeout: int | None = None,
+        statement_facts: StatementFacts | None = None,
+    ) -> t.Iterator[t.Self]:
+        """Creates an analyser for a given project.
+
+        Parameters
+        ----------
+        project: Project
+            The project that should be analysed.
+        jobs: int
+            The maximum number of translation units that the backend should
+            index concurrently.
+        ast_cache_volume: str, optional
+            The name of a Docker volume in which the serialized AST of each
+            translation unit is cached. Translation units whose AST is cached,
+            and whose sources and headers are unchanged, are not parsed again.
+            The volume is created if it does not exist. Since ASTs are keyed by
+            their compile command and the contents of their files, a volume may
+            be shared by analyses of different versions of the same image.
+        compact: bool
+            Whether the backend should write its results in the compact
+            binary format described in :mod:`kaskara.compact` rather than as
+            newline-delimited JSON. Reading that format requires the msgpack
+            package.
+        batch_size: int, optional
+            The maximum number of translation units that should be indexed
+            by each execution of the backend. If omitted, all translation
+            units are indexed by a single execution. A batch that fails is
+            split until the units that are responsible are isolated; if the
+            project ignores errors, those units are skipped and the results
+            for all others are kept.
+        timeout: int, optional
+            The maximum number of seconds that the backend may spend on each
+            translation unit. A batch is given this many seconds for each
+            unit that it indexes (divided among its jobs).
+        statement_facts: StatementFacts, optional
+            The facts that should be computed for each statement. By default,
+            all facts are computed. Disabling liveness in particular (e.g.,
+            :code:`StatementFacts.profile("no-liveness")`) makes indexing
+            considerably faster.
+
+        Raises
+        ------
+        KaskaraException
+            If the compact format is requested but the msgpack package (i.e.,
+            the :code:`compact` extra) is not installed.
+        """
+        if compact:
+            require_msgpack()
+        volumes = {ast_cache_volume: AST_CACHE_LOCATION} if ast_cache_volume else None
+        with project.provision(volumes=volumes) as container:
+            yield cls(
+                project,
+                container,
+                _jobs=jobs,
+                _use_ast_cache=ast_cache_volume is not None,
+                _compact=compact,
+                _batch_size=batch_size,
+                _timeout=timeout,
+                _statement_facts=statement_facts or StatementFacts(),
+            )
+
+    @classmethod
+    def load_results(
+        cls,
+        project: Project | LocalProject,
+        directory: str,
+    ) -> Analysis:
+        """Loads the results of a previous run of the backend from the host.
+
+        This allows the results of kaskara-clang to be loaded without
+        launching a container, provided that the sources of the project are
+        available on the host at the project directory.
+
+        Parameters
+        ----------
+        project: Project | LocalProject
+            The project to which the results belong.
+        directory: str
+            The directory on the host that holds the loops, functions, and
+            statements files produced by the backend, either as JSON, as
+            newline-delimited JSON, or in the compact binary format. If the directory also holds the insertion
+            points produced by the backend, those are used; otherwise, an
+            insertion point is placed after every statement. Snippets are
+            only loaded if the directory holds them.
+        """
+        container = LocalProjectContainer(project)
+        analyser = cls(project, container)
+
+        def find(name: str) -> str | None:
+            for extension in ("msgpack", "ndjson", "json"):
+                filename = os.path.join(directory, f"{name}.{extension}")
+                if container.files.exists(filename):
+                    return filename
+            return None
+
+        def load(name: str) -> Iterable[t.Any]:
+            filename = find(name)
+            if filename is None:
+                error_message = f"missing {name} results in directory: {directory}"
+                raise KaskaraException(error_message)
+            return analyser._read_records(filename)
+
+        statements = analyser._read_statements_from_jsn(load("statements"))
+        insertions_filename = find("insertion-points")
+        if insertions_filename:
+            insertions = analyser._read_insertions_from_jsn(analyser._read_records(insertions_filename))
+        else:
+            insertions = statements.insertions()
+        snippets_filename = find("snippets")
+        snippets = None
+        if snippets_filename:
+            snippets = analyser._read_snippets_from_jsn(analyser._read_records(snippets_filename))
+        return Analysis(
+            files=project.files,
+            loops=analyser._read_loops_from_jsn(load("loops")),
+            functions=analyser._read_functions_from_jsn(load("functions")),
+            statements=statements,
+            insertions=insertions,
+            snippets=snippets,
+        )
 
     @overrides
     def run(self) -> Analysis:
-        loops = self._find_loops()
-        functions = self._find_functions()
-        statements = self._find_statements()
-        insertions = statements.insertions()
-        return Analysis(
-            files=self._project.files,
+        return self._index_all()
+
+    def run_incremental(
+        self,
+        previous: IncrementalIndex | None = None,
+        *,
+        checkpoint: str | None = None,
+    ) -> IncrementalIndex:
+        """Indexes the project, reusing the results of a previous run wherever possible.
+
+        Only those translation units that were not indexed by the previous
+        run, or whose source or any included (non-system) header has since
+        changed, are indexed again. The results for all other translation
+        units are carried over from the previous run. Since translation units
+        that failed to be indexed are never recorded as up to date, passing
+        the result of a run to the next run retries only those units that
+        failed (or changed).
+
+        Parameters
+        ----------
+        previous: IncrementalIndex, optional
+            The index produced by a previous run on the same project. If
+            omitted, every translation unit is indexed.
+        checkpoint: str, optional
+            The name of a file on the host to which the index is saved after
+            each batch of translation units is indexed. Should the run be
+            interrupted, the index that was last saved to this file may be
+            loaded and passed to a later run to resume it.
+
+        Returns
+        -------
+        IncrementalIndex
+            The up-to-date results for the project, which may be passed to
+            a later run.
+
+        Raises
+        ------
+        KaskaraException
+            If a translation unit fails to be indexed and the project does
+            not ignore errors.
+        """
+        project = self._project
+        units = frozenset(
+            os.path.relpath(os.path.join(project.directory, filename), project.directory)
+            for filename in project.files
+        )
+        if previous is None:
+            previous = IncrementalIndex(self._read_analysis(frozenset()), {})
+
+        digests = self._container.hash_files(previous.tracked_files())
+        outdated = previous.outdated(units, digests)
+        removed = frozenset(previous.dependencies).difference(units)
+        analysis = previous.analysis.without_files(outdated | removed)
+        dependencies: dict[str, Mapping[str, str]] = {
+            unit: unit_dependencies
+            for unit, unit_dependencies in previous.dependencies.items()
+            if unit in units and unit not in outdated
+        }
+        failed: set[str] = set()
+        logger.info(f"indexing {len(outdated)} of {len(units)} translation units")
+
+        index = IncrementalIndex(analysis, dependencies)
+        for batch, result in self._index_batches(outdated, dependencies=True):
+            if result is None:
+                failed.update(batch)
+            else:
+                fresh, unit_to_dependencies = result
+                assert unit_to_dependencies is not None
+                fresh_digests = self._container.hash_files(
+                    frozenset().union(*unit_to_dependencies.values()),
+                )
+                for unit, paths in unit_to_dependencies.items():
+                    # a dependency that could not be hashed is never up to date
+                    dependencies[unit] = {path: fresh_digests.get(path, "") for path in paths}
+                analysis = analysis.merge(fresh)
+            index = IncrementalIndex(analysis, dict(dependencies), frozenset(failed))
+            if checkpoint:
+                index.save(checkpoint)
+
+        return attr.evolve(index, analysis=attr.evolve(index.analysis, files=project.files))
+
+    def _index_all(self) -> Analysis:
+        """Finds all loops, functions, statements, insertion points, and snippets using a single parse of each file."""
+        project = self._project
+        self._failed = set()
+        analysis = self._read_analysis(frozenset())
+        for batch, result in self._index_batches(project.files):
+            if result is None:
+                self._failed.update(batch)
+            else:
+                analysis = analysis.merge(result[0])
+        if self._failed:
+            logger.warning(f"failed to index {len(self._failed)} of {len(project.files)} files")
+        return attr.evolve(analysis, files=project.files)
+
+    def _index_batches(
+        self,
+        files: Iterable[str],
+        *,
+        dependencies: bool = False,
+    ) -> Iterator[tuple[Sequence[str], tuple[Analysis, dict[str, frozenset[str]] | None] | None]]:
+        """Indexes the given translation units in supervised batches.
+
+        A batch that crashes the backend, or that exceeds its time limit, is
+        split in half and each half is retried, until the units that are
+        responsible have been isolated. The results for all other units are
+        kept.
+
+        Returns
+        -------
+        Iterator[tuple[Sequence[str], tuple[Analysis, dict[str, frozenset[str]] | None] | None]]
+            Each batch of translation units, together with the results of
+            :meth:`_index` for that batch, or :code:`None` if the batch
+            consists of a single unit that could not be indexed.
+
+        Raises
+        ------
+        KaskaraException
+            If a translation unit could not be indexed and the project does
+            not ignore errors.
+        """
+        pending = sorted(files)
+        batch_size = self._batch_size or max(len(pending), 1)
+        batches = collections.deque(
+            pending[start:start + batch_size] for start in range(0, len(pending), batch_size)
+        )
+        while batches:
+            batch = batches.popleft()
+            time_limit = None
+            if self._timeout is not None:
+                time_limit = self._timeout * math.ceil(len(batch) / self._jobs)
+            try:
+                result = self._index(batch, dependencies=dependencies, time_limit=time_limit)
+            except KaskaraException as err:
+                if len(batch) > 1:
+                    logger.warning(f"failed to index batch of {len(batch)} files, retrying in smaller batches: {err}")
+                    middle = len(batch) // 2
+                    batches.extendleft([batch[middle:], batch[:middle]])
+                    continue
+                if not self._project.ignore_errors:
+                    raise
+                logger.warning(f"failed to index file [{batch[0]}]: {err}")
+                yield batch, None
+                continue
+            yield batch, result
+
+    def _index(
+        self,
+        files: Iterable[str],
+        *,
+        dependencies: bool = False,
+        time_limit: int | None = None,
+    ) -> tuple[Analysis, dict[str, frozenset[str]] | None]:
+        """Indexes all program elements within a given set of translation units.
+
+        Parameters
+        ----------
+        files: Iterable[str]
+            The translation units that should be indexed.
+        dependencies: bool
+            Whether the files upon which each translation unit depends should
+            also be recorded.
+        time_limit: int, optional
+            The maximum number of seconds for which the backend may run.
+
+        Returns
+        -------
+        tuple[Analysis, dict[str, frozenset[str]] | None]
+            The results of indexing the given translation units and, if
+            requested, the absolute paths of the files upon which each
+            translation unit depends, indexed by the name of the translation
+            unit relative to the project directory.
+        """
+        project = self._project
+        files = frozenset(files)
+        logger.debug(f"indexing all program elements for {len(files)} files in project: {project}")
+        if self._compact:
+            output_option, extension = "--compact", "msgpack"
+        else:
+            output_option, extension = "--ndjson", "ndjson"
+        command_args = ["all", "--omit-content", output_option, "--insertions", "--snippets"]
+        command_args += self._statement_facts.to_backend_args()
+        output_names = ["loops", "functions", "statements", "insertion-points", "snippets"]
+        if dependencies:
+            command_args.append("--dependencies")
+            output_names.append("dependencies")
+        if self._jobs > 1:
+            command_args.append(f"--jobs={self._jobs}")
+        if self._use_ast_cache:
+            command_args.append(f"--ast-cache-dir={AST_CACHE_LOCATION}")
+        command_args.append(self._files_argument(files))
+
+        # unless the compact format is used, each output is streamed from the
+        # container one record at a time
+        output_filenames = self._run_backend(
+            command_args=command_args,
+            output_filenames=[f"{name}.{extension}" for name in output_names],
+            time_limit=time_limit,
+        )
+        loops, functions, statements, insertions, snippets, *rest = map(self._read_records, output_filenames)
+        analysis = self._read_analysis(
+            files,
             loops=loops,
             functions=functions,
             statements=statements,
             insertions=insertions,
+            snippets=snippets,
+        )
+        unit_to_dependencies = self._read_dependencies_from_jsn(rest[0]) if dependencies else None
+        return analysis, unit_to_dependencies
+
+    def _files_argument(self, files: Iterable[str]) -> str:
+        """Returns the argument that passes a given set of files to the backend.
+
+        Rather than being passed on the command line, where large projects
+        would exceed its maximum length, the files are written to an
+        argument file within the container. Each distinct set of files is
+        written only once, and is then shared by every run of the backend.
+        """
+        container = self._container
+        if not isinstance(container, ProjectContainer):
+            error_message = "kaskara-clang can only be executed within a container"
+            raise KaskaraException(error_message)
+
+        files = frozenset(files)
+        filename = self._argument_files.get(files)
+        if filename is None:
+            filename = container.write_argument_file(sorted(files))
+            self._argument_files[files] = filename
+            logger.debug(f"wrote list of {len(files)} files to argument file: {filename}")
+        return f"@{filename}"
+
+    def _read_analysis(
+        self,
+        files: frozenset[str],
+        *,
+        loops: Iterable[Mapping[str, Any]] = (),
+        functions: Iterable[Mapping[str, Any]] = (),
+        statements: Iterable[Mapping[str, Any]] = (),
+        insertions: Iterable[Mapping[str, Any]] = (),
+        snippets: Iterable[Mapping[str, Any]] = (),
+    ) -> Analysis:
+        """Builds an analysis of the given files from the records produced by the backend."""
+        return Analysis(
+            files=files,
+            loops=self._read_loops_from_jsn(loops),
+            functions=self._read_functions_from_jsn(functions),
+            statements=self._read_statements_from_jsn(statements, files),
+            insertions=self._read_insertions_from_jsn(insertions),
+            snippets=self._read_snippets_from_jsn(snippets),
         )
 
     def _execute_command(
@@ -64,18 +471,46 @@ class ClangAnalyser(Analyser):
         command_args: list[str],
         output_filename: str,
     ) -> t.Any:  # noqa: ANN401
+        (output,) = self._execute_command_with_outputs(command_args, [output_filename])
+        return output
+
+    def _execute_command_with_outputs(
+        self,
+        command_args: list[str],
+        output_filenames: Sequence[str],
+    ) -> list[t.Any]:
+        """Executes the backend and loads each of the JSON files that it produces."""
+        output_filenames = self._run_backend(command_args, output_filenames)
+        return [json.loads(self._container.files.read(filename)) for filename in output_filenames]
+
+    def _run_backend(
+        self,
+        command_args: list[str],
+        output_filenames: Sequence[str],
+        time_limit: int | None = None,
+    ) -> list[str]:
+        """Executes the backend and returns the absolute paths of the files that it produces."""
         container = self._container
         project = self._project
         workdir = project.directory
 
+        if not isinstance(container, ProjectContainer):
+            error_message = "kaskara-clang can only be executed within a container"
+            raise KaskaraException(error_message)
+
         driver = PATH_KASKARA_CLANG
         assert os.path.isabs(driver)
         if not container.files.exists(driver):
             error_message = f"driver {driver} does not exist"
             raise KaskaraException(error_message)
 
-        if not os.path.isabs(output_filename):
-            output_filename = os.path.join(workdir, output_filename)
+        output_filenames = [
+            filename if os.path.isabs(filename) else os.path.join(workdir, filename)
+            for filename in output_filenames
+        ]
+
+        # remove the outputs of any previous run so that they can't be mistaken for those of this run
+        container.shell.run(f"rm -f {' '.join(output_filenames)}")
 
         # determine the type of the analysis from the first argument
         analysis_name = command_args[0]
@@ -88,17 +523,25 @@ class ClangAnalyser(Analyser):
         maybe_error_message: str | None = None
         maybe_error: Exception | None = None
         try:
-            maybe_output = container.shell.check_output(command, cwd=workdir, text=True)
+            maybe_output = container.shell.check_output(
+                command,
+                cwd=workdir,
+                text=True,
+                time_limit=time_limit,
+            )
         except _dockerblade.CalledProcessError as err:
             maybe_error = err
             err_message = err.output
             assert isinstance(err_message, str)
-            maybe_error_message = f"failed with exit code {err.returncode}: {err_message}"
+            if err.returncode == _EXIT_CODE_TIMEOUT:
+                maybe_error_message = f"timed out after {time_limit} seconds: {err_message}"
+            else:
+                maybe_error_message = f"failed with exit code {err.returncode}: {err_message}"
 
         if maybe_output:
             logger.debug(f"{analysis_name} output:\n{maybe_output}")
 
-        analysis_completed = container.files.exists(output_filename)
+        analysis_completed = all(container.files.exists(filename) for filename in output_filenames)
 
         if not analysis_completed:
             message = f"{analysis_name}: failed to produce output"
@@ -111,32 +554,84 @@ class ClangAnalyser(Analyser):
             message = f"{analysis_name}: completed with errors:\n{maybe_error_message}"
             logger.warning(message)
 
-        output = container.files.read(output_filename)
-        return json.loads(output)
+        return output_filenames
+
+    def _read_records(self, filename: str) -> Iterator[t.Any]:
+        """Lazily reads the records within a JSON, newline-delimited JSON, or compact file.
+
+        Newline-delimited JSON files are streamed, and each record is decoded
+        only once the previous record has been consumed, so that the output
+        of the backend is never held in memory in its entirety.
+        """
+        if filename.endswith(".msgpack"):
+            data = self._container.files.read(filename, binary=True)
+            assert isinstance(data, bytes)
+            yield from decode_compact(data, self._symbols)
+            return
+
+        if not filename.endswith(".ndjson"):
+            yield from json.loads(self._container.files.read(filename))
+            return
+
+        with self._container.stream_file(filename) as fh:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
 
     def _find_statements(self) -> ProgramStatements:
         project = self._project
         logger.debug(f"finding statements for project: {project}")
 
-        command_args = ["statements"]
-        command_args += sorted(project.files)
+        # rather than copying the source text of each statement into the
+        # output, statements refer by offset to a single shared copy of each file
+        command_args = ["statements", "--omit-content", *self._statement_facts.to_backend_args()]
+        command_args.append(self._files_argument(project.files))
         output_filename = "statements.json"
 
-        output_jsn: Sequence[Mapping[str, Any]] = self._execute_command(
+        output_jsn = self._execute_command(
             command_args=command_args,
             output_filename=output_filename,
         )
+        return self._read_statements_from_jsn(output_jsn)
+
+    def _read_statements_from_jsn(
+        self,
+        jsn: Iterable[Mapping[str, Any]],
+        files: Iterable[str] | None = None,
+    ) -> ProgramStatements:
+        project = self._project
+        if files is None:
+            files = project.files
+        sources = _ProjectSources(
+            self._container,
+            {
+                os.path.relpath(os.path.join(project.directory, filename), project.directory): contents
+                for filename, contents in self._container.read_files(files).items()
+            },
+        )
         statements = ProgramStatements.build(
             project.directory,
-            (ClangStatement.from_dict(project, d) for d in output_jsn),
+            (ClangStatement.from_dict(project, d, sources, self._symbols) for d in jsn),
         )
         logger.debug("finished reading results")
         return statements
 
+    def _read_dependencies_from_jsn(
+        self,
+        jsn: Iterable[Mapping[str, Any]],
+    ) -> dict[str, frozenset[str]]:
+        project = self._project
+        unit_to_dependencies: dict[str, frozenset[str]] = {}
+        for entry in jsn:
+            unit = os.path.relpath(entry["file"], project.directory)
+            unit_to_dependencies[unit] = frozenset(entry["dependencies"])
+        logger.debug("finished reading dependency analysis results")
+        return unit_to_dependencies
+
     def _find_loops(self) -> ProgramLoops:
         project = self._project
         command_args = ["loops"]
-        command_args += sorted(project.files)
+        command_args.append(self._files_argument(project.files))
         output_filename = "loops.json"
 
         output_jsn = self._execute_command(
@@ -148,12 +643,12 @@ class ClangAnalyser(Analyser):
 
     def _read_loops_from_jsn(
         self,
-        jsn: Sequence[Mapping[str, str]],
+        jsn: Iterable[Mapping[str, str]],
     ) -> ProgramLoops:
         project = self._project
         loop_bodies: list[FileLocationRange] = []
         for loop_info in jsn:
-            loc = FileLocationRange.from_string(loop_info["body"])
+            loc = as_flocrange(loop_info["body"])
             loc = abs_to_rel_flocrange(project.directory, loc)
             loop_bodies.append(loc)
         logger.debug("finished reading loop analysis results")
@@ -166,14 +661,118 @@ class ClangAnalyser(Analyser):
         project = self._project
         output_filename = "functions.json"
         command_args = ["functions"]
-        command_args += sorted(project.files)
+        command_args.append(self._files_argument(project.files))
 
         output_jsn = self._execute_command(
             command_args=command_args,
             output_filename=output_filename,
         )
 
+        return self._read_functions_from_jsn(output_jsn)
+
+    def _read_functions_from_jsn(
+        self,
+        jsn: Iterable[Mapping[str, Any]],
+    ) -> ProgramFunctions:
+        project = self._project
         return ProgramFunctions.from_functions(
             project_directory=project.directory,
-            functions=(ClangFunction.from_dict(project, d) for d in output_jsn),
+            functions=(ClangFunction.from_dict(project, d) for d in jsn),
         )
+
+    def _find_insertions(self) -> ProgramInsertionPoints:
+        project = self._project
+        output_filename = "insertion-points.json"
+        command_args = ["insertions"]
+        command_args.append(self._files_argument(project.files))
+
+        output_jsn = self._execute_command(
+            command_args=command_args,
+            output_filename=output_filename,
+        )
+
+        return self._read_insertions_from_jsn(output_jsn)
+
+    def _read_insertions_from_jsn(
+        self,
+        jsn: Iterable[Mapping[str, Any]],
+    ) -> ProgramInsertionPoints:
+        project = self._project
+        points: list[InsertionPoint] = []
+        for point_info in jsn:
+            location = as_floc(point_info["location"])
+            location = abs_to_rel_floc(project.directory, location)
+            points.append(InsertionPoint(location, self._symbols.names(point_info["visible"])))
+        logger.debug("finished reading insertion point analysis results")
+        return ProgramInsertionPoints(points)
+
+    def _find_snippets(self) -> ProgramSnippets:
+        project = self._project
+        output_filename = "snippets.json"
+        command_args = ["snippets"]
+        command_args.append(self._files_argument(project.files))
+
+        output_jsn = self._execute_command(
+            command_args=command_args,
+            output_filename=output_filename,
+        )
+
+        return self._read_snippets_from_jsn(output_jsn)
+
+    def _read_snippets_from_jsn(
+        self,
+        jsn: Iterable[Mapping[str, Any]],
+    ) -> ProgramSnippets:
+        project = self._project
+        snippets: list[Snippet] = []
+        for snippet_info in jsn:
+            locations = (
+                abs_to_rel_flocrange(project.directory, as_flocrange(location))
+                for location in snippet_info["locations"]
+            )
+            snippets.append(Snippet(
+                content=snippet_info["contents"],
+                kind=self._symbols.name(snippet_info["kind"]),
+                reads=self._symbols.names(snippet_info["reads"]),
+                locations=tuple(sorted(locations)),
+            ))
+        logger.debug("finished reading snippet analysis results")
+        return ProgramSnippets(snippets)
+
+
+class _ProjectSources(collections.abc.Mapping[str, bytes]):
+    """Provides the contents of the files of a project, indexed by their relative filename.
+
+    The files of the project are read up front, using a single archive. Any
+    other file, such as one that could not be archived, or one that the
+    backend refers to by a different name (e.g., via a symbolic link), is read
+    individually upon its first use.
+    """
+    def __init__(self, container: ProjectContainer | LocalProjectContainer, contents: dict[str, bytes]) -> None:
+        self._container = container
+        self._contents: dict[str, bytes | None] = dict(contents)
+
+    def __getitem__(self, filename: str) -> bytes:
+        if filename not in self._contents:
+            self._contents[filename] = self._read(filename)
+        contents = self._contents[filename]
+        if contents is None:
+            raise KeyError(filename)
+        return contents
+
+    def __iter__(self) -> Iterator[str]:
+        return (filename for filename, contents in self._contents.items() if contents is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for contents in self._contents.values() if contents is not None)
+
+    def _read(self, filename: str) -> bytes | None:
+        path = os.path.join(self._container.project.directory, filename)
+        logger.debug(f"reading file that was not read with the rest of the project: {path}")
+        try:
+            contents = self._container.files.read(path, binary=True)
+        except (OSError, _dockerblade.exceptions.DockerBladeException) as err:
+            logger.warning(f"failed to read file [{path}]: {err}")
+            return None
+        assert isinstance(contents, bytes)
+        return contents
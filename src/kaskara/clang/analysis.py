@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-__all__ = ("ClangFunction", "ClangStatement")
+__all__ = ("STATEMENT_FACT_PROFILES", "ClangFunction", "ClangStatement", "StatementFacts")
 
 import typing as t
 
@@ -8,15 +8,84 @@ import attr
 from loguru import logger
 from overrides import overrides
 
-from kaskara.core import FileLocationRange
+from kaskara.exceptions import KaskaraException
 from kaskara.functions import Function
+from kaskara.source import SourceSpan
 from kaskara.statements import Statement
-from kaskara.util import abs_to_rel_flocrange
+from kaskara.symbols import SymbolTable
+from kaskara.util import abs_to_rel_flocrange, as_flocrange
 
 if t.TYPE_CHECKING:
     from collections.abc import Mapping
 
-    from kaskara.project import Project
+    from kaskara.core import FileLocationRange
+    from kaskara.project import LocalProject, Project
+
+
+@attr.s(frozen=True, slots=True, auto_attribs=True)
+class StatementFacts:
+    """Describes which of the more expensive facts about each statement should be computed by the backend.
+
+    Facts that are not computed are reported as :code:`None` by each
+    :class:`ClangStatement`, rather than as empty sets.
+
+    Attributes
+    ----------
+    read_write: bool
+        Whether the variables that are read, written, and declared by each
+        statement should be computed.
+    visibility: bool
+        Whether the variables that are visible at each statement should be
+        computed.
+    liveness: bool
+        Whether the variables that are live before and after each statement
+        should be computed. This is by far the most expensive fact, as it
+        requires the control-flow graph of each function to be built.
+    """
+    read_write: bool = True
+    visibility: bool = True
+    liveness: bool = True
+
+    @classmethod
+    def profile(cls, name: str) -> StatementFacts:
+        """Returns the facts that are computed by a named profile.
+
+        The following profiles are provided:
+
+        * :code:`full`: computes all facts.
+        * :code:`no-liveness`: computes all facts except for liveness.
+        * :code:`locations`: computes none of the facts, leaving only the
+          location, source code, and kind of each statement.
+
+        Raises
+        ------
+        KaskaraException
+            If there is no profile with the given name.
+        """
+        try:
+            return _STATEMENT_FACT_PROFILES[name]
+        except KeyError:
+            message = f"unknown statement facts profile: {name}"
+            raise KaskaraException(message) from None
+
+    def to_backend_args(self) -> list[str]:
+        """Returns the backend options that disable each of the facts that should not be computed."""
+        args: list[str] = []
+        if not self.read_write:
+            args.append("--no-read-write")
+        if not self.visibility:
+            args.append("--no-visibility")
+        if not self.liveness:
+            args.append("--no-liveness")
+        return args
+
+
+_STATEMENT_FACT_PROFILES: Mapping[str, StatementFacts] = {
+    "full": StatementFacts(),
+    "no-liveness": StatementFacts(liveness=False),
+    "locations": StatementFacts(read_write=False, visibility=False, liveness=False),
+}
+STATEMENT_FACT_PROFILES: tuple[str, ...] = tuple(_STATEMENT_FACT_PROFILES)
 
 
 @attr.s(frozen=True, slots=True, auto_attribs=True)
@@ -50,13 +119,13 @@ class ClangFunction(Function):
     @classmethod
     def from_dict(
         cls,
-        project: Project,
+        project: Project | LocalProject,
         d: Mapping[str, t.Any],
     ) -> t.Self:
         name = d["name"]
-        location = FileLocationRange.from_string(d["location"])
+        location = as_flocrange(d["location"])
         location = abs_to_rel_flocrange(project.directory, location)
-        body = FileLocationRange.from_string(d["body"])
+        body = as_flocrange(d["body"])
         body = abs_to_rel_flocrange(project.directory, body)
         return_type = d["return-type"]
         is_global = d["global"]
@@ -73,18 +142,22 @@ class ClangFunction(Function):
 
 @attr.s(frozen=True, slots=True, auto_attribs=True)
 class ClangStatement(Statement):
-    content: str
+    _content: str | SourceSpan = attr.ib(eq=str, repr=lambda content: repr(str(content)))
     canonical: str = attr.ib(repr=False)
     kind: str = attr.ib(repr=False)
     location: FileLocationRange
-    reads: frozenset[str] = attr.ib(repr=False)
-    writes: frozenset[str] = attr.ib(repr=False)
-    visible: frozenset[str] = attr.ib(repr=False)
-    declares: frozenset[str] = attr.ib(repr=False)
-    live_before: frozenset[str] = attr.ib(repr=False)
-    live_after: frozenset[str] = attr.ib(repr=False)
+    reads: frozenset[str] | None = attr.ib(repr=False)
+    writes: frozenset[str] | None = attr.ib(repr=False)
+    visible: frozenset[str] | None = attr.ib(repr=False)
+    declares: frozenset[str] | None = attr.ib(repr=False)
+    live_before: frozenset[str] | None = attr.ib(repr=False)
+    live_after: frozenset[str] | None = attr.ib(repr=False)
     requires_syntax: frozenset[str] = attr.ib(repr=False)
 
+    @property
+    def content(self) -> str:
+        return str(self._content)
+
     @overrides
     def with_relative_locations(self, base: str) -> t.Self:
         return attr.evolve(
@@ -99,35 +172,72 @@ class ClangStatement(Statement):
             "canonical": self.canonical,
             "kind": self.kind,
             "location": str(self.location),
-            "reads": list(self.reads),
-            "writes": list(self.writes),
-            "visible": list(self.visible),
-            "decls": list(self.declares),
-            "live_before": list(self.live_before),
-            "live_after": list(self.live_after),
+            "reads": _list_or_none(self.reads),
+            "writes": _list_or_none(self.writes),
+            "visible": _list_or_none(self.visible),
+            "decls": _list_or_none(self.declares),
+            "live_before": _list_or_none(self.live_before),
+            "live_after": _list_or_none(self.live_after),
             "requires_syntax": list(self.requires_syntax),
         }
 
     @classmethod
     def from_dict(
         cls,
-        project: Project,
+        project: Project | LocalProject,
         d: Mapping[str, t.Any],
+        sources: Mapping[str, bytes] | None = None,
+        symbols: SymbolTable | None = None,
     ) -> t.Self:
-        location = FileLocationRange.from_string(d["location"])
+        """Loads a statement from its backend description.
+
+        If the backend reports the byte offsets of the statement within its
+        file and the contents of that file are given in :code:`sources`, indexed
+        by relative filename, then the content of the statement refers to
+        those shared contents rather than holding its own copy.
+
+        Statements that are loaded using the same :code:`symbols` table share
+        a single copy of each symbol name and of each distinct set of names.
+
+        Facts that were not computed by the backend (see
+        :class:`StatementFacts`) are loaded as :code:`None`.
+        """
+        if symbols is None:
+            symbols = SymbolTable()
+
+        def names(field: str) -> frozenset[str] | None:
+            value = d.get(field)
+            return None if value is None else symbols.names(value)
+
+        location = as_flocrange(d["location"])
         location = abs_to_rel_flocrange(project.directory, location)
+        content: str | SourceSpan
+        source = sources.get(location.filename) if sources is not None else None
+        if source is not None and "offsets" in d:
+            start, stop = d["offsets"]
+            content = SourceSpan(source, start, stop)
+        elif "content" in d:
+            content = d["content"]
+        else:
+            error_message = f"missing source code for statement at {location}"
+            raise KaskaraException(error_message)
+
         statement = cls(
-            content=d["content"],
+            content=content,
             canonical=d["canonical"],
-            kind=d["kind"],
+            kind=symbols.name(d["kind"]),
             location=location,
-            reads=frozenset(d.get("reads", [])),
-            writes=frozenset(d.get("writes", [])),
-            visible=frozenset(d.get("visible", [])),
-            declares=frozenset(d.get("decls", [])),
-            live_before=frozenset(d.get("live_before", [])),
-            live_after=frozenset(d.get("live_after", [])),
-            requires_syntax=frozenset(d.get("requires_syntax", [])),
+            reads=names("reads"),
+            writes=names("writes"),
+            visible=names("visible"),
+            declares=names("decls"),
+            live_before=names("live_before"),
+            live_after=names("live_after"),
+            requires_syntax=symbols.names(d.get("requires_syntax", ())),
         )
         logger.trace(f"loaded statement: {statement}")
         return statement
+
+
+def _list_or_none(names: frozenset[str] | None) -> list[str] | None:
+    return None if names is None else list(names)
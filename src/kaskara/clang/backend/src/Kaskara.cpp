@@ -1,10 +1,13 @@
 #include <iostream>
+#include <string>
 
 #include <llvm/Support/CommandLine.h>
 
 #include <clang/Tooling/CommonOptionsParser.h>
 #include <clang/Tooling/Tooling.h>
 
+#include "all/AllIndexer.h"
+#include "common/CompactWriter.h"
 #include "functions/FunctionIndexer.h"
 #include "loops/LoopIndexer.h"
 #include "insertions/InsertionsIndexer.h"
@@ -22,6 +25,88 @@ static cl::SubCommand LoopsSubCmd("loops", "indexes all loops in the program");
 static cl::SubCommand InsertionsSubCmd("insertions", "indexes all insertion points in the program");
 static cl::SubCommand SnippetsSubCmd("snippets", "extracts all snippets in the program");
 static cl::SubCommand StatementsSubCmd("statements", "indexes all statements in the program");
+static cl::SubCommand AllSubCmd("all", "indexes all loops, functions, and statements in the program using a single parse");
+
+static cl::opt<bool> IndexInsertionsWithAll(
+    "insertions",
+    cl::desc("also indexes all insertion points in the program"),
+    cl::cat(KaskaraCategory),
+    cl::sub(AllSubCmd));
+static cl::opt<bool> IndexSnippetsWithAll(
+    "snippets",
+    cl::desc("also extracts all snippets in the program"),
+    cl::cat(KaskaraCategory),
+    cl::sub(AllSubCmd));
+
+static cl::opt<bool> IndexDependenciesWithAll(
+    "dependencies",
+    cl::desc("also records the files upon which each translation unit depends"),
+    cl::cat(KaskaraCategory),
+    cl::sub(AllSubCmd));
+
+static cl::opt<unsigned> Jobs(
+    "jobs",
+    cl::desc("the number of files that should be indexed concurrently"),
+    cl::init(1),
+    cl::cat(KaskaraCategory),
+    cl::sub(AllSubCmd));
+
+static cl::opt<std::string> ASTCacheDir(
+    "ast-cache-dir",
+    cl::desc("the directory in which the serialized AST of each file is cached for reuse"),
+    cl::value_desc("directory"),
+    cl::cat(KaskaraCategory),
+    cl::sub(AllSubCmd));
+
+static cl::opt<bool> OmitStatementContent(
+    "omit-content",
+    cl::desc("omit the source text of statements whose byte offsets are reported"),
+    cl::cat(KaskaraCategory),
+    cl::sub(StatementsSubCmd),
+    cl::sub(AllSubCmd));
+
+static cl::opt<bool> NoReadWrite(
+    "no-read-write",
+    cl::desc("do not compute the variables that are read, written, and declared by each statement"),
+    cl::cat(KaskaraCategory),
+    cl::sub(StatementsSubCmd),
+    cl::sub(AllSubCmd));
+
+static cl::opt<bool> NoVisibility(
+    "no-visibility",
+    cl::desc("do not compute the variables that are visible at each statement"),
+    cl::cat(KaskaraCategory),
+    cl::sub(StatementsSubCmd),
+    cl::sub(AllSubCmd));
+
+static cl::opt<bool> NoLiveness(
+    "no-liveness",
+    cl::desc("do not compute the variables that are live before and after each statement"),
+    cl::cat(KaskaraCategory),
+    cl::sub(StatementsSubCmd),
+    cl::sub(AllSubCmd));
+
+static cl::opt<bool> NDJSON(
+    "ndjson",
+    cl::desc("write each database as newline-delimited JSON (one entry per line) to a .ndjson file"),
+    cl::cat(KaskaraCategory),
+    cl::sub(FunctionsSubCmd),
+    cl::sub(LoopsSubCmd),
+    cl::sub(InsertionsSubCmd),
+    cl::sub(SnippetsSubCmd),
+    cl::sub(StatementsSubCmd),
+    cl::sub(AllSubCmd));
+
+static cl::opt<bool> Compact(
+    "compact",
+    cl::desc("write each database in a compact binary format (MessagePack) to a .msgpack file"),
+    cl::cat(KaskaraCategory),
+    cl::sub(FunctionsSubCmd),
+    cl::sub(LoopsSubCmd),
+    cl::sub(InsertionsSubCmd),
+    cl::sub(SnippetsSubCmd),
+    cl::sub(StatementsSubCmd),
+    cl::sub(AllSubCmd));
 
 // NOTE: code below is used to add arguments to a specific subcommand
 // static cl::opt<std::string> InputFile1(cl::Positional, cl::desc("<input file>"), cl::Required, cl::sub(FunctionsSubCmd));
@@ -29,12 +114,48 @@ static cl::SubCommand StatementsSubCmd("statements", "indexes all statements in
 
 static cl::extrahelp CommonHelp(CommonOptionsParser::HelpMessage);
 
+// response files are expanded by the command-line parser, which allows the
+// source files of large projects to be given without exceeding ARG_MAX
+static cl::extrahelp ResponseFileHelp(
+    "\nSource files (and any other arguments) may also be read from a file that\n"
+    "is given as @<file>. Arguments within the file are separated by whitespace,\n"
+    "and may be quoted.\n");
+
+// writes a database to <name>.json, to <name>.ndjson if --ndjson is given,
+// or to <name>.msgpack if --compact is given
+template <typename Database>
+void write_database(Database const &database, std::string const &name) {
+    if (Compact)
+        write_compact_file(name + ".msgpack", database.to_json());
+    else if (NDJSON)
+        database.to_ndjson_file(name + ".ndjson");
+    else
+        database.to_file(name + ".json");
+}
+
+StatementFacts statement_facts() {
+    StatementFacts facts;
+    facts.read_write = !NoReadWrite;
+    facts.visibility = !NoVisibility;
+    facts.liveness = !NoLiveness;
+    return facts;
+}
+
+void write_statements(StatementDB const &database) {
+    if (Compact)
+        write_compact_file("statements.msgpack", database.to_json(!OmitStatementContent));
+    else if (NDJSON)
+        database.to_ndjson_file("statements.ndjson", !OmitStatementContent);
+    else
+        database.to_file("statements.json", !OmitStatementContent);
+}
+
 int index_functions(
     CommonOptionsParser &optionsParser
 ) {
     llvm::outs() << "indexing functions...\n";
     auto database = IndexFunctions(optionsParser);
-    database->to_file("functions.json");
+    write_database(*database, "functions");
     return 0;
 }
 
@@ -43,7 +164,7 @@ int index_loops(
 ) {
     llvm::outs() << "indexing loops...\n";
     auto database = IndexLoops(optionsParser);
-    database->to_file("loops.json");
+    write_database(*database, "loops");
     return 0;
 }
 
@@ -52,7 +173,7 @@ int index_insertions(
 ) {
     llvm::outs() << "indexing insertions...\n";
     auto database = IndexInsertions(optionsParser);
-    database->to_file("insertion-points.json");
+    write_database(*database, "insertion-points");
     return 0;
 }
 
@@ -61,7 +182,7 @@ int index_snippets(
 ) {
     llvm::outs() << "indexing snippets...\n";
     auto database = IndexSnippets(optionsParser);
-    database->to_file("snippets.json");
+    write_database(*database, "snippets");
     return 0;
 }
 
@@ -69,8 +190,32 @@ int index_statements(
     CommonOptionsParser &optionsParser
 ) {
     llvm::outs() << "indexing statements...\n";
-    auto database = IndexStatements(optionsParser);
-    database->to_file("statements.json");
+    auto database = IndexStatements(optionsParser, statement_facts());
+    write_statements(*database);
+    return 0;
+}
+
+int index_all(
+    CommonOptionsParser &optionsParser
+) {
+    llvm::outs() << "indexing loops, functions, and statements...\n";
+    IndexOptions options;
+    options.insertions = IndexInsertionsWithAll;
+    options.snippets = IndexSnippetsWithAll;
+    options.dependencies = IndexDependenciesWithAll;
+    options.statement_facts = statement_facts();
+    options.jobs = Jobs;
+    options.ast_cache_dir = ASTCacheDir;
+    auto index = IndexAll(optionsParser, options);
+    write_database(*index->loops, "loops");
+    write_database(*index->functions, "functions");
+    write_statements(*index->statements);
+    if (index->insertions)
+        write_database(*index->insertions, "insertion-points");
+    if (index->snippets)
+        write_database(*index->snippets, "snippets");
+    if (index->dependencies)
+        write_database(*index->dependencies, "dependencies");
     return 0;
 }
 
@@ -97,6 +242,8 @@ int main(int argc, const char **argv) {
         return index_snippets(optionsParser);
     } else if (StatementsSubCmd) {
         return index_statements(optionsParser);
+    } else if (AllSubCmd) {
+        return index_all(optionsParser);
     }
 
     llvm::errs() << "No subcommand provided\n";
@@ -0,0 +1,356 @@
+/**
+ * Runs each of the indexers as consumers of a single AST for each file.
+ */
+#include "AllIndexer.h"
+
+#include <string>
+#include <unordered_set>
+#include <vector>
+
+#include <fmt/format.h>
+
+#include <llvm/Support/FileSystem.h>
+#include <llvm/Support/MemoryBuffer.h>
+#include <llvm/Support/Path.h>
+#include <llvm/Support/ThreadPool.h>
+#include <llvm/Support/Threading.h>
+#include <llvm/Support/VirtualFileSystem.h>
+#include <llvm/Support/xxhash.h>
+
+#include <clang/Basic/Version.h>
+#include <clang/Frontend/ASTUnit.h>
+#include <clang/Frontend/CompilerInstance.h>
+#include <clang/Frontend/FrontendAction.h>
+#include <clang/Frontend/MultiplexConsumer.h>
+#include <clang/Frontend/PCHContainerOperations.h>
+#include <clang/Lex/HeaderSearchOptions.h>
+#include <clang/Tooling/Tooling.h>
+
+#include "../dependencies/DependencyIndexer.h"
+#include "../functions/FunctionIndexer.h"
+#include "../insertions/InsertionsIndexer.h"
+#include "../loops/LoopIndexer.h"
+#include "../snippets/SnippetIndexer.h"
+#include "../statements/StatementIndexer.h"
+
+namespace kaskara {
+
+static std::unique_ptr<clang::ASTConsumer> CreateIndexConsumer(
+    clang::ASTContext &ctx,
+    llvm::StringRef in_file,
+    ProgramIndex &index,
+    SnippetConsumerFactory *snippet_consumers,
+    std::unordered_set<std::string> &visited_files
+) {
+  std::vector<std::unique_ptr<clang::ASTConsumer>> consumers;
+  consumers.push_back(CreateLoopConsumer(ctx, in_file, *index.loops));
+  consumers.push_back(CreateFunctionConsumer(ctx, in_file, *index.functions));
+  consumers.push_back(
+    CreateStatementConsumer(ctx, in_file, index.statements.get(), visited_files));
+  if (index.insertions)
+    consumers.push_back(CreateInsertionPointConsumer(ctx, index.insertions.get()));
+  if (snippet_consumers)
+    consumers.push_back(snippet_consumers->newASTConsumer());
+  if (index.dependencies)
+    consumers.push_back(CreateDependencyConsumer(ctx, *index.dependencies));
+  return std::make_unique<clang::MultiplexConsumer>(std::move(consumers));
+}
+
+class IndexAllAction : public clang::ASTFrontendAction
+{
+public:
+  IndexAllAction(ProgramIndex &index,
+                 SnippetConsumerFactory *snippet_consumers,
+                 std::unordered_set<std::string> &visited_files)
+    : index(index),
+      snippet_consumers(snippet_consumers),
+      visited_files(visited_files),
+      clang::ASTFrontendAction()
+  { }
+
+  virtual std::unique_ptr<clang::ASTConsumer> CreateASTConsumer(
+    clang::CompilerInstance &compiler, llvm::StringRef in_file)
+  {
+    return CreateIndexConsumer(compiler.getASTContext(),
+                               in_file,
+                               index,
+                               snippet_consumers,
+                               visited_files);
+  }
+
+private:
+  ProgramIndex &index;
+  SnippetConsumerFactory *snippet_consumers;
+  std::unordered_set<std::string> &visited_files;
+};
+
+class IndexAllActionFactory : public clang::tooling::FrontendActionFactory
+{
+public:
+  IndexAllActionFactory(ProgramIndex &index,
+                        SnippetConsumerFactory *snippet_consumers)
+    : index(index),
+      snippet_consumers(snippet_consumers),
+      visited_files(),
+      clang::tooling::FrontendActionFactory()
+  { }
+
+  std::unique_ptr<clang::FrontendAction> create() override
+  {
+    return std::make_unique<IndexAllAction>(index, snippet_consumers, visited_files);
+  }
+
+private:
+  ProgramIndex &index;
+  SnippetConsumerFactory *snippet_consumers;
+  std::unordered_set<std::string> visited_files;
+};
+
+// resolves the name of a source file, which may be relative, to the absolute
+// path under which it appears in the compilation database. a relative name is
+// matched against the files in the database before falling back to the
+// current working directory, so that the compile command (and AST cache key)
+// of each file is found regardless of where the backend is run from.
+static std::string resolve_source_path(
+    clang::tooling::CompilationDatabase const &compilations,
+    std::string const &file
+) {
+  if (llvm::sys::path::is_absolute(file))
+    return file;
+
+  llvm::SmallString<256> relative(file);
+  llvm::sys::path::remove_dots(relative, /*remove_dot_dot=*/true);
+  std::string suffix = (llvm::Twine(llvm::sys::path::get_separator()) + relative).str();
+
+  std::string match;
+  for (auto const &candidate : compilations.getAllFiles()) {
+    llvm::SmallString<256> normalized(candidate);
+    llvm::sys::path::remove_dots(normalized, /*remove_dot_dot=*/true);
+    if (!llvm::StringRef(normalized).ends_with(suffix))
+      continue;
+    // an ambiguous name is resolved against the working directory instead
+    if (!match.empty() && match != normalized.str().str()) {
+      match.clear();
+      break;
+    }
+    match = normalized.str().str();
+  }
+  if (!match.empty())
+    return match;
+
+  llvm::SmallString<256> absolute(relative);
+  llvm::sys::fs::make_absolute(absolute);
+  return absolute.str().str();
+}
+
+// determines the path of the cached AST for a given file. the path is keyed
+// by the version of clang, the compile command for the file, and the contents
+// of the file. the contents of any included files are not part of the key,
+// since clang checks that those files are unchanged when it loads the AST.
+// returns an empty string if the file has no compile command or can't be read.
+static std::string ast_cache_path(
+    clang::tooling::CompilationDatabase const &compilations,
+    std::string const &file,
+    std::string const &cache_dir
+) {
+  auto commands = compilations.getCompileCommands(file);
+  auto contents = llvm::MemoryBuffer::getFile(file);
+  if (commands.empty() || !contents)
+    return "";
+
+  std::string key = clang::getClangFullVersion();
+  key.push_back('\0');
+  key += file;
+  key.push_back('\0');
+  key += commands[0].Directory;
+  for (auto const &arg : commands[0].CommandLine) {
+    key.push_back('\0');
+    key += arg;
+  }
+  key.push_back('\0');
+  key += contents.get()->getBuffer().str();
+
+  return fmt::format("{0}/{1:016x}.ast", cache_dir, llvm::xxh3_64bits(key));
+}
+
+static std::unique_ptr<clang::ASTUnit> load_cached_ast(std::string const &path)
+{
+  if (!llvm::sys::fs::exists(path))
+    return nullptr;
+
+  llvm::IntrusiveRefCntPtr<clang::DiagnosticsEngine> diagnostics =
+    clang::CompilerInstance::createDiagnostics(new clang::DiagnosticOptions(),
+                                               new clang::IgnoringDiagConsumer());
+  auto pch_operations = std::make_shared<clang::PCHContainerOperations>();
+
+  // fails if the file or any of its included files have changed
+  return clang::ASTUnit::LoadFromASTFile(
+    path,
+    pch_operations->getRawReader(),
+    clang::ASTUnit::LoadEverything,
+    diagnostics,
+    clang::FileSystemOptions(),
+    std::make_shared<clang::HeaderSearchOptions>()
+  );
+}
+
+static void save_cached_ast(clang::ASTUnit &unit, std::string const &path)
+{
+  if (unit.getDiagnostics().hasErrorOccurred())
+    return;
+
+  // write to a temporary file first so that other processes never observe a
+  // partially written AST
+  llvm::SmallString<256> temporary_path;
+  if (llvm::sys::fs::createUniqueFile(path + "-%%%%%%.tmp", temporary_path))
+    return;
+
+  if (unit.Save(temporary_path.str()) ||
+      llvm::sys::fs::rename(temporary_path, path)) {
+    llvm::errs() << "WARNING: failed to cache AST: " << path << "\n";
+    llvm::sys::fs::remove(temporary_path);
+  }
+}
+
+static void IndexASTUnit(
+    clang::ASTUnit &unit,
+    ProgramIndex &index,
+    SnippetConsumerFactory *snippet_consumers,
+    std::unordered_set<std::string> &visited_files
+) {
+  clang::ASTContext &ctx = unit.getASTContext();
+  auto consumer = CreateIndexConsumer(ctx,
+                                      unit.getMainFileName(),
+                                      index,
+                                      snippet_consumers,
+                                      visited_files);
+  consumer->Initialize(ctx);
+  consumer->HandleTranslationUnit(ctx);
+}
+
+static std::unique_ptr<ProgramIndex> IndexFiles(
+    clang::tooling::CompilationDatabase const &compilations,
+    std::vector<std::string> const &files,
+    IndexOptions const &options,
+    llvm::IntrusiveRefCntPtr<llvm::vfs::FileSystem> fs
+) {
+  auto index = std::make_unique<ProgramIndex>();
+  index->loops = std::make_unique<LoopDB>();
+  index->functions = std::make_unique<FunctionDB>();
+  index->statements = std::make_unique<StatementDB>(options.statement_facts);
+  if (options.insertions)
+    index->insertions = std::make_unique<InsertionPointDB>();
+  if (options.dependencies)
+    index->dependencies = std::make_unique<DependencyDB>();
+
+  std::unique_ptr<SnippetConsumerFactory> snippet_consumers;
+  if (options.snippets) {
+    index->snippets = std::make_unique<SnippetDB>();
+    snippet_consumers = std::make_unique<SnippetConsumerFactory>(index->snippets.get());
+  }
+
+  if (options.ast_cache_dir.empty()) {
+    clang::tooling::ClangTool tool(
+      compilations,
+      files,
+      std::make_shared<clang::PCHContainerOperations>(),
+      fs
+    );
+    tool.setDiagnosticConsumer(new clang::IgnoringDiagConsumer());
+    IndexAllActionFactory factory(*index, snippet_consumers.get());
+    tool.run(&factory);
+    return index;
+  }
+
+  // index the AST of each file, reusing the cached AST when there is one
+  std::unordered_set<std::string> visited_files;
+  for (auto const &file : files) {
+    std::string cache_path = ast_cache_path(compilations, file, options.ast_cache_dir);
+    if (!cache_path.empty()) {
+      if (auto unit = load_cached_ast(cache_path)) {
+        IndexASTUnit(*unit, *index, snippet_consumers.get(), visited_files);
+        continue;
+      }
+    }
+
+    clang::tooling::ClangTool tool(
+      compilations,
+      {file},
+      std::make_shared<clang::PCHContainerOperations>(),
+      fs
+    );
+    tool.setDiagnosticConsumer(new clang::IgnoringDiagConsumer());
+    std::vector<std::unique_ptr<clang::ASTUnit>> units;
+    tool.buildASTs(units);
+    for (auto &unit : units) {
+      IndexASTUnit(*unit, *index, snippet_consumers.get(), visited_files);
+      if (!cache_path.empty())
+        save_cached_ast(*unit, cache_path);
+    }
+  }
+  return index;
+}
+
+std::unique_ptr<ProgramIndex> IndexAll(
+    clang::tooling::CommonOptionsParser &optionsParser,
+    IndexOptions const &options
+) {
+  auto const &compilations = optionsParser.getCompilations();
+  std::vector<std::string> files;
+  for (auto const &file : optionsParser.getSourcePathList())
+    files.push_back(resolve_source_path(compilations, file));
+
+  if (!options.ast_cache_dir.empty()) {
+    if (auto err = llvm::sys::fs::create_directories(options.ast_cache_dir)) {
+      llvm::errs() << "failed to create AST cache directory ["
+                   << options.ast_cache_dir << "]: " << err.message() << "\n";
+      exit(1);
+    }
+  }
+
+  if (options.jobs <= 1 || files.size() <= 1) {
+    return IndexFiles(compilations, files, options, llvm::vfs::getRealFileSystem());
+  }
+
+  // a file that is given more than once is only indexed once
+  std::vector<std::string> unique_files;
+  std::unordered_set<std::string> seen_files;
+  for (auto const &file : files)
+    if (seen_files.insert(file).second)
+      unique_files.push_back(file);
+
+  // index each file in isolation
+  std::vector<std::unique_ptr<ProgramIndex>> file_indices(unique_files.size());
+  {
+    llvm::ThreadPool pool(llvm::hardware_concurrency(options.jobs));
+    for (size_t i = 0; i < unique_files.size(); ++i) {
+      pool.async([&, i] {
+        // each thread uses its own file system so that each can have its
+        // own working directory
+        file_indices[i] = IndexFiles(compilations,
+                                     {unique_files[i]},
+                                     options,
+                                     llvm::vfs::createPhysicalFileSystem());
+      });
+    }
+    pool.wait();
+  }
+
+  // merge the results in the order in which the files were given
+  auto index = std::move(file_indices[0]);
+  for (size_t i = 1; i < file_indices.size(); ++i) {
+    ProgramIndex const &file_index = *file_indices[i];
+    index->loops->merge(*file_index.loops);
+    index->functions->merge(*file_index.functions);
+    index->statements->merge(*file_index.statements);
+    if (index->insertions)
+      index->insertions->merge(*file_index.insertions);
+    if (index->snippets)
+      index->snippets->merge(*file_index.snippets);
+    if (index->dependencies)
+      index->dependencies->merge(*file_index.dependencies);
+  }
+  return index;
+}
+
+}
@@ -0,0 +1,53 @@
+#pragma once
+
+#include <memory>
+#include <string>
+
+#include <clang/Tooling/CommonOptionsParser.h>
+
+#include "../dependencies/DependencyDB.h"
+#include "../functions/FunctionDB.h"
+#include "../insertions/InsertionPointDB.h"
+#include "../loops/LoopDB.h"
+#include "../snippets/SnippetDB.h"
+#include "../statements/StatementDB.h"
+
+namespace kaskara {
+
+// holds the databases produced by indexing a program using a single parse
+struct ProgramIndex {
+  std::unique_ptr<LoopDB> loops;
+  std::unique_ptr<FunctionDB> functions;
+  std::unique_ptr<StatementDB> statements;
+  // only populated if requested
+  std::unique_ptr<InsertionPointDB> insertions;
+  std::unique_ptr<SnippetDB> snippets;
+  std::unique_ptr<DependencyDB> dependencies;
+};
+
+// describes how a program should be indexed
+struct IndexOptions {
+  // also index insertion points and/or snippets
+  bool insertions = false;
+  bool snippets = false;
+  // also record the files upon which each translation unit depends
+  bool dependencies = false;
+  // the facts that should be computed for each statement
+  StatementFacts statement_facts;
+  // the number of files that should be indexed concurrently
+  unsigned jobs = 1;
+  // if non-empty, the directory in which the serialized AST for each file is
+  // cached, allowing files to be indexed without parsing them again
+  std::string ast_cache_dir;
+};
+
+// parses each file once, and uses the resulting AST to index its loops,
+// functions, and statements, and optionally its insertion points and snippets.
+// if more than one job is requested, files are indexed concurrently, and the
+// resulting databases are merged in the order in which the files were given.
+std::unique_ptr<ProgramIndex> IndexAll(
+    clang::tooling::CommonOptionsParser &optionsParser,
+    IndexOptions const &options
+);
+
+}
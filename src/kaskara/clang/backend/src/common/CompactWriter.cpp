@@ -0,0 +1,135 @@
+#include "CompactWriter.h"
+
+#include <cstdio>
+#include <fstream>
+
+using json = nlohmann::json;
+
+namespace kaskara {
+
+static bool is_location_field(std::string const &key)
+{
+  return key == "location" || key == "body";
+}
+
+static bool is_symbol_set_field(std::string const &key)
+{
+  return key == "reads" ||
+         key == "writes" ||
+         key == "visible" ||
+         key == "decls" ||
+         key == "live_before" ||
+         key == "live_after" ||
+         key == "requires_syntax";
+}
+
+CompactWriter::CompactWriter()
+  : files(), file_ids(), symbols(), symbol_ids(), entries(json::array())
+{ }
+
+size_t CompactWriter::file_id(std::string const &filename)
+{
+  auto it = file_ids.find(filename);
+  if (it != file_ids.end())
+    return it->second;
+  size_t id = files.size();
+  files.push_back(filename);
+  file_ids.emplace(filename, id);
+  return id;
+}
+
+size_t CompactWriter::symbol_id(std::string const &symbol)
+{
+  auto it = symbol_ids.find(symbol);
+  if (it != symbol_ids.end())
+    return it->second;
+  size_t id = symbols.size();
+  symbols.push_back(symbol);
+  symbol_ids.emplace(symbol, id);
+  return id;
+}
+
+// converts a location of the form FILE@LINE:COL or FILE@LINE:COL::LINE:COL
+// to an array. locations that can't be parsed are written as they are.
+json CompactWriter::compact_location(json const &location)
+{
+  if (!location.is_string())
+    return location;
+
+  std::string const &str = location.get_ref<std::string const &>();
+  size_t at = str.rfind('@');
+  if (at == std::string::npos)
+    return location;
+
+  std::string position = str.substr(at + 1);
+  unsigned start_line, start_column, end_line, end_column;
+  int consumed = 0;
+  json compact = json::array({file_id(str.substr(0, at))});
+  if (std::sscanf(position.c_str(), "%u:%u::%u:%u%n",
+                  &start_line, &start_column, &end_line, &end_column, &consumed) == 4
+      && consumed == static_cast<int>(position.size())) {
+    compact.push_back(start_line);
+    compact.push_back(start_column);
+    compact.push_back(end_line);
+    compact.push_back(end_column);
+    return compact;
+  }
+  consumed = 0;
+  if (std::sscanf(position.c_str(), "%u:%u%n", &start_line, &start_column, &consumed) == 2
+      && consumed == static_cast<int>(position.size())) {
+    compact.push_back(start_line);
+    compact.push_back(start_column);
+    return compact;
+  }
+  return location;
+}
+
+void CompactWriter::add(json const &entry)
+{
+  json compact = json::object();
+  for (auto const &item : entry.items()) {
+    std::string const &key = item.key();
+    json const &value = item.value();
+    if (is_location_field(key)) {
+      compact[key] = compact_location(value);
+    } else if (key == "locations" && value.is_array()) {
+      json locations = json::array();
+      for (auto const &location : value)
+        locations.push_back(compact_location(location));
+      compact[key] = locations;
+    } else if (key == "kind" && value.is_string()) {
+      compact[key] = symbol_id(value.get<std::string>());
+    } else if (is_symbol_set_field(key) && value.is_array()) {
+      json ids = json::array();
+      for (auto const &symbol : value)
+        ids.push_back(symbol_id(symbol.get<std::string>()));
+      compact[key] = ids;
+    } else {
+      compact[key] = value;
+    }
+  }
+  entries.push_back(std::move(compact));
+}
+
+void CompactWriter::to_file(std::string const &fn) const
+{
+  json j = {
+    {"format", "kaskara-compact"},
+    {"version", VERSION},
+    {"files", files},
+    {"symbols", symbols},
+    {"entries", entries}
+  };
+  std::ofstream o(fn, std::ios::binary);
+  json::to_msgpack(j, o);
+}
+
+void write_compact_file(std::string const &fn, json const &entries)
+{
+  CompactWriter writer;
+  for (auto const &entry : entries)
+    writer.add(entry);
+  writer.to_file(fn);
+}
+
+} // kaskara
@@ -0,0 +1,44 @@
+#pragma once
+
+#include <string>
+#include <unordered_map>
+#include <vector>
+
+#include <nlohmann/json.hpp>
+
+namespace kaskara {
+
+// Writes the entries of a database in a compact binary format (MessagePack)
+// that is decoded by kaskara.compact. Rather than writing each location as a
+// string, locations are written as arrays of the form [file, line, column] or
+// [file, start line, start column, end line, end column], where file is an
+// index into a table of filenames. Kinds and the names within sets of symbols
+// (e.g., reads, writes, and visible) are written as indices into a table of
+// symbols. All other fields are written as they are.
+class CompactWriter
+{
+public:
+  static constexpr int VERSION = 1;
+
+  CompactWriter();
+
+  // adds a JSON entry, converting its locations and symbols to table indices
+  void add(nlohmann::json const &entry);
+  void to_file(std::string const &fn) const;
+
+private:
+  std::vector<std::string> files;
+  std::unordered_map<std::string, size_t> file_ids;
+  std::vector<std::string> symbols;
+  std::unordered_map<std::string, size_t> symbol_ids;
+  nlohmann::json entries;
+
+  size_t file_id(std::string const &filename);
+  size_t symbol_id(std::string const &symbol);
+  nlohmann::json compact_location(nlohmann::json const &location);
+}; // CompactWriter
+
+// writes an array of JSON entries to a given file in the compact format
+void write_compact_file(std::string const &fn, nlohmann::json const &entries);
+
+} // kaskara
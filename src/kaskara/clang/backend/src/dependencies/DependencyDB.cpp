@@ -0,0 +1,68 @@
+#include "DependencyDB.h"
+
+#include <iostream>
+#include <fstream>
+
+using json = nlohmann::json;
+
+namespace kaskara {
+
+DependencyDB::DependencyDB() : contents()
+{ }
+
+DependencyDB::~DependencyDB()
+{ }
+
+DependencyDB::Entry::Entry(std::string const &file,
+                           std::set<std::string> const &dependencies)
+  : file(file), dependencies(dependencies)
+{ }
+
+json const DependencyDB::Entry::to_json() const
+{
+  json j = {
+    {"file", file},
+    {"dependencies", dependencies}
+  };
+  return j;
+}
+
+void DependencyDB::add(std::string const &file,
+                       std::set<std::string> const &dependencies)
+{
+  contents.emplace_back(file, dependencies);
+}
+
+json DependencyDB::to_json() const
+{
+  json j = json::array();
+  for (auto &e : contents)
+    j.push_back(e.to_json());
+  return j;
+}
+
+void DependencyDB::dump() const
+{
+  std::cout << std::setw(2) << to_json() << std::endl;
+}
+
+void DependencyDB::to_file(const std::string &fn) const
+{
+  std::ofstream o(fn);
+  o << std::setw(2) << to_json() << std::endl;
+}
+
+void DependencyDB::to_ndjson_file(const std::string &fn) const
+{
+  std::ofstream o(fn);
+  for (auto const &e : contents)
+    o << e.to_json().dump() << '\n';
+}
+
+void DependencyDB::merge(DependencyDB const &other)
+{
+  for (auto const &e : other.contents)
+    contents.push_back(e);
+}
+
+} // kaskara
@@ -0,0 +1,45 @@
+#pragma once
+
+#include <set>
+#include <string>
+#include <vector>
+
+#include <nlohmann/json.hpp>
+
+namespace kaskara {
+
+// records the files that each translation unit depends upon
+class DependencyDB
+{
+public:
+  DependencyDB();
+  ~DependencyDB();
+
+  class Entry {
+  public:
+    Entry(std::string const &file,
+          std::set<std::string> const &dependencies);
+
+    // the main file of the translation unit
+    std::string file;
+    // the main file and each non-system header that it (transitively) includes
+    std::set<std::string> dependencies;
+
+    nlohmann::json const to_json() const;
+  }; // Entry
+
+  void add(std::string const &file,
+           std::set<std::string> const &dependencies);
+  // appends the entries of another database to this database
+  void merge(DependencyDB const &other);
+  void dump() const;
+  nlohmann::json to_json() const;
+  void to_file(const std::string &fn) const;
+  // writes each entry as a single line of JSON, without building the whole array
+  void to_ndjson_file(const std::string &fn) const;
+
+private:
+  std::vector<Entry> contents;
+}; // DependencyDB
+
+} // kaskara
@@ -0,0 +1,63 @@
+#include "DependencyIndexer.h"
+
+#include <set>
+#include <string>
+
+#include <clang/Basic/SourceManager.h>
+
+namespace kaskara {
+
+class DependencyConsumer : public clang::ASTConsumer
+{
+public:
+  explicit DependencyConsumer(DependencyDB &db)
+    : db(db)
+  { }
+
+  virtual void HandleTranslationUnit(clang::ASTContext &ctx)
+  {
+    clang::SourceManager const &SM = ctx.getSourceManager();
+    auto main_file = SM.getFileEntryRefForID(SM.getMainFileID());
+    if (!main_file)
+      return;
+
+    // the source locations of each file that was entered during the parse,
+    // including those that were loaded from a serialized AST
+    std::set<std::string> dependencies;
+    for (unsigned i = 0; i < SM.local_sloc_entry_size(); ++i)
+      record(SM.getLocalSLocEntry(i), dependencies);
+    for (unsigned i = 0; i < SM.loaded_sloc_entry_size(); ++i)
+      record(SM.getLoadedSLocEntry(i), dependencies);
+
+    db.add(main_file->getFileEntry().tryGetRealPathName().str(), dependencies);
+  }
+
+private:
+  DependencyDB &db;
+
+  static void record(clang::SrcMgr::SLocEntry const &entry,
+                     std::set<std::string> &dependencies)
+  {
+    if (!entry.isFile())
+      return;
+
+    clang::SrcMgr::FileInfo const &file_info = entry.getFile();
+    if (clang::SrcMgr::isSystem(file_info.getFileCharacteristic()))
+      return;
+
+    if (auto file_entry = file_info.getContentCache().OrigEntry) {
+      llvm::StringRef path = file_entry->getFileEntry().tryGetRealPathName();
+      if (!path.empty())
+        dependencies.insert(path.str());
+    }
+  }
+};
+
+std::unique_ptr<clang::ASTConsumer> CreateDependencyConsumer(
+    clang::ASTContext &ctx,
+    DependencyDB &db)
+{
+  return std::make_unique<DependencyConsumer>(db);
+}
+
+}
@@ -0,0 +1,19 @@
+#pragma once
+
+#include <memory>
+
+#include <clang/AST/ASTConsumer.h>
+#include <clang/AST/ASTContext.h>
+
+#include "DependencyDB.h"
+
+namespace kaskara {
+
+// creates a consumer that records the files upon which a translation unit
+// depends. system headers are not recorded.
+std::unique_ptr<clang::ASTConsumer> CreateDependencyConsumer(
+    clang::ASTContext &ctx,
+    DependencyDB &db
+);
+
+}
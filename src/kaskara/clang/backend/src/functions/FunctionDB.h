@@ -37,9 +37,13 @@ public:
   }; // Entry
 
   void add(clang::ASTContext *ctx, clang::FunctionDecl const *decl);
+  // appends the entries of another database to this database
+  void merge(FunctionDB const &other);
   void dump() const;
   nlohmann::json to_json() const;
   void to_file(const std::string &fn) const;
+  // writes each entry as a single line of JSON, without building the whole array
+  void to_ndjson_file(const std::string &fn) const;
 
 private:
   std::vector<Entry> contents;
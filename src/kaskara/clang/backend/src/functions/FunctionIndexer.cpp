@@ -99,15 +99,22 @@ public:
   virtual std::unique_ptr<clang::ASTConsumer> CreateASTConsumer(
     clang::CompilerInstance &compiler, llvm::StringRef in_file)
   {
-    return std::unique_ptr<clang::ASTConsumer>(
-        new FindFunctionConsumer(&compiler.getASTContext(),
-          in_file, db_func));
+    return CreateFunctionConsumer(compiler.getASTContext(), in_file, db_func);
   }
 
 private:
   FunctionDB &db_func;
 };
 
+std::unique_ptr<clang::ASTConsumer> CreateFunctionConsumer(
+    clang::ASTContext &ctx,
+    llvm::StringRef in_file,
+    FunctionDB &db_func)
+{
+  return std::unique_ptr<clang::ASTConsumer>(
+      new FindFunctionConsumer(&ctx, in_file, db_func));
+}
+
 std::unique_ptr<clang::tooling::FrontendActionFactory> functionFinderFactory(
     FunctionDB &db_func)
 {
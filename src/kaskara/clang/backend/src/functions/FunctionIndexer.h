@@ -2,12 +2,21 @@
 
 #include <memory>
 
+#include <clang/AST/ASTConsumer.h>
+#include <clang/AST/ASTContext.h>
 #include <clang/Tooling/CommonOptionsParser.h>
 
 #include "FunctionDB.h"
 
 namespace kaskara {
 
+// creates a consumer that adds the functions within a given file to a database
+std::unique_ptr<clang::ASTConsumer> CreateFunctionConsumer(
+    clang::ASTContext &ctx,
+    llvm::StringRef in_file,
+    FunctionDB &db_func
+);
+
 std::unique_ptr<FunctionDB> IndexFunctions(
     clang::tooling::CommonOptionsParser &optionsParser
 );
@@ -59,4 +59,17 @@ void InsertionPointDB::to_file(const std::string &fn) const
   o << std::setw(2) << to_json() << std::endl;
 }
 
+void InsertionPointDB::to_ndjson_file(const std::string &fn) const
+{
+  std::ofstream o(fn);
+  for (auto const &e : contents)
+    o << e.to_json().dump() << '\n';
+}
+
+void InsertionPointDB::merge(InsertionPointDB const &other)
+{
+  for (auto const &e : other.contents)
+    contents.push_back(e);
+}
+
 } // kaskara
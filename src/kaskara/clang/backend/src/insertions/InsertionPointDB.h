@@ -30,8 +30,12 @@ public:
 
   void add(std::string const &location,
            std::unordered_set<std::string> const &visible);
+  // appends the entries of another database to this database
+  void merge(InsertionPointDB const &other);
   void dump() const;
   void to_file(const std::string &fn) const;
+  // writes each entry as a single line of JSON, without building the whole array
+  void to_ndjson_file(const std::string &fn) const;
   nlohmann::json to_json() const;
 
 private:
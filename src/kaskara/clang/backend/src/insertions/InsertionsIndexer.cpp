@@ -186,14 +186,21 @@ public:
   virtual std::unique_ptr<clang::ASTConsumer> CreateASTConsumer(
     clang::CompilerInstance &compiler, llvm::StringRef in_file)
   {
-    return std::unique_ptr<clang::ASTConsumer>(
-        new InsertionPointConsumer(&compiler.getASTContext(), db));
+    return CreateInsertionPointConsumer(compiler.getASTContext(), db);
   }
 
 private:
   InsertionPointDB *db;
 };
 
+std::unique_ptr<clang::ASTConsumer> CreateInsertionPointConsumer(
+    clang::ASTContext &ctx,
+    InsertionPointDB *db)
+{
+  return std::unique_ptr<clang::ASTConsumer>(
+      new InsertionPointConsumer(&ctx, db));
+}
+
 std::unique_ptr<clang::tooling::FrontendActionFactory> insertionPointFinderFactory(
   InsertionPointDB *db
 ) {
@@ -2,12 +2,20 @@
 
 #include <memory>
 
+#include <clang/AST/ASTConsumer.h>
+#include <clang/AST/ASTContext.h>
 #include <clang/Tooling/CommonOptionsParser.h>
 
 #include "InsertionPointDB.h"
 
 namespace kaskara {
 
+// creates a consumer that adds the insertion points within the main file to a database
+std::unique_ptr<clang::ASTConsumer> CreateInsertionPointConsumer(
+    clang::ASTContext &ctx,
+    InsertionPointDB *db
+);
+
 std::unique_ptr<InsertionPointDB> IndexInsertions(
     clang::tooling::CommonOptionsParser &optionsParser
 );
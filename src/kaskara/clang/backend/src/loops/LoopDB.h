@@ -31,9 +31,13 @@ public:
   void add(clang::ASTContext *ctx, clang::WhileStmt const *stmt);
   void add(clang::ASTContext *ctx, clang::ForStmt const *stmt);
   // void add(clang::ASTContext *ctx, clang::CXXForRangeStmt const *stmt);
+  // appends the entries of another database to this database
+  void merge(LoopDB const &other);
   void dump() const;
   nlohmann::json to_json() const;
   void to_file(const std::string &fn) const;
+  // writes each entry as a single line of JSON, without building the whole array
+  void to_ndjson_file(const std::string &fn) const;
 
 private:
   std::vector<Entry> contents;
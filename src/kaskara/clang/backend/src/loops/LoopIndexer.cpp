@@ -94,15 +94,22 @@ public:
   virtual std::unique_ptr<clang::ASTConsumer> CreateASTConsumer(
     clang::CompilerInstance &compiler, llvm::StringRef in_file)
   {
-    return std::unique_ptr<clang::ASTConsumer>(
-        new FindLoopConsumer(&compiler.getASTContext(),
-          in_file, db_loop));
+    return CreateLoopConsumer(compiler.getASTContext(), in_file, db_loop);
   }
 
 private:
   LoopDB &db_loop;
 };
 
+std::unique_ptr<clang::ASTConsumer> CreateLoopConsumer(
+    clang::ASTContext &ctx,
+    llvm::StringRef in_file,
+    LoopDB &db_loop)
+{
+  return std::unique_ptr<clang::ASTConsumer>(
+      new FindLoopConsumer(&ctx, in_file, db_loop));
+}
+
 std::unique_ptr<clang::tooling::FrontendActionFactory> loopFinderFactory(
     LoopDB &db_loop)
 {
@@ -2,12 +2,21 @@
 
 #include <memory>
 
+#include <clang/AST/ASTConsumer.h>
+#include <clang/AST/ASTContext.h>
 #include <clang/Tooling/CommonOptionsParser.h>
 
 #include "LoopDB.h"
 
 namespace kaskara {
 
+// creates a consumer that adds the loops within a given file to a database
+std::unique_ptr<clang::ASTConsumer> CreateLoopConsumer(
+    clang::ASTContext &ctx,
+    llvm::StringRef in_file,
+    LoopDB &db_loop
+);
+
 std::unique_ptr<LoopDB> IndexLoops(
     clang::tooling::CommonOptionsParser &optionsParser
 );
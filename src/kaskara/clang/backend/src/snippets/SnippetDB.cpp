@@ -119,4 +119,24 @@ void SnippetDB::to_file(const std::string &fn) const
   o << std::setw(2) << to_json() << std::endl;
 }
 
+void SnippetDB::to_ndjson_file(const std::string &fn) const
+{
+  std::ofstream o(fn);
+  for (auto const &item : contents)
+    o << item.second.to_json().dump() << '\n';
+}
+
+void SnippetDB::merge(SnippetDB const &other)
+{
+  for (auto const &item : other.contents) {
+    auto existing = contents.find(item.first);
+    if (existing == contents.end()) {
+      contents.emplace(item.first, item.second);
+      continue;
+    }
+    for (auto const &location : item.second.locations)
+      existing->second.observe(location);
+  }
+}
+
 } // kaskara
@@ -34,11 +34,15 @@ public:
   }; // Entry
 
   void dump() const;
+  // adds the snippets of another database to this database
+  void merge(SnippetDB const &other);
   void add(std::string const &kind,
            clang::ASTContext const *ctx,
            clang::Stmt const *stmt);
   nlohmann::json to_json() const;
   void to_file(const std::string &fn) const;
+  // writes each entry as a single line of JSON, without building the whole array
+  void to_ndjson_file(const std::string &fn) const;
 
 private:
   std::unordered_map<std::string, Entry> contents;
@@ -97,6 +97,40 @@ private:
   std::string kind;
 };
 
+class SnippetConsumerFactory::Matchers
+{
+public:
+  Matchers(SnippetDB *db)
+    : finder(),
+      finder_return("guarded-return", db),
+      finder_break("guarded-break", db),
+      finder_void_call("void-call", db)
+  {
+    finder.addMatcher(GuardedVoidReturnMatcher, &finder_return);
+    finder.addMatcher(GuardedBreakMatcher, &finder_break);
+    finder.addMatcher(VoidCallMatcher, &finder_void_call);
+  }
+
+  MatchFinder finder;
+
+private:
+  SnippetFinder finder_return;
+  SnippetFinder finder_break;
+  SnippetFinder finder_void_call;
+};
+
+SnippetConsumerFactory::SnippetConsumerFactory(SnippetDB *db)
+  : matchers(std::make_unique<Matchers>(db))
+{ }
+
+SnippetConsumerFactory::~SnippetConsumerFactory()
+{ }
+
+std::unique_ptr<clang::ASTConsumer> SnippetConsumerFactory::newASTConsumer()
+{
+  return matchers->finder.newASTConsumer();
+}
+
 std::unique_ptr<SnippetDB> IndexSnippets(
     clang::tooling::CommonOptionsParser &optionsParser
 ) {
@@ -106,18 +140,8 @@ std::unique_ptr<SnippetDB> IndexSnippets(
     optionsParser.getSourcePathList()
   );
 
-  MatchFinder finder;
-
-  SnippetFinder finder_return = SnippetFinder("guarded-return", db.get());
-  finder.addMatcher(GuardedVoidReturnMatcher, &finder_return);
-
-  SnippetFinder finder_break = SnippetFinder("guarded-break", db.get());
-  finder.addMatcher(GuardedBreakMatcher, &finder_break);
-
-  SnippetFinder finder_void_call = SnippetFinder("void-call", db.get());
-  finder.addMatcher(VoidCallMatcher, &finder_void_call);
-
-  Tool.run(newFrontendActionFactory(&finder).get());
+  SnippetConsumerFactory consumers(db.get());
+  Tool.run(newFrontendActionFactory(&consumers).get());
 
   return db;
 }
@@ -2,12 +2,27 @@
 
 #include <memory>
 
+#include <clang/AST/ASTConsumer.h>
 #include <clang/Tooling/CommonOptionsParser.h>
 
 #include "SnippetDB.h"
 
 namespace kaskara {
 
+// creates consumers that add the snippets within the main file to a database
+class SnippetConsumerFactory
+{
+public:
+  explicit SnippetConsumerFactory(SnippetDB *db);
+  ~SnippetConsumerFactory();
+
+  std::unique_ptr<clang::ASTConsumer> newASTConsumer();
+
+private:
+  class Matchers;
+  std::unique_ptr<Matchers> matchers;
+}; // SnippetConsumerFactory
+
 std::unique_ptr<SnippetDB> IndexSnippets(
     clang::tooling::CommonOptionsParser &optionsParser
 );
@@ -17,7 +17,7 @@ using namespace kaskara;
 
 namespace kaskara {
 
-StatementDB::StatementDB() : contents()
+StatementDB::StatementDB(StatementFacts const &facts) : facts_(facts), contents()
 { }
 
 StatementDB::~StatementDB()
@@ -26,18 +26,22 @@ StatementDB::~StatementDB()
 StatementDB::Entry::Entry(
   std::string const &location,
   std::string const &content,
+  int64_t offset_begin,
+  int64_t offset_end,
   std::string const &canonical,
   std::string const &kind,
-  std::unordered_set<std::string> const &reads,
-  std::unordered_set<std::string> const &writes,
-  std::unordered_set<std::string> const &decls,
-  std::unordered_set<std::string> const &visible,
-  std::unordered_set<std::string> const &live_before,
-  std::unordered_set<std::string> const &live_after,
+  std::optional<NameSet> const &reads,
+  std::optional<NameSet> const &writes,
+  std::optional<NameSet> const &decls,
+  std::optional<NameSet> const &visible,
+  std::optional<NameSet> const &live_before,
+  std::optional<NameSet> const &live_after,
   StatementSyntaxScope const &syntax_scope
 )
   : location(location),
     content(content),
+    offset_begin(offset_begin),
+    offset_end(offset_end),
     canonical(canonical),
     kind(kind),
     writes(writes),
@@ -49,32 +53,20 @@ StatementDB::Entry::Entry(
     syntax_scope(syntax_scope)
 { }
 
-json const StatementDB::Entry::to_json() const
+static void add_name_set(json &j,
+                         std::string const &key,
+                         std::optional<StatementDB::NameSet> const &names)
 {
-  json j_reads = json::array();
-  for (auto v : reads)
-    j_reads.push_back(v);
-
-  json j_writes = json::array();
-  for (auto v : writes)
-    j_writes.push_back(v);
-
-  json j_visible = json::array();
-  for (auto v : visible)
-    j_visible.push_back(v);
-
-  json j_decls = json::array();
-  for (auto v : decls)
-    j_decls.push_back(v);
-
-  json j_live_before = json::array();
-  for (auto v : live_before)
-    j_live_before.push_back(v);
-
-  json j_live_after = json::array();
-  for (auto v : live_after)
-    j_live_after.push_back(v);
+  if (!names)
+    return;
+  json j_names = json::array();
+  for (auto const &name : *names)
+    j_names.push_back(name);
+  j[key] = j_names;
+}
 
+json const StatementDB::Entry::to_json(bool include_content) const
+{
   json j_syntax_required = json::array();
   if (syntax_scope.requires_break)
     j_syntax_required.push_back("break");
@@ -83,17 +75,22 @@ json const StatementDB::Entry::to_json() const
 
   json j = {
     {"location", location},
-    {"content", content},
     {"canonical", canonical},
     {"kind", kind},
-    {"reads", j_reads},
-    {"writes", j_writes},
-    {"visible", j_visible},
-    {"decls", j_decls},
-    {"live_before", j_live_before},
-    {"live_after", j_live_after},
     {"requires_syntax", j_syntax_required},
   };
+  add_name_set(j, "reads", reads);
+  add_name_set(j, "writes", writes);
+  add_name_set(j, "visible", visible);
+  add_name_set(j, "decls", decls);
+  add_name_set(j, "live_before", live_before);
+  add_name_set(j, "live_after", live_after);
+
+  bool has_offsets = offset_begin >= 0 && offset_end >= offset_begin;
+  if (has_offsets)
+    j["offsets"] = {offset_begin, offset_end};
+  if (include_content || !has_offsets)
+    j["content"] = content;
 
   return j;
 }
@@ -120,58 +117,74 @@ void StatementDB::add(clang::ASTContext const *ctx,
   }
 
   std::string txt = read_source(*ctx, source_range);
-  // llvm::outs() << "DEBUG: obtained source for statement: " << txt << "\n";
 
-  auto *stmtMap = analysis_decl_ctx->getCFGStmtMap();
-  if (stmtMap == nullptr) {
-    llvm::outs() << "WARNING: failed to obtain stmt map -- skipping statement\n";
-    return;
+  // determine the byte offsets of the source text within its file so that
+  // clients can recover the text from a shared copy of the file
+  int64_t offset_begin = -1;
+  int64_t offset_end = -1;
+  clang::SourceManager const &SM = ctx->getSourceManager();
+  if (source_range.getBegin().isFileID() && source_range.getEnd().isFileID()) {
+    auto begin = SM.getDecomposedLoc(source_range.getBegin());
+    auto end = SM.getDecomposedLoc(source_range.getEnd());
+    if (begin.first == end.first) {
+      offset_begin = begin.second;
+      offset_end = begin.second + txt.size();
+    }
   }
-  // llvm::outs() << "DEBUG: fetched stmt map\n";
+  // llvm::outs() << "DEBUG: obtained source for statement: " << txt << "\n";
 
   // compute read and write information
-  std::unordered_set<std::string> reads;
-  std::unordered_set<std::string> writes;
-  std::unordered_set<std::string> decls;
-  // llvm::outs() << "DEBUG: computing read-write information...\n";
-  ReadWriteAnalyzer::analyze(ctx, stmt, reads, writes, decls);
-  // llvm::outs() << "DEBUG: computed read-write information\n";
+  std::optional<NameSet> reads;
+  std::optional<NameSet> writes;
+  std::optional<NameSet> decls;
+  if (facts_.read_write) {
+    reads.emplace();
+    writes.emplace();
+    decls.emplace();
+    ReadWriteAnalyzer::analyze(ctx, stmt, *reads, *writes, *decls);
+  }
 
   // compute the names of all visible variables
-  std::unordered_set<std::string> visible_names;
-  for (auto decl : visible) {
-    visible_names.emplace(decl->getNameAsString());
+  std::optional<NameSet> visible_names;
+  if (facts_.visibility) {
+    visible_names.emplace();
+    for (auto decl : visible) {
+      visible_names->emplace(decl->getNameAsString());
+    }
   }
 
   // compute liveness information
   // FIXME LiveVariables seems to ignore properties, therefore we assume that
   //  all properties are live (for now).
-  // llvm::outs() << "DEBUG: computing liveness information...\n";
-  std::unordered_set<std::string> live_before;
-  for (auto decl : visible) {
-    // llvm::outs() << "DEBUG: checking decl...\n";
-    if (auto *vd = clang::dyn_cast<clang::VarDecl>(decl)) {
-      // llvm::outs() << "DEBUG: checking decl liveness...\n";
-      if (!liveness->isLive(stmt, vd))
-        continue;
-      // llvm::outs() << "DEBUG: checked decl liveness\n";
+  std::optional<NameSet> live_before;
+  std::optional<NameSet> live_after;
+  if (facts_.liveness) {
+    auto *stmtMap = analysis_decl_ctx->getCFGStmtMap();
+    if (stmtMap == nullptr || liveness == nullptr) {
+      llvm::outs() << "WARNING: failed to obtain stmt map -- skipping statement\n";
+      return;
     }
-    live_before.emplace(decl->getNameAsString());
-  }
-  // llvm::outs() << "DEBUG: computed live before\n";
-
-  // find variables that are live after the statement
-  clang::CFGBlock const *block = stmtMap->getBlock(stmt);
-  // llvm::outs() << "DEBUG: fetched CFG block...\n";
-  std::unordered_set<std::string> live_after;
-  for (auto decl : visible) {
-    if (auto *vd = clang::dyn_cast<clang::VarDecl>(decl)) {
-      if (!liveness->isLive(block, vd))
-        continue;
+
+    live_before.emplace();
+    for (auto decl : visible) {
+      if (auto *vd = clang::dyn_cast<clang::VarDecl>(decl)) {
+        if (!liveness->isLive(stmt, vd))
+          continue;
+      }
+      live_before->emplace(decl->getNameAsString());
+    }
+
+    // find variables that are live after the statement
+    clang::CFGBlock const *block = stmtMap->getBlock(stmt);
+    live_after.emplace();
+    for (auto decl : visible) {
+      if (auto *vd = clang::dyn_cast<clang::VarDecl>(decl)) {
+        if (!liveness->isLive(block, vd))
+          continue;
+      }
+      live_after->emplace(decl->getNameAsString());
     }
-    live_after.emplace(decl->getNameAsString());
   }
-  // llvm::outs() << "DEBUG: computed liveness information\n";
 
   // compute syntax scope analysis
   StatementSyntaxScope syntax_scope = SyntaxScopeAnalyzer::analyze(ctx, stmt);
@@ -203,6 +216,8 @@ void StatementDB::add(clang::ASTContext const *ctx,
   contents.emplace_back(
     loc_str,
     txt,
+    offset_begin,
+    offset_end,
     canonical,
     kind,
     reads,
@@ -215,11 +230,11 @@ void StatementDB::add(clang::ASTContext const *ctx,
   // llvm::outs() << "DEBUG: added statement info\n";
 }
 
-json StatementDB::to_json() const
+json StatementDB::to_json(bool include_content) const
 {
   json j = json::array();
   for (auto &e : contents)
-    j.push_back(e.to_json());
+    j.push_back(e.to_json(include_content));
   return j;
 }
 
@@ -228,10 +243,23 @@ void StatementDB::dump() const
   std::cout << std::setw(2) << to_json() << std::endl;
 }
 
-void StatementDB::to_file(const std::string &fn) const
+void StatementDB::to_file(const std::string &fn, bool include_content) const
+{
+  std::ofstream o(fn);
+  o << std::setw(2) << to_json(include_content) << std::endl;
+}
+
+void StatementDB::to_ndjson_file(const std::string &fn, bool include_content) const
 {
   std::ofstream o(fn);
-  o << std::setw(2) << to_json() << std::endl;
+  for (auto const &e : contents)
+    o << e.to_json(include_content).dump() << '\n';
+}
+
+void StatementDB::merge(StatementDB const &other)
+{
+  for (auto const &e : other.contents)
+    contents.push_back(e);
 }
 
 } // kaskara
@@ -1,5 +1,7 @@
 #pragma once
 
+#include <cstdint>
+#include <optional>
 #include <vector>
 #include <string>
 #include <unordered_set>
@@ -13,39 +15,59 @@
 
 namespace kaskara {
 
+// describes which of the (relatively expensive) facts about each statement
+// should be computed. facts that aren't computed are omitted from the output.
+struct StatementFacts {
+  // the variables that are read, written, and declared by the statement
+  bool read_write = true;
+  // the variables that are visible at the statement
+  bool visibility = true;
+  // the variables that are live before and after the statement
+  bool liveness = true;
+};
+
 class StatementDB
 {
 public:
-  StatementDB();
+  StatementDB(StatementFacts const &facts = StatementFacts());
   ~StatementDB();
 
+  using NameSet = std::unordered_set<std::string>;
+
   class Entry {
   public:
     Entry(std::string const &location,
           std::string const &content,
+          int64_t offset_begin,
+          int64_t offset_end,
           std::string const &canonical,
           std::string const &kind,
-          std::unordered_set<std::string> const &reads,
-          std::unordered_set<std::string> const &writes,
-          std::unordered_set<std::string> const &decls,
-          std::unordered_set<std::string> const &visible,
-          std::unordered_set<std::string> const &live_before,
-          std::unordered_set<std::string> const &live_after,
+          std::optional<NameSet> const &reads,
+          std::optional<NameSet> const &writes,
+          std::optional<NameSet> const &decls,
+          std::optional<NameSet> const &visible,
+          std::optional<NameSet> const &live_before,
+          std::optional<NameSet> const &live_after,
           StatementSyntaxScope const &syntax_scope);
 
     std::string location;
     std::string content;
+    // byte offsets of the content within its file, or -1 if unknown
+    int64_t offset_begin;
+    int64_t offset_end;
     std::string canonical;
     std::string kind;
-    std::unordered_set<std::string> writes;
-    std::unordered_set<std::string> reads;
-    std::unordered_set<std::string> visible;
-    std::unordered_set<std::string> decls;
-    std::unordered_set<std::string> live_before;
-    std::unordered_set<std::string> live_after;
+    // empty if the corresponding fact was not computed
+    std::optional<NameSet> writes;
+    std::optional<NameSet> reads;
+    std::optional<NameSet> visible;
+    std::optional<NameSet> decls;
+    std::optional<NameSet> live_before;
+    std::optional<NameSet> live_after;
     StatementSyntaxScope syntax_scope;
 
-    nlohmann::json const to_json() const;
+    // the content is always included if its offsets are unknown
+    nlohmann::json const to_json(bool include_content = true) const;
   }; // Entry
 
   void add(clang::ASTContext const *ctx,
@@ -53,11 +75,17 @@ public:
            std::unordered_set<clang::NamedDecl const *> const &visible,
            clang::LiveVariables *liveness,
            clang::AnalysisDeclContext *analysis_decl_ctx);
+  StatementFacts const &facts() const { return facts_; }
+  // appends the entries of another database to this database
+  void merge(StatementDB const &other);
   void dump() const;
-  nlohmann::json to_json() const;
-  void to_file(const std::string &fn) const;
+  nlohmann::json to_json(bool include_content = true) const;
+  void to_file(const std::string &fn, bool include_content = true) const;
+  // writes each entry as a single line of JSON, without building the whole array
+  void to_ndjson_file(const std::string &fn, bool include_content = true) const;
 
 private:
+  StatementFacts facts_;
   std::vector<Entry> contents;
 }; // StatementDB
 
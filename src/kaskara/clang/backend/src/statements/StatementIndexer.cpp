@@ -193,8 +193,11 @@ public:
     // llvm::outs() << "computing liveness for function: " << name << "\n";
     current_analysis_decl_ctx =
       std::unique_ptr<clang::AnalysisDeclContext>(new clang::AnalysisDeclContext(NULL, decl));
-    liveness =
-      std::unique_ptr<clang::LiveVariables>(clang::LiveVariables::create(*current_analysis_decl_ctx));
+    // building the CFG for the liveness analysis is by far the most expensive
+    // part of indexing a function, so we avoid it unless liveness is needed
+    if (db->facts().liveness)
+      liveness =
+        std::unique_ptr<clang::LiveVariables>(clang::LiveVariables::create(*current_analysis_decl_ctx));
     return VisitDecl(decl);
   }
 
@@ -209,7 +212,9 @@ public:
     }
     current_decl_ctx = decl_ctx;
     visible.clear();
-    CollectVisibleDecls(decl_ctx);
+    // the visible declarations are also used to determine which variables are live
+    if (db->facts().visibility || db->facts().liveness)
+      CollectVisibleDecls(decl_ctx);
 
     return true;
   }
@@ -266,15 +271,7 @@ public:
   virtual std::unique_ptr<clang::ASTConsumer> CreateASTConsumer(
     clang::CompilerInstance &compiler, llvm::StringRef in_file)
   {
-    const FileEntry *fe = compiler.getFileManager().getFile(in_file).get();
-    if (!fe) {
-      llvm::errs() << "failed to obtain file\n";
-      exit(1);
-    }
-    std::string filename = fe->tryGetRealPathName().str();
-
-    return std::unique_ptr<clang::ASTConsumer>(
-        new StatementConsumer(&compiler.getASTContext(), db, filename, visited_files));
+    return CreateStatementConsumer(compiler.getASTContext(), in_file, db, visited_files);
   }
 
 private:
@@ -282,6 +279,23 @@ private:
   std::unordered_set<std::string> &visited_files;
 };
 
+std::unique_ptr<clang::ASTConsumer> CreateStatementConsumer(
+    clang::ASTContext &ctx,
+    llvm::StringRef in_file,
+    StatementDB *db,
+    std::unordered_set<std::string> &visited_files)
+{
+  const FileEntry *fe = ctx.getSourceManager().getFileManager().getFile(in_file).get();
+  if (!fe) {
+    llvm::errs() << "failed to obtain file\n";
+    exit(1);
+  }
+  std::string filename = fe->tryGetRealPathName().str();
+
+  return std::unique_ptr<clang::ASTConsumer>(
+      new StatementConsumer(&ctx, db, filename, visited_files));
+}
+
 std::unique_ptr<clang::tooling::FrontendActionFactory> statementFinderFactory(
   StatementDB *db
 ) {
@@ -308,9 +322,10 @@ std::unique_ptr<clang::tooling::FrontendActionFactory> statementFinderFactory(
 };
 
 std::unique_ptr<StatementDB> IndexStatements(
-    clang::tooling::CommonOptionsParser &optionsParser
+    clang::tooling::CommonOptionsParser &optionsParser,
+    StatementFacts const &facts
 ) {
-  auto db = std::make_unique<StatementDB>();
+  auto db = std::make_unique<StatementDB>(facts);
 
   clang::tooling::ClangTool tool(
     optionsParser.getCompilations(),
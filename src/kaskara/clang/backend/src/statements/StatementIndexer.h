@@ -1,15 +1,29 @@
 #pragma once
 
 #include <memory>
+#include <string>
+#include <unordered_set>
 
+#include <clang/AST/ASTConsumer.h>
+#include <clang/AST/ASTContext.h>
 #include <clang/Tooling/CommonOptionsParser.h>
 
 #include "StatementDB.h"
 
 namespace kaskara {
 
+// creates a consumer that adds the statements within a given file to a
+// database, provided that the file does not belong to the set of visited files
+std::unique_ptr<clang::ASTConsumer> CreateStatementConsumer(
+    clang::ASTContext &ctx,
+    llvm::StringRef in_file,
+    StatementDB *db,
+    std::unordered_set<std::string> &visited_files
+);
+
 std::unique_ptr<StatementDB> IndexStatements(
-    clang::tooling::CommonOptionsParser &optionsParser
+    clang::tooling::CommonOptionsParser &optionsParser,
+    StatementFacts const &facts = StatementFacts()
 );
 
 }
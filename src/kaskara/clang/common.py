@@ -1,4 +1,5 @@
 __all__ = (
+    "AST_CACHE_LOCATION",
     "IMAGE_NAME",
     "VOLUME_NAME",
     "VOLUME_LOCATION",
@@ -10,6 +11,7 @@ __all__ = (
 IMAGE_NAME: str = "christimperley/kaskara:cpp"
 VOLUME_NAME: str = "kaskara-clang"
 VOLUME_LOCATION: str = "/opt/kaskara"
+AST_CACHE_LOCATION: str = "/opt/kaskara-clang-ast-cache"
 IMAGE_ID_LABEL: str = "kaskara.built-from-image-id"
 PLUGIN_LABEL: str = "kaskara.plugin"
 VERSION_LABEL: str = "kaskara.version"
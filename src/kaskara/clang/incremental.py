@@ -0,0 +1,118 @@
+"""Supports the incremental re-indexing of C/C++ projects."""
+from __future__ import annotations
+
+__all__ = ("IncrementalIndex",)
+
+import os
+import pickle
+import tempfile
+import typing as t
+from pathlib import Path
+
+import attr
+from loguru import logger
+
+from kaskara.exceptions import KaskaraException
+
+if t.TYPE_CHECKING:
+    from collections.abc import Collection, Mapping
+
+    from kaskara.analysis import Analysis
+
+
+@attr.s(frozen=True, slots=True, auto_attribs=True)
+class IncrementalIndex:
+    """Holds the results of indexing a project alongside the dependencies of each translation unit.
+
+    A translation unit only needs to be indexed again if its own source, or
+    any (non-system) header that it includes, has changed since it was last
+    indexed.
+
+    Attributes
+    ----------
+    analysis: Analysis
+        The results of indexing the project.
+    dependencies: Mapping[str, Mapping[str, str]]
+        The SHA-256 digest of each file upon which each translation unit
+        depends, indexed by the name of the translation unit relative to the
+        project directory, and then by the absolute path of the file.
+    failed: frozenset[str]
+        The translation units that could not be indexed by the run that
+        produced this index. Since those units have no recorded
+        dependencies, they are indexed again by the next run.
+    """
+    analysis: Analysis
+    dependencies: Mapping[str, Mapping[str, str]]
+    failed: frozenset[str] = attr.ib(factory=frozenset)
+
+    def tracked_files(self) -> frozenset[str]:
+        """Returns the absolute paths of all files upon which any translation unit depends."""
+        return frozenset(path for digests in self.dependencies.values() for path in digests)
+
+    def outdated(
+        self,
+        units: Collection[str],
+        digests: Mapping[str, str],
+    ) -> frozenset[str]:
+        """Determines which of the given translation units must be indexed again.
+
+        Parameters
+        ----------
+        units: Collection[str]
+            The translation units within the project, relative to the project
+            directory.
+        digests: Mapping[str, str]
+            The current digest of each tracked file, indexed by its absolute
+            path. Files that no longer exist should be omitted.
+
+        Returns
+        -------
+        frozenset[str]
+            Those translation units that have not been indexed before, or for
+            which any dependency has changed.
+        """
+        outdated: set[str] = set()
+        for unit in units:
+            unit_dependencies = self.dependencies.get(unit)
+            if unit_dependencies is None or any(
+                digests.get(path) != digest for path, digest in unit_dependencies.items()
+            ):
+                outdated.add(unit)
+        return frozenset(outdated)
+
+    def save(self, filename: str) -> None:
+        """Writes this index to a given file on the host."""
+        path = Path(filename)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file first so that an interrupted write never
+        # leaves behind a partially written index
+        fd, temporary_filename = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        temporary_path = Path(temporary_filename)
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                pickle.dump(self, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            temporary_path.replace(path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+        logger.debug(f"saved incremental index to file: {filename}")
+
+    @classmethod
+    def load(cls, filename: str) -> IncrementalIndex:
+        """Reads an index that was previously written to a given file on the host.
+
+        Raises
+        ------
+        KaskaraException
+            If the file does not contain an index.
+        """
+        try:
+            with Path(filename).open("rb") as fh:
+                index = pickle.load(fh)  # noqa: S301
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as err:
+            message = f"failed to load incremental index [{filename}]: {err}"
+            raise KaskaraException(message) from err
+
+        if not isinstance(index, IncrementalIndex):
+            message = f"not an incremental index: {filename}"
+            raise KaskaraException(message)
+        return index
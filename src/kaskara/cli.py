@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import statistics
 import sys
 from pathlib import Path
 
@@ -9,9 +10,13 @@ import click
 from loguru import logger
 
 from kaskara.clang.analyser import ClangAnalyser
+from kaskara.clang.analysis import STATEMENT_FACT_PROFILES, StatementFacts
 from kaskara.clang.post_install import post_install as install_clang_backend
 from kaskara.project import Project
+from kaskara.python.analyser import PythonAnalyser
+from kaskara.python.cache import DEFAULT_CACHE_DIRECTORY, PythonAnalysisCache
 from kaskara.spoon.analyser import SpoonAnalyser
+from kaskara.spoon.common import JAR_PATH, JAVA_PATH, NATIVE_BINARY_PATH
 from kaskara.spoon.post_install import post_install as install_spoon_backend
 
 
@@ -50,9 +55,55 @@ def spoon() -> None:
     is_flag=True,
     help="forces reinstallation of the backend.",
 )
-def spoon_install(force: bool) -> None:
+@click.option(
+    "--native",
+    is_flag=True,
+    help="also builds a GraalVM native image of the backend, which does not need a JVM.",
+)
+def spoon_install(force: bool, native: bool) -> None:
     """Installs the Spoon analyser backend."""
-    install_spoon_backend(force=force)
+    install_spoon_backend(force=force, native=native)
+
+
+@spoon.command(
+    "compare-startup",
+    help="Compares the startup time of the JAR and native image of the Spoon backend.",
+)
+@click.argument(
+    "image",
+    type=str,
+)
+@click.option(
+    "-n", "--repeats",
+    type=click.IntRange(min=1),
+    default=5,
+    show_default=True,
+    help="the number of times that each backend is started.",
+)
+def spoon_compare_startup(image: str, repeats: int) -> None:
+    """Compares the startup time of the JAR and native image of the Spoon backend."""
+    with (
+        Project.load(
+            image=image,
+            directory="/",
+            files=[],
+        ) as project,
+        project.provision(mount_kaskara_spoon=True) as container,
+    ):
+        for name, command in (
+            ("jar", f"{JAVA_PATH} -jar {JAR_PATH}"),
+            ("native", NATIVE_BINARY_PATH),
+        ):
+            durations = []
+            for _ in range(repeats):
+                result = container.shell.run(f"{command} --help", stdout=False)
+                if result.returncode != 0:
+                    break
+                durations.append(result.duration)
+            if len(durations) < repeats:
+                click.echo(f"{name}: unavailable")
+            else:
+                click.echo(f"{name}: {statistics.mean(durations):.3f}s mean, {min(durations):.3f}s best")
 
 
 @spoon.command(
@@ -81,6 +132,11 @@ def spoon_install(force: bool) -> None:
     default=True,
     help="mounts the project binaries into the Docker container.",
 )
+@click.option(
+    "--native/--jar",
+    default=None,
+    help="uses the native image or the JAR of the backend. [default: native image, if installed]",
+)
 def spoon_index(
     image: str,
     directory: str,
@@ -88,6 +144,7 @@ def spoon_index(
     *,
     save_to: Path | None = None,
     mount_binaries: bool = True,
+    native: bool | None = None,
 ) -> None:
     """Indexes a Java project using Spoon."""
     with (
@@ -99,6 +156,7 @@ def spoon_index(
         SpoonAnalyser.for_project(
             project=project,
             mount_binaries=mount_binaries,
+            native=native,
         ) as analyser,
     ):
         analysis = analyser.run()
@@ -110,6 +168,81 @@ def spoon_index(
 
 
 
+@cli.group()
+def python() -> None:
+    pass
+
+
+@python.command(
+    "index",
+    help="Indexes a Python project.",
+)
+@click.argument(
+    "image",
+    type=str,
+)
+@click.argument(
+    "directory",
+    type=str,
+)
+@click.argument(
+    "files",
+    nargs=-1,
+)
+@click.option(
+    "--save-to",
+    type=click.Path(file_okay=True, dir_okay=False, writable=True, resolve_path=True, path_type=Path),
+    default=None,
+)
+@click.option(
+    "-j", "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="the number of worker processes used to parse files.",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=False,
+    help="reuses the cached results for files that have not changed.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, dir_okay=True, writable=True, resolve_path=True),
+    default=DEFAULT_CACHE_DIRECTORY,
+    show_default=True,
+    help="the directory in which cached results are stored.",
+)
+def python_index(
+    image: str,
+    directory: str,
+    files: list[str],
+    *,
+    save_to: Path | None = None,
+    workers: int = 1,
+    cache: bool = False,
+    cache_dir: str = DEFAULT_CACHE_DIRECTORY,
+) -> None:
+    """Indexes a Python project."""
+    with (
+        Project.load(
+            image=image,
+            directory=directory,
+            files=files,
+        ) as project,
+        PythonAnalyser.for_project(
+            project=project,
+            workers=workers,
+            cache=PythonAnalysisCache(cache_dir) if cache else None,
+        ) as analyser,
+    ):
+        analysis = analyser.run()
+
+        if save_to:
+            with save_to.open("w") as file:
+                json.dump(analysis.to_dict(), file, indent=2)
+
+
 @cli.group()
 def clang() -> None:
     pass
@@ -150,12 +283,35 @@ def clang_install(force: bool) -> None:
     type=click.Path(file_okay=True, dir_okay=False, writable=True, resolve_path=True, path_type=Path),
     default=None,
 )
+@click.option(
+    "-j", "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="the number of translation units that are indexed concurrently.",
+)
+@click.option(
+    "--ast-cache-volume",
+    type=str,
+    default=None,
+    help="the name of a Docker volume in which parsed translation units are cached.",
+)
+@click.option(
+    "--profile",
+    type=click.Choice(STATEMENT_FACT_PROFILES),
+    default="full",
+    show_default=True,
+    help="the facts (read/write, visibility, liveness) that are computed for each statement.",
+)
 def clang_index(
     image: str,
     directory: str,
     files: list[str],
     *,
     save_to: Path | None = None,
+    jobs: int = 1,
+    ast_cache_volume: str | None = None,
+    profile: str = "full",
 ) -> None:
     """Indexes a C/C++ project using Clang."""
     with (
@@ -164,7 +320,12 @@ def clang_index(
             directory=directory,
             files=files,
         ) as project,
-        ClangAnalyser.for_project(project) as analyser,
+        ClangAnalyser.for_project(
+            project,
+            jobs=jobs,
+            ast_cache_volume=ast_cache_volume,
+            statement_facts=StatementFacts.profile(profile),
+        ) as analyser,
     ):
         analysis = analyser.run()
 
@@ -0,0 +1,154 @@
+"""Decodes the compact binary format that the backends may write in place of JSON.
+
+A compact database is a MessagePack map of the following form::
+
+    {
+        "format": "kaskara-compact",
+        "version": 1,
+        "files": [<filename>, ...],
+        "symbols": [<symbol>, ...],
+        "entries": [<entry>, ...],
+    }
+
+Each entry has the same fields as its JSON counterpart, except that:
+
+* locations (i.e., :code:`location` and :code:`body`, and each of the
+  :code:`locations`) are given as :code:`[file, line, column]` or
+  :code:`[file, start line, start column, end line, end column]`, where
+  :code:`file` is an index into :code:`files`;
+* :code:`kind`, and each name within a set of symbols (e.g., :code:`reads`,
+  :code:`writes`, and :code:`visible`), is given as an index into
+  :code:`symbols`.
+
+Since locations are decoded directly from their components, rather than
+from strings, the readers for each backend accept a decoded location in
+place of its string form.
+"""
+from __future__ import annotations
+
+__all__ = ("COMPACT_FORMAT_VERSION", "decode_compact", "require_msgpack")
+
+import typing as t
+
+from kaskara.core import FileLocation, FileLocationRange, Location, LocationRange
+from kaskara.exceptions import KaskaraException
+from kaskara.symbols import SymbolTable
+
+if t.TYPE_CHECKING:
+    import types
+    from collections.abc import Iterator, Sequence
+
+COMPACT_FORMAT_VERSION = 1
+
+_LOCATION_FIELDS = ("location", "body")
+_SYMBOL_SET_FIELDS = (
+    "reads",
+    "writes",
+    "visible",
+    "decls",
+    "live_before",
+    "live_after",
+    "requires_syntax",
+)
+
+_LOCATION_SIZE = 3
+_LOCATION_RANGE_SIZE = 5
+
+
+def require_msgpack() -> types.ModuleType:
+    """Imports the optional :code:`msgpack` package, which is needed to read the compact format.
+
+    Raises
+    ------
+    KaskaraException
+        If the package is not installed.
+    """
+    try:
+        import msgpack  # noqa: PLC0415
+    except ImportError as err:
+        message = (
+            "reading the compact format requires the msgpack package,"
+            " which is provided by the 'compact' extra (pip install kaskara[compact])"
+        )
+        raise KaskaraException(message) from err
+    module: types.ModuleType = msgpack
+    return module
+
+
+def decode_compact(
+    data: bytes,
+    symbols: SymbolTable | None = None,
+) -> Iterator[dict[str, t.Any]]:
+    """Decodes the entries of a compact database.
+
+    Parameters
+    ----------
+    data: bytes
+        The contents of the database.
+    symbols: SymbolTable, optional
+        The table that should be used to share symbol names and sets of
+        names with other results.
+
+    Returns
+    -------
+    Iterator[dict[str, t.Any]]
+        The entries of the database, with their locations decoded to
+        :class:`FileLocation` and :class:`FileLocationRange` objects, and
+        their symbols decoded to (shared) strings and sets of strings.
+
+    Raises
+    ------
+    KaskaraException
+        If the optional :code:`msgpack` package is not installed, or if the
+        database is not in a supported version of the compact format.
+    """
+    msgpack = require_msgpack()
+    if symbols is None:
+        symbols = SymbolTable()
+
+    # arrays are decoded as tuples so that sets of symbols can be memoised by their indices
+    database = msgpack.unpackb(data, raw=False, use_list=False)
+    if database.get("format") != "kaskara-compact":
+        message = "not a compact Kaskara database"
+        raise KaskaraException(message)
+    if database.get("version") != COMPACT_FORMAT_VERSION:
+        message = f"unsupported version of the compact format: {database.get('version')}"
+        raise KaskaraException(message)
+
+    files: Sequence[str] = database["files"]
+    names = [symbols.name(name) for name in database["symbols"]]
+    name_sets: dict[tuple[int, ...], frozenset[str]] = {}
+
+    def decode_names(ids: tuple[int, ...]) -> frozenset[str]:
+        name_set = name_sets.get(ids)
+        if name_set is None:
+            name_set = name_sets[ids] = symbols.names(names[symbol] for symbol in ids)
+        return name_set
+
+    def decode_location(value: t.Any) -> t.Any:  # noqa: ANN401
+        if not isinstance(value, tuple):
+            return value
+        if len(value) == _LOCATION_RANGE_SIZE:
+            file_id, start_line, start_column, stop_line, stop_column = value
+            return FileLocationRange(
+                files[file_id],
+                LocationRange(Location(start_line, start_column), Location(stop_line, stop_column)),
+            )
+        if len(value) == _LOCATION_SIZE:
+            file_id, line, column = value
+            return FileLocation(files[file_id], Location(line, column))
+        message = f"malformed location in compact database: {value}"
+        raise KaskaraException(message)
+
+    for entry in database["entries"]:
+        for field in _LOCATION_FIELDS:
+            if field in entry:
+                entry[field] = decode_location(entry[field])
+        if "locations" in entry:
+            entry["locations"] = [decode_location(location) for location in entry["locations"]]
+        if isinstance(entry.get("kind"), int):
+            entry["kind"] = names[entry["kind"]]
+        for field in _SYMBOL_SET_FIELDS:
+            if field in entry:
+                entry[field] = decode_names(entry[field])
+        yield entry
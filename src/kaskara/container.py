@@ -1,15 +1,24 @@
 from __future__ import annotations
 
-__all__ = ("ProjectContainer",)
+__all__ = ("LocalFileSystem", "LocalProjectContainer", "ProjectContainer")
 
+import contextlib
+import hashlib
+import io
+import os
+import tarfile
 import typing
+import uuid
+from pathlib import Path
 
 import attr
+import dockerblade as _dockerblade
+from loguru import logger
 
 if typing.TYPE_CHECKING:
-    import dockerblade as _dockerblade
+    from collections.abc import Iterable, Iterator
 
-    from kaskara.project import Project
+    from kaskara.project import LocalProject, Project
 
 
 @attr.s(frozen=True, slots=True, auto_attribs=True)
@@ -35,3 +44,295 @@ class ProjectContainer:
     def __attrs_post_init__(self) -> None:
         object.__setattr__(self, "shell", self.dockerblade.shell("/bin/sh"))
         object.__setattr__(self, "files", self.dockerblade.filesystem())
+
+    def read_files(self, filenames: Iterable[str]) -> dict[str, bytes]:
+        """Reads the contents of several files using a single archive transfer.
+
+        Rather than copying each file out of the container individually, the
+        requested files are bundled into a single tar archive inside the
+        container, which is then fetched in one transfer. This reduces the
+        cost of reading many files to a constant number of round trips.
+
+        Parameters
+        ----------
+        filenames: Iterable[str]
+            The names of the files that should be read. Relative filenames
+            are resolved against the project directory.
+
+        Returns
+        -------
+        dict[str, bytes]
+            The contents of each file that could be read, indexed by its name
+            as it was given. Files that could not be read are omitted.
+        """
+        container_path_to_filename: dict[str, str] = {}
+        for filename in filenames:
+            path = os.path.normpath(os.path.join(self.project.directory, filename))
+            container_path_to_filename[path.lstrip("/")] = filename
+
+        if not container_path_to_filename:
+            return {}
+
+        unique_name = f"kaskara-{uuid.uuid4().hex}"
+        manifest_filename = f"/tmp/{unique_name}.txt"  # noqa: S108
+        archive_filename = f"/tmp/{unique_name}.tar"  # noqa: S108
+        manifest = "".join(f"{path}\n" for path in container_path_to_filename)
+        self.files.put(manifest_filename, manifest)
+
+        # follow symbolic links (-h) to match the behaviour of reading each file
+        command = f"tar -chf {archive_filename} -C / -T {manifest_filename}"
+        logger.debug(f"archiving {len(container_path_to_filename)} files: {command}")
+        try:
+            self.shell.check_output(command, text=True)
+        except _dockerblade.CalledProcessError as err:
+            err_message = err.output
+            assert isinstance(err_message, str)
+            logger.warning(f"failed to archive all requested files:\n{err_message}")
+
+        try:
+            stream, _ = self.dockerblade._docker.get_archive(archive_filename)
+            outer_archive_contents = io.BytesIO(b"".join(stream))
+        finally:
+            self.shell.run(f"rm -f {manifest_filename} {archive_filename}")
+
+        # the fetched archive wraps the archive that was created by tar
+        contents: dict[str, bytes] = {}
+        with tarfile.open(fileobj=outer_archive_contents) as outer_archive:
+            inner_archive_file = outer_archive.extractfile(outer_archive.getmembers()[0])
+            assert inner_archive_file is not None
+            with tarfile.open(fileobj=inner_archive_file) as inner_archive:
+                for member in inner_archive:
+                    member_filename = container_path_to_filename.get(os.path.normpath(member.name))
+                    member_file = inner_archive.extractfile(member)
+                    if member_filename is None or member_file is None:
+                        continue
+                    contents[member_filename] = member_file.read()
+
+        logger.debug(f"read {len(contents)} files via archive")
+        return contents
+
+    def hash_files(self, filenames: Iterable[str]) -> dict[str, str]:
+        """Computes the SHA-256 digest of the contents of several files using a single command.
+
+        Parameters
+        ----------
+        filenames: Iterable[str]
+            The names of the files that should be hashed. Relative filenames
+            are resolved against the project directory.
+
+        Returns
+        -------
+        dict[str, str]
+            The hex digest of each file that could be read, indexed by its
+            name as it was given. Files that could not be read are omitted.
+        """
+        path_to_filename: dict[str, str] = {}
+        for filename in filenames:
+            path = os.path.normpath(os.path.join(self.project.directory, filename))
+            path_to_filename[path] = filename
+
+        if not path_to_filename:
+            return {}
+
+        manifest_filename = f"/tmp/kaskara-{uuid.uuid4().hex}.txt"  # noqa: S108
+        manifest = "".join(f"{path}\n" for path in path_to_filename)
+        self.files.put(manifest_filename, manifest)
+        try:
+            command = f"tr '\\n' '\\0' < {manifest_filename} | xargs -0 sha256sum"
+            result = self.shell.run(command, text=True)
+        finally:
+            self.shell.run(f"rm -f {manifest_filename}")
+
+        output = result.output
+        assert isinstance(output, str)
+        digests: dict[str, str] = {}
+        for line in output.splitlines():
+            digest, _, path = line.partition("  ")
+            if path in path_to_filename:
+                digests[path_to_filename[path]] = digest
+        logger.debug(f"hashed {len(digests)} of {len(path_to_filename)} files")
+        return digests
+
+    def write_argument_file(self, arguments: Iterable[str]) -> str:
+        """Writes a list of command-line arguments to an argument file within the container.
+
+        Rather than passing each argument on the command line, which is
+        limited in length by the kernel (i.e., ARG_MAX), an argument file
+        may be passed to the Clang and Spoon backends as :code:`@filename`.
+        Each argument is written on its own line and is quoted, so that
+        arguments may contain whitespace.
+
+        Returns
+        -------
+        str
+            The absolute path of the argument file within the container.
+        """
+        filename = f"/tmp/kaskara-{uuid.uuid4().hex}.args"  # noqa: S108
+        contents = "".join(f'"{_escape_argument(argument)}"\n' for argument in arguments)
+        self.files.put(filename, contents)
+        return filename
+
+    @contextlib.contextmanager
+    def stream_file(self, filename: str) -> Iterator[typing.IO[bytes]]:
+        """Opens a file in the container for reading without loading all of it into memory.
+
+        The file is fetched as an archive whose chunks are decoded as they are
+        read, so only a bounded portion of the file is held in memory at once.
+
+        Parameters
+        ----------
+        filename: str
+            The name of the file. Relative filenames are resolved against
+            the project directory.
+
+        Yields
+        ------
+        typing.IO[bytes]
+            A binary stream over the contents of the file.
+        """
+        path = os.path.join(self.project.directory, filename)
+        chunks, _ = self.dockerblade._docker.get_archive(path)
+        raw = _ChunkReader(iter(chunks))
+        with tarfile.open(fileobj=raw, mode="r|") as archive:
+            member = archive.next()
+            member_file = archive.extractfile(member) if member else None
+            if member_file is None:
+                message = f"not a regular file: {path}"
+                raise OSError(message)
+            yield member_file
+
+
+class _ChunkReader(io.RawIOBase):
+    """Presents an iterator over chunks of bytes as a readable binary stream."""
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks = chunks
+        self._chunk = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: typing.Any) -> int:  # noqa: ANN401
+        while not self._chunk:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._chunk = memoryview(chunk)
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+
+def _escape_argument(argument: str) -> str:
+    """Escapes an argument for use within a double-quoted string in an argument file."""
+    return argument.replace("\\", "\\\\").replace('"', '\\"')
+
+
+@attr.s(frozen=True, slots=True)
+class LocalFileSystem:
+    """Provides read-only access to the host filesystem.
+
+    This mirrors the subset of :class:`dockerblade.FileSystem` that is used to
+    read the sources and results of an analysis.
+    """
+    def exists(self, path: str) -> bool:
+        """Determines whether a file or directory exists at a given path."""
+        return Path(path).exists()
+
+    @typing.overload
+    def read(self, filename: str) -> str:
+        ...
+
+    @typing.overload
+    def read(self, filename: str, binary: typing.Literal[False]) -> str:
+        ...
+
+    @typing.overload
+    def read(self, filename: str, binary: typing.Literal[True]) -> bytes:
+        ...
+
+    def read(self, filename: str, binary: bool = False) -> str | bytes:  # noqa: FBT002
+        """Reads the contents of a given file."""
+        path = Path(filename)
+        return path.read_bytes() if binary else path.read_text()
+
+
+@attr.s(frozen=True, slots=True, auto_attribs=True)
+class LocalProjectContainer:
+    """Stands in for a container when the files of a project reside on the host.
+
+    This allows the sources of a project, and the results of a previous
+    analysis, to be read without launching a container. Unlike a
+    :class:`ProjectContainer`, it provides no means of executing commands.
+
+    Attributes
+    ----------
+    project: Project | LocalProject
+        The project under analysis, whose directory is a path on the host.
+    files: LocalFileSystem
+        Provides read-only access to the host filesystem.
+    """
+    project: Project | LocalProject
+    files: LocalFileSystem = attr.ib(init=False, factory=LocalFileSystem)
+
+    def read_files(self, filenames: Iterable[str]) -> dict[str, bytes]:
+        """Reads the contents of several files.
+
+        Parameters
+        ----------
+        filenames: Iterable[str]
+            The names of the files that should be read. Relative filenames
+            are resolved against the project directory.
+
+        Returns
+        -------
+        dict[str, bytes]
+            The contents of each file that could be read, indexed by its name
+            as it was given. Files that could not be read are omitted.
+        """
+        contents: dict[str, bytes] = {}
+        for filename in filenames:
+            path = Path(self.project.directory) / filename
+            try:
+                contents[filename] = path.read_bytes()
+            except OSError as err:
+                logger.warning(f"failed to read file [{path}]: {err}")
+        logger.debug(f"read {len(contents)} files from host")
+        return contents
+
+    def hash_files(self, filenames: Iterable[str]) -> dict[str, str]:
+        """Computes the SHA-256 digest of the contents of several files.
+
+        Parameters
+        ----------
+        filenames: Iterable[str]
+            The names of the files that should be hashed. Relative filenames
+            are resolved against the project directory.
+
+        Returns
+        -------
+        dict[str, str]
+            The hex digest of each file that could be read, indexed by its
+            name as it was given. Files that could not be read are omitted.
+        """
+        digests: dict[str, str] = {}
+        for filename in filenames:
+            path = Path(self.project.directory) / filename
+            try:
+                digests[filename] = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                logger.debug(f"failed to hash file: {path}")
+        return digests
+
+    @contextlib.contextmanager
+    def stream_file(self, filename: str) -> Iterator[typing.IO[bytes]]:
+        """Opens a file on the host for reading without loading all of it into memory.
+
+        Parameters
+        ----------
+        filename: str
+            The name of the file. Relative filenames are resolved against
+            the project directory.
+        """
+        with (Path(self.project.directory) / filename).open("rb") as fh:
+            yield fh
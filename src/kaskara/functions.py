@@ -1,19 +1,21 @@
 """Provides functionality for discovering and describing the set of functions contained within a program."""
 from __future__ import annotations
 
-__all__ = ("Function", "ProgramFunctions")
+__all__ = ("FileFunctionsView", "Function", "ProgramFunctions")
 
 import abc
 import itertools
 import os
 import typing as t
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import (
     final,
 )
 
+from .intervals import IntervalIndex
+
 if t.TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator
+    from collections.abc import Collection, Iterable, Iterator
 
     from kaskara.core import FileLocation, FileLocationRange
 
@@ -73,10 +75,21 @@ class Function(abc.ABC):
 
 @dataclass(frozen=True)
 class ProgramFunctions(t.Iterable[Function]):
-    """Represents the set of functions within an associated program."""
+    """Represents the set of functions within an associated program.
+
+    The functions within a file are indexed by their location upon the first
+    lookup within that file, so that the function that encloses a given
+    location can be found in logarithmic time.
+    """
     _project_directory: str
     _filename_to_functions: dict[str, list[Function]]
     _num_functions: int
+    _filename_to_index: dict[str, IntervalIndex[Function]] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
 
     @classmethod
     def empty(cls, project_directory: str) -> ProgramFunctions:
@@ -98,6 +111,13 @@ class ProgramFunctions(t.Iterable[Function]):
             functions=itertools.chain(self, other),
         )
 
+    def without_files(self, filenames: Collection[str]) -> ProgramFunctions:
+        """Creates a new instance without the functions in any of the given files."""
+        return self.from_functions(
+            project_directory=self._project_directory,
+            functions=(f for f in self if f.filename not in filenames),
+        )
+
     def with_relative_locations(self, base: str) -> ProgramFunctions:
         """Creates a new instance with relative file locations."""
         functions = [f.with_relative_locations(base) for f in self]
@@ -127,27 +147,38 @@ class ProgramFunctions(t.Iterable[Function]):
         )
 
     def encloses(self, location: FileLocation) -> Function | None:
-        """Returns the enclosing function, if any, for a given location."""
-        for func in self.in_file(location.filename):
-            if location in func.location:
-                return func
-        return None
-
-    def in_file(self, filename: str) -> ProgramFunctions:
-        """Returns all of the functions defined in a given file."""
-        if os.path.isabs(filename):
-            start = self._project_directory
-            filename = os.path.relpath(filename, start=start)
-
-        if filename not in self._filename_to_functions:
-            return ProgramFunctions.empty(self._project_directory)
-
-        functions = self._filename_to_functions[filename]
-        return ProgramFunctions(
-            _project_directory=self._project_directory,
-            _filename_to_functions={filename: functions},
-            _num_functions=len(functions),
-        )
+        """Returns the enclosing function, if any, for a given location.
+
+        If the location is within several functions (e.g., a lambda within a
+        method), the innermost of those functions is returned.
+        """
+        index = self._index(location.filename)
+        if index is None:
+            return None
+        return index.innermost(location.location)
+
+    def in_file(self, filename: str) -> FileFunctionsView:
+        """Returns a read-only view of all of the functions defined in a given file."""
+        filename = self._to_filename(filename)
+        return FileFunctionsView(self, filename, self._filename_to_functions.get(filename, ()))
+
+    def _index(self, filename: str) -> IntervalIndex[Function] | None:
+        """Returns the index of the functions within a given file, building it if necessary."""
+        filename = self._to_filename(filename)
+        index = self._filename_to_index.get(filename)
+        if index is None:
+            functions = self._filename_to_functions.get(filename)
+            if functions is None:
+                return None
+            index = IntervalIndex.build(functions, _function_location)
+            self._filename_to_index[filename] = index
+        return index
+
+    def _to_filename(self, filename: str) -> str:
+        """Returns the name under which the functions in a given file are stored."""
+        if filename in self._filename_to_functions or not os.path.isabs(filename):
+            return filename
+        return os.path.relpath(filename, start=self._project_directory)
 
     def __len__(self) -> int:
         """Returns a count of the number of functions in the program."""
@@ -157,3 +188,51 @@ class ProgramFunctions(t.Iterable[Function]):
         """Returns an iterator over the functions in the program."""
         for functions in self._filename_to_functions.values():
             yield from functions
+
+
+@dataclass(frozen=True, slots=True)
+class FileFunctionsView(t.Iterable[Function]):
+    """A read-only view of the functions within a single file of a :class:`ProgramFunctions`.
+
+    The view refers to the functions held by its parent rather than copying
+    them, and its lookups use the index that the parent keeps for the file.
+    """
+    _parent: ProgramFunctions
+    _filename: str
+    _functions: t.Sequence[Function]
+
+    @property
+    def filename(self) -> str:
+        """The name of the file, relative to the project directory."""
+        return self._filename
+
+    def __len__(self) -> int:
+        """Returns a count of the number of functions in this file."""
+        return len(self._functions)
+
+    def __iter__(self) -> Iterator[Function]:
+        yield from self._functions
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "functions": [f.to_dict() for f in self],
+        }
+
+    def in_file(self, filename: str) -> FileFunctionsView:
+        """Returns a read-only view of all of the functions defined in a given file."""
+        if self._includes(filename):
+            return self
+        return FileFunctionsView(self._parent, filename, ())
+
+    def encloses(self, location: FileLocation) -> Function | None:
+        """Returns the innermost enclosing function, if any, for a given location."""
+        if not self._includes(location.filename):
+            return None
+        return self._parent.encloses(location)
+
+    def _includes(self, filename: str) -> bool:
+        return self._parent._to_filename(filename) == self._filename
+
+
+def _function_location(function: Function) -> FileLocationRange:
+    return function.location
@@ -3,7 +3,7 @@ from __future__ import annotations
 __all__ = ("InsertionPoint", "ProgramInsertionPoints")
 
 import typing as t
-from collections.abc import Iterable, Iterator
+from collections.abc import Collection, Iterable, Iterator
 
 import attr
 from loguru import logger
@@ -39,6 +39,13 @@ class ProgramInsertionPoints(Iterable[InsertionPoint]):
     def merge(self, other: ProgramInsertionPoints) -> ProgramInsertionPoints:
         return ProgramInsertionPoints(list(self) + list(other))
 
+    def without_files(self, filenames: Collection[str]) -> ProgramInsertionPoints:
+        """Creates a new instance without the insertion points in any of the given files."""
+        return ProgramInsertionPoints([
+            insertion_point for insertion_point in self
+            if insertion_point.location.filename not in filenames
+        ])
+
     def with_relative_locations(self, base: str) -> ProgramInsertionPoints:
         return ProgramInsertionPoints([
             insertion_point.with_relative_location(base)
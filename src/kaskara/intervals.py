@@ -0,0 +1,117 @@
+"""Provides an index for finding the ranges within a file that contain a given location."""
+from __future__ import annotations
+
+__all__ = ("IntervalIndex",)
+
+import bisect
+import typing as t
+from dataclasses import dataclass
+
+if t.TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
+
+    from kaskara.core import FileLocationRange, Location
+
+T = t.TypeVar("T")
+
+# the position of a location, as a (line, column) pair, which is cheaper to compare
+_Position = tuple[int, int]
+
+_NO_PARENT = -1
+
+
+@dataclass(frozen=True, slots=True)
+class IntervalIndex(t.Generic[T]):
+    """Finds the items whose ranges, within a single file, contain a given location.
+
+    Items are sorted by the start of their range (longest range first) and
+    each item is linked to the last item before it whose range contains its
+    start. Following these links from the last item that starts at or before
+    a location visits every range that contains that location, from the
+    innermost outwards. Each lookup takes O(log n + d + k) time, where d is
+    the depth of nesting at the location and k is the number of items found.
+    """
+    _items: Sequence[T]
+    _starts: Sequence[_Position]
+    _stops: Sequence[_Position]
+    _parents: Sequence[int]
+
+    @classmethod
+    def build(
+        cls,
+        items: Iterable[T],
+        location: Callable[[T], FileLocationRange],
+    ) -> IntervalIndex[T]:
+        """Builds an index of the given items.
+
+        Parameters
+        ----------
+        items: Iterable[T]
+            The items that should be indexed, which must all belong to the
+            same file.
+        location: Callable[[T], FileLocationRange]
+            Returns the range of locations spanned by a given item.
+        """
+        entries: list[tuple[_Position, _Position, T]] = []
+        for item in items:
+            range_ = location(item)
+            start = (range_.start.line, range_.start.column)
+            stop = (range_.stop.line, range_.stop.column)
+            entries.append((start, stop, item))
+        entries.sort(key=lambda entry: (entry[0], -entry[1][0], -entry[1][1]))
+
+        starts = [start for start, _, _ in entries]
+        stops = [stop for _, stop, _ in entries]
+        parents: list[int] = []
+        for index, start in enumerate(starts):
+            # every range that contains this start also contains the start of
+            # the previous range, and so is found by following its links
+            parent = index - 1
+            while parent != _NO_PARENT and stops[parent] <= start:
+                parent = parents[parent]
+            parents.append(parent)
+
+        return cls(
+            _items=[item for _, _, item in entries],
+            _starts=starts,
+            _stops=stops,
+            _parents=parents,
+        )
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def containing(self, location: Location) -> Iterator[T]:
+        """Returns an iterator over the items that contain a given location, innermost first."""
+        for item, _ in self._containing((location.line, location.column)):
+            yield item
+
+    def _containing(self, position: _Position) -> Iterator[tuple[T, _Position]]:
+        """Returns an iterator over the items, and their starts, that contain a given position."""
+        index = bisect.bisect_right(self._starts, position) - 1
+        while index != _NO_PARENT:
+            if position < self._stops[index]:
+                yield self._items[index], self._starts[index]
+            index = self._parents[index]
+
+    def overlapping(self, start: Location, stop: Location) -> Iterator[T]:
+        """Returns an iterator over the items that overlap a given range, in order of their start."""
+        start_position = (start.line, start.column)
+        stop_position = (stop.line, stop.column)
+
+        # items that start before the range overlap it only if they contain its start
+        enclosing = [
+            item for item, item_start in self._containing(start_position)
+            if item_start < start_position
+        ]
+        yield from reversed(enclosing)
+
+        first = bisect.bisect_left(self._starts, start_position)
+        last = bisect.bisect_left(self._starts, stop_position, lo=first)
+        for index in range(first, last):
+            if start_position < self._stops[index]:
+                yield self._items[index]
+
+    def innermost(self, location: Location) -> T | None:
+        """Returns the innermost item that contains a given location, if any."""
+        return next(self.containing(location), None)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 __all__ = ("ProgramLoops",)
 
+import itertools
 import os
 import typing as t
 from dataclasses import dataclass
@@ -14,7 +15,7 @@ from .core import (
 )
 
 if t.TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Collection, Iterable
 
 
 @dataclass(frozen=True, slots=True)
@@ -42,12 +43,17 @@ class ProgramLoops:
         )
 
     def merge(self, other: ProgramLoops) -> ProgramLoops:
-        covered_by_loop_bodies = self._covered_by_loop_bodies.union(
-            other._covered_by_loop_bodies,
+        # FileLocationRangeSet is immutable and provides no union
+        return self.from_body_location_ranges(
+            self._project_directory,
+            itertools.chain(self._covered_by_loop_bodies, other._covered_by_loop_bodies),
         )
-        return ProgramLoops(
-            _covered_by_loop_bodies=covered_by_loop_bodies,
-            _project_directory=self._project_directory,
+
+    def without_files(self, filenames: Collection[str]) -> ProgramLoops:
+        """Creates a new instance without the loops in any of the given files."""
+        return self.from_body_location_ranges(
+            self._project_directory,
+            (body for body in self._covered_by_loop_bodies if body.filename not in filenames),
         )
 
     def with_relative_locations(self, base: str) -> ProgramLoops:
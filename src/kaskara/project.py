@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-__all__ = ("Project",)
+__all__ = ("LocalProject", "Project")
 
 import contextlib
 import typing as t
@@ -9,7 +9,7 @@ import attr
 
 from kaskara.clang.common import VOLUME_LOCATION as KASKARA_CLANG_VOLUME_LOCATION
 from kaskara.clang.common import VOLUME_NAME as KASKARA_CLANG_VOLUME_NAME
-from kaskara.container import ProjectContainer
+from kaskara.container import LocalProjectContainer, ProjectContainer
 from kaskara.spoon.common import VOLUME_LOCATION as KASKARA_SPOON_VOLUME_LOCATION
 from kaskara.spoon.common import VOLUME_NAME as KASKARA_SPOON_VOLUME_NAME
 from kaskara.util import dockerblade_from_env
@@ -78,19 +78,34 @@ class Project:
         *,
         mount_kaskara_clang: bool = True,
         mount_kaskara_spoon: bool = False,
+        volumes: t.Mapping[str, str] | None = None,
     ) -> Iterator[ProjectContainer]:
-        """Provisions a Docker container for the project."""
+        """Provisions a Docker container for the project.
+
+        Parameters
+        ----------
+        mount_kaskara_clang: bool
+            Mounts the Clang analyser backend into the container.
+        mount_kaskara_spoon: bool
+            Mounts the Spoon analyser backend into the container.
+        volumes: Mapping[str, str], optional
+            Additional named Docker volumes, indexed by name, that should be
+            mounted read-write into the container at the given locations.
+        """
         launch = self._dockerblade.client.containers.run
         with contextlib.ExitStack() as stack:
-            volumes: dict[str, t.Any] = {}
+            volumes_: dict[str, t.Any] = {
+                name: {"bind": location, "mode": "rw"}
+                for name, location in (volumes or {}).items()
+            }
             if mount_kaskara_clang:
-                volumes[KASKARA_CLANG_VOLUME_NAME] = {
+                volumes_[KASKARA_CLANG_VOLUME_NAME] = {
                     "bind": KASKARA_CLANG_VOLUME_LOCATION,
                     "mode": "ro",
                 }
 
             if mount_kaskara_spoon:
-                volumes[KASKARA_SPOON_VOLUME_NAME] = {
+                volumes_[KASKARA_SPOON_VOLUME_NAME] = {
                     "bind": KASKARA_SPOON_VOLUME_LOCATION,
                     "mode": "ro",
                 }
@@ -99,7 +114,7 @@ class Project:
                 self.image,
                 "/bin/sh",
                 stdin_open=True,
-                volumes=volumes,
+                volumes=volumes_,
                 detach=True,
             )
 
@@ -114,3 +129,40 @@ class Project:
         """
         dockerblade = self._dockerblade.attach(id_or_name)
         return ProjectContainer(project=self, dockerblade=dockerblade)
+
+
+@attr.s(frozen=True, slots=True, auto_attribs=True)
+class LocalProject:
+    """Describes a project whose source code resides on the host.
+
+    Local projects are analysed without launching a Docker container, and so
+    are only supported by analysers that do not need to execute a backend
+    within the container (e.g., :class:`kaskara.python.PythonAnalyser`).
+
+    Attributes
+    ----------
+    directory: str
+        The absolute path of the root directory on the host that holds the
+        source code for this project.
+    files: FrozenSet[str]
+        The set of source code files for this project.
+    ignore_errors: bool
+        Indicates whether or not the analysis should proceed in the face of
+        errors. If set to :code:`True`, the analysis will return partial
+        results; if set to :code:`False`, an exception will be thrown instead.
+    """
+    directory: str
+    files: frozenset[str] = attr.ib(converter=frozenset)
+    ignore_errors: bool = attr.ib(default=True)
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "directory": self.directory,
+            "files": list(self.files),
+            "ignore-errors": self.ignore_errors,
+        }
+
+    @contextlib.contextmanager
+    def provision(self) -> Iterator[LocalProjectContainer]:
+        """Provides access to the files of the project on the host."""
+        yield LocalProjectContainer(self)
@@ -1,12 +1,15 @@
 __all__ = (
     "PythonAnalyser",
+    "PythonAnalysisCache",
     "PythonFunction",
     "PythonStatement",
+    "collector",
     "functions",
     "loops",
     "statements",
 )
 
-from . import functions, loops, statements
+from . import collector, functions, loops, statements
 from .analyser import PythonAnalyser
 from .analysis import PythonFunction, PythonStatement
+from .cache import PythonAnalysisCache
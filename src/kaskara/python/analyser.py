@@ -3,38 +3,75 @@ from __future__ import annotations
 __all__ = ("PythonAnalyser",)
 
 import contextlib
+import itertools
 import typing as t
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 
 from loguru import logger
 
 from kaskara.analyser import Analyser
 from kaskara.analysis import Analysis
-from kaskara.python.functions import collect_functions
-from kaskara.python.loops import collect_loops
-from kaskara.python.statements import collect_statements
+from kaskara.functions import ProgramFunctions
+from kaskara.loops import ProgramLoops
+from kaskara.python.collector import PythonFileAnalysis, collect_source
+from kaskara.python.util import read_sources
+from kaskara.statements import ProgramStatements
 
 if t.TYPE_CHECKING:
-    from kaskara.container import ProjectContainer
-    from kaskara.project import Project
+    from kaskara.container import LocalProjectContainer, ProjectContainer
+    from kaskara.project import LocalProject, Project
+    from kaskara.python.cache import PythonAnalysisCache
 
 
 @dataclass
 class PythonAnalyser(Analyser):
-    _project: Project
-    _container: ProjectContainer
+    _project: Project | LocalProject
+    _container: ProjectContainer | LocalProjectContainer
+    _workers: int = field(default=1)
+    _cache: PythonAnalysisCache | None = field(default=None)
+
+    def __post_init__(self) -> None:
+        if self._workers < 1:
+            message = f"number of workers must be positive: {self._workers}"
+            raise ValueError(message)
 
     @classmethod
     @contextlib.contextmanager
-    def for_project(cls, project: Project) -> t.Iterator[t.Self]:
+    def for_project(
+        cls,
+        project: Project | LocalProject,
+        *,
+        workers: int = 1,
+        cache: PythonAnalysisCache | None = None,
+    ) -> t.Iterator[t.Self]:
+        """Creates an analyser for a given project.
+
+        If given a :class:`LocalProject`, the project is analysed directly on
+        the host rather than within a container. If given a cache, only those
+        files whose analysis is not already cached are analysed.
+        """
         logger.debug(f"analysing Python project: {project}")
         with project.provision() as container:
-            yield cls(project, container)
+            yield cls(project, container, workers, cache)
 
     def run(self) -> Analysis:
-        functions = collect_functions(self._container)
-        statements = collect_statements(self._container)
-        loops = collect_loops(self._container)
+        project = self._project
+        logger.debug(f"collecting functions, statements, and loops for project [{project}]")
+        sources = read_sources(self._container, sorted(project.files))
+        files = self._collect_sources(sources)
+        functions = ProgramFunctions.from_functions(
+            project_directory=project.directory,
+            functions=itertools.chain.from_iterable(f.functions for f in files),
+        )
+        statements = ProgramStatements.build(
+            project.directory,
+            itertools.chain.from_iterable(f.statements for f in files),
+        )
+        loops = ProgramLoops.from_body_location_ranges(
+            project.directory,
+            itertools.chain.from_iterable(f.loops for f in files),
+        )
         insertions = statements.insertions()
         return Analysis(
             files=self._project.files,
@@ -43,3 +80,32 @@ class PythonAnalyser(Analyser):
             insertions=insertions,
             loops=loops,
         )
+
+    def _collect_sources(self, sources: t.Mapping[str, str]) -> list[PythonFileAnalysis]:
+        """Collects the contents of each file, preserving the order of the given sources."""
+        cache = self._cache
+        if cache is None:
+            return self._collect_uncached_sources(sources)
+
+        file_to_analysis, misses = cache.partition(sources)
+        for analysis in self._collect_uncached_sources(misses):
+            cache.store(analysis, misses[analysis.filename])
+            file_to_analysis[analysis.filename] = analysis
+        return [file_to_analysis[filename] for filename in sources]
+
+    def _collect_uncached_sources(self, sources: t.Mapping[str, str]) -> list[PythonFileAnalysis]:
+        if self._workers == 1 or len(sources) <= 1:
+            return [
+                collect_source(filename, source)
+                for filename, source in sources.items()
+            ]
+
+        logger.debug(f"collecting {len(sources)} files using {self._workers} worker processes")
+        chunksize = max(1, len(sources) // (self._workers * 4))
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            return list(executor.map(
+                collect_source,
+                sources.keys(),
+                sources.values(),
+                chunksize=chunksize,
+            ))
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-__all__ = ("PythonFunction", "PythonStatement")
+__all__ = ("CanonicalForm", "PythonFunction", "PythonStatement")
 
+import ast
 import typing as t
 
+import astor
 import attr
 from overrides import overrides
 
@@ -12,6 +14,7 @@ from kaskara.statements import Statement
 
 if t.TYPE_CHECKING:
     from kaskara.core import FileLocationRange
+    from kaskara.source import SourceSpan
 
 
 @attr.s(frozen=True, auto_attribs=True, slots=True)
@@ -41,13 +44,89 @@ class PythonFunction(Function):
         return None
 
 
+class CanonicalForm:
+    """Lazily computes the canonical source code for a statement.
+
+    Rather than keeping the AST node of the statement, which would keep the
+    AST of its entire file alive for as long as the statement, the content of
+    the statement is parsed again when its canonical form is first computed.
+
+    Canonical forms of simple statements are memoised by the structure of
+    their AST node, ignoring source positions, so that structurally identical
+    statements that share a memo also share a single string. Compound
+    statements (i.e., those with a body) are rarely identical and are costly
+    to key, so they are not memoised.
+    """
+    __slots__ = ("_column", "_content", "_memo")
+
+    def __init__(self, content: str | SourceSpan, column: int, memo: dict[str, str]) -> None:
+        self._content = content
+        self._column = column
+        self._memo = memo
+
+    def compute(self) -> str:
+        """Computes the canonical form, or retrieves it from the memo."""
+        node = self._parse()
+        if hasattr(node, "body"):
+            return self._render(node)
+
+        key = ast.dump(node)
+        if key not in self._memo:
+            self._memo[key] = self._render(node)
+        return self._memo[key]
+
+    def _parse(self) -> ast.stmt:
+        """Parses the content of the statement, which begins at a given column of its first line."""
+        text = str(self._content)
+
+        # the branches of an if statement after the first are themselves if statements
+        stripped = text.lstrip()
+        if stripped.startswith("elif"):
+            text = text[:len(text) - len(stripped)] + stripped[2:]
+
+        if self._column == 0:
+            return ast.parse(text).body[0]
+
+        # the content of a statement that spans several lines includes the
+        # indentation of its first line; that of any other statement does not
+        if not text[:1].isspace():
+            text = " " * self._column + text
+        block = ast.parse(f"if 1:\n{text}").body[0]
+        assert isinstance(block, ast.If)
+        return block.body[0]
+
+    @staticmethod
+    def _render(node: ast.AST) -> str:
+        canonical: str = astor.to_source(node)
+        return canonical
+
+
 @attr.s(frozen=True, auto_attribs=True, slots=True)
 class PythonStatement(Statement):
+    """Describes a Python statement.
+
+    The content of the statement may be given as a :class:`SourceSpan` over
+    the shared source text of its file, and the canonical form may be given as
+    a :class:`CanonicalForm`; in either case, the text is only materialised
+    when it is accessed.
+    """
     kind: str
-    content: str
-    canonical: str
+    _content: str | SourceSpan = attr.ib(eq=str, repr=lambda content: repr(str(content)))
+    _canonical: str | CanonicalForm = attr.ib(eq=False, repr=False)
     location: FileLocationRange
 
+    @property
+    def content(self) -> str:
+        return str(self._content)
+
+    @property
+    def canonical(self) -> str:
+        canonical = self._canonical
+        if isinstance(canonical, CanonicalForm):
+            canonical = canonical.compute()
+            object.__setattr__(self, "_canonical", canonical)
+        return canonical
+
     @overrides
     def with_relative_locations(self, base: str) -> PythonStatement:
         return attr.evolve(
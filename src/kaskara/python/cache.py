@@ -0,0 +1,110 @@
+"""Provides an on-disk cache of the per-file results of analysing Python files."""
+from __future__ import annotations
+
+__all__ = ("DEFAULT_CACHE_DIRECTORY", "PythonAnalysisCache")
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import typing as t
+from pathlib import Path
+
+import attr
+from loguru import logger
+
+from kaskara.python.collector import PythonFileAnalysis
+from kaskara.version import __version__
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".kaskara", "cache")  # noqa: PTH111
+
+
+@attr.s(frozen=True, slots=True, auto_attribs=True)
+class PythonAnalysisCache:
+    """Caches the functions, statements, and loops within individual Python files.
+
+    Each entry is keyed by the name and contents of its file, the version of
+    Kaskara, and the version of the Python grammar that was used to parse the
+    file. An entry is therefore never stale: a change to any of those yields a
+    different key, and so the file is analysed afresh.
+
+    Attributes
+    ----------
+    directory: str
+        The directory on the host in which entries are stored.
+    """
+    directory: str = attr.ib(default=DEFAULT_CACHE_DIRECTORY)
+
+    def key(self, filename: str, source: str) -> str:
+        """Computes the key for the analysis of a given file."""
+        grammar_version = ".".join(str(part) for part in sys.version_info[:2])
+        hasher = hashlib.sha256()
+        for part in (__version__, grammar_version, filename, source):
+            hasher.update(part.encode("utf-8"))
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return Path(self.directory) / "python" / key[:2] / f"{key}.pickle"
+
+    def load(self, filename: str, source: str) -> PythonFileAnalysis | None:
+        """Retrieves the cached analysis of a given file, if there is one."""
+        path = self._path(self.key(filename, source))
+        try:
+            with path.open("rb") as fh:
+                analysis = pickle.load(fh)  # noqa: S301
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as err:
+            logger.warning(f"ignoring unreadable cache entry [{path}]: {err}")
+            return None
+
+        if not isinstance(analysis, PythonFileAnalysis):
+            logger.warning(f"ignoring malformed cache entry [{path}]")
+            return None
+        logger.trace(f"loaded cached analysis of file: {filename}")
+        return analysis
+
+    def store(self, analysis: PythonFileAnalysis, source: str) -> None:
+        """Stores the analysis of a given file in the cache."""
+        path = self._path(self.key(analysis.filename, source))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first so that concurrent readers never
+            # observe a partially written entry
+            fd, temporary_filename = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            temporary_path = Path(temporary_filename)
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    pickle.dump(analysis, fh, protocol=pickle.HIGHEST_PROTOCOL)
+                temporary_path.replace(path)
+            finally:
+                temporary_path.unlink(missing_ok=True)
+        except OSError as err:
+            logger.warning(f"failed to store cache entry [{path}]: {err}")
+            return
+        logger.trace(f"cached analysis of file: {analysis.filename}")
+
+    def partition(
+        self,
+        sources: t.Mapping[str, str],
+    ) -> tuple[dict[str, PythonFileAnalysis], dict[str, str]]:
+        """Splits the given sources into those that are cached and those that are not.
+
+        Returns
+        -------
+        tuple[dict[str, PythonFileAnalysis], dict[str, str]]
+            The cached analyses, indexed by filename, and the sources of the
+            files that are missing from the cache.
+        """
+        hits: dict[str, PythonFileAnalysis] = {}
+        misses: dict[str, str] = {}
+        for filename, source in sources.items():
+            analysis = self.load(filename, source)
+            if analysis is None:
+                misses[filename] = source
+            else:
+                hits[filename] = analysis
+        logger.debug(f"found {len(hits)} of {len(sources)} files in cache [{self.directory}]")
+        return hits, misses
@@ -0,0 +1,145 @@
+"""Collects the functions, statements, and loops in a Python file using a single parse and traversal."""
+from __future__ import annotations
+
+__all__ = ("CollectFileVisitor", "PythonFileAnalysis", "collect_file", "collect_source")
+
+import ast
+import typing as t
+
+import attr
+from loguru import logger
+
+from kaskara.python.analysis import CanonicalForm, PythonFunction, PythonStatement
+from kaskara.python.statements import STMT_CLASS_NAMES
+from kaskara.python.util import ast_from_source, ast_location, ast_source_span, ast_with_tokens
+
+if t.TYPE_CHECKING:
+    import asttokens
+
+    from kaskara.container import LocalProjectContainer, ProjectContainer
+    from kaskara.core import FileLocationRange
+
+LOOP_CLASSES = (ast.For, ast.AsyncFor, ast.While)
+
+
+@attr.s(frozen=True, slots=True, auto_attribs=True)
+class PythonFileAnalysis:
+    """Describes the functions, statements, and loops within a single Python file.
+
+    Attributes
+    ----------
+    filename: str
+        The name of the file, relative to the project directory.
+    functions: t.Sequence[PythonFunction]
+        The functions defined within the file.
+    statements: t.Sequence[PythonStatement]
+        The statements within the file.
+    loops: t.Sequence[FileLocationRange]
+        The location ranges covered by loop bodies within the file.
+    """
+    filename: str
+    functions: t.Sequence[PythonFunction]
+    statements: t.Sequence[PythonStatement]
+    loops: t.Sequence[FileLocationRange]
+
+
+def collect_file(
+    container: ProjectContainer | LocalProjectContainer,
+    filename: str,
+) -> PythonFileAnalysis:
+    """Finds all functions, statements, and loops within a given file in a container."""
+    logger.debug(f"collecting functions, statements, and loops in file {filename} "
+                 f"for project [{container.project}]")
+    atok = ast_with_tokens(container, filename)
+    return _collect(atok)
+
+
+def collect_source(filename: str, source: str) -> PythonFileAnalysis:
+    """Finds all functions, statements, and loops within the given source code for a file."""
+    logger.debug(f"collecting functions, statements, and loops in file {filename}")
+    return _collect(ast_from_source(filename, source))
+
+
+def _collect(atok: asttokens.ASTTokens) -> PythonFileAnalysis:
+    visitor = CollectFileVisitor(atok)
+    visitor.visit(atok.tree)  # type: ignore
+    return PythonFileAnalysis(
+        filename=atok._filename,
+        functions=visitor.functions,
+        statements=visitor.statements,
+        loops=visitor.loops,
+    )
+
+
+class CollectFileVisitor(ast.NodeVisitor):
+    """Fills the function, statement, and loop databases for a file in one traversal.
+
+    The results are identical to those produced by running
+    :class:`CollectFunctionsVisitor`, :class:`CollectStatementsVisitor`, and
+    :class:`CollectLoopsVisitor` over the same file: functions nested inside
+    other functions and loops nested inside other loops are not reported, and
+    statements are only reported if every enclosing node is itself a
+    statement, an exception handler, or the module.
+    """
+    def __init__(self, atok: asttokens.ASTTokens) -> None:
+        super().__init__()
+        self.atok = atok
+        self.functions: list[PythonFunction] = []
+        self.statements: list[PythonStatement] = []
+        self.loops: list[FileLocationRange] = []
+        self._canonical_forms: dict[str, str] = {}
+        self._in_statement_scope = True
+        self._in_function = False
+        self._in_loop = False
+
+    def generic_visit(self, node: ast.AST) -> None:
+        in_statement_scope = self._in_statement_scope
+        in_function = self._in_function
+        in_loop = self._in_loop
+
+        is_statement = node.__class__.__name__ in STMT_CLASS_NAMES
+        if in_statement_scope and is_statement:
+            self._collect_statement(node)
+        if not in_function and isinstance(node, ast.FunctionDef):
+            self._collect_function(node)
+            self._in_function = True
+        if not in_loop and isinstance(node, LOOP_CLASSES):
+            self._collect_loop(node)
+            self._in_loop = True
+        self._in_statement_scope = in_statement_scope and (
+            is_statement or isinstance(node, ast.Module | ast.ExceptHandler)
+        )
+
+        # avoid descending into subtrees that cannot contain anything new
+        if self._in_statement_scope or not self._in_function or not self._in_loop:
+            super().generic_visit(node)
+
+        self._in_statement_scope = in_statement_scope
+        self._in_function = in_function
+        self._in_loop = in_loop
+
+    def _collect_statement(self, node: ast.AST) -> None:
+        location = ast_location(self.atok, node)
+        content = ast_source_span(self.atok, node)
+        stmt = PythonStatement(
+            kind=node.__class__.__name__,
+            content=content,
+            canonical=CanonicalForm(content, location.start.column, self._canonical_forms),
+            location=location,
+        )
+        logger.trace(f"found statement at location: {location}")
+        self.statements.append(stmt)
+
+    def _collect_function(self, node: ast.FunctionDef) -> None:
+        function = PythonFunction(
+            name=node.name,
+            location=ast_location(self.atok, node),
+            body_location=ast_location(self.atok, node.body),
+        )
+        logger.trace(f"found function definition: {function}")
+        self.functions.append(function)
+
+    def _collect_loop(self, node: ast.For | ast.AsyncFor | ast.While) -> None:
+        self.loops.append(ast_location(self.atok, node.body))
+        if node.orelse:
+            self.loops.append(ast_location(self.atok, node.orelse))
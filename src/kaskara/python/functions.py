@@ -8,7 +8,7 @@ from loguru import logger
 from kaskara.container import ProjectContainer
 from kaskara.functions import ProgramFunctions
 from kaskara.python.analysis import PythonFunction
-from kaskara.python.util import ast_location, ast_with_tokens
+from kaskara.python.util import ast_from_source, ast_location, ast_with_tokens, read_sources
 
 if t.TYPE_CHECKING:
     import asttokens
@@ -18,8 +18,9 @@ def collect_functions(container: ProjectContainer) -> ProgramFunctions:
     """Finds all functions within a Python project given a container."""
     logger.debug(f"collecting functions for project [{container.project}]")
     visitor = CollectFunctionsVisitor(container)
-    for filename in container.project.files:
-        visitor.collect(filename)
+    sources = read_sources(container, container.project.files)
+    for filename, source in sources.items():
+        visitor.collect(filename, source)
     return ProgramFunctions.from_functions(
         project_directory=container.project.directory,
         functions=visitor.functions,
@@ -42,8 +43,11 @@ class CollectFunctionsVisitor(ast.NodeVisitor):
         logger.debug(f"found function definition: {function}")
         self.functions.append(function)
 
-    def collect(self, filename: str) -> None:
-        self.atok = ast_with_tokens(self.container, filename)
+    def collect(self, filename: str, source: str | None = None) -> None:
+        if source is None:
+            self.atok = ast_with_tokens(self.container, filename)
+        else:
+            self.atok = ast_from_source(filename, source)
         project = self.container
         logger.debug(f"collecting functions in file {filename} "
                      f"for project [{project}]")
@@ -7,7 +7,7 @@ from loguru import logger
 
 from kaskara.container import ProjectContainer
 from kaskara.loops import ProgramLoops
-from kaskara.python.util import ast_location, ast_with_tokens
+from kaskara.python.util import ast_from_source, ast_location, ast_with_tokens, read_sources
 
 if t.TYPE_CHECKING:
     import asttokens
@@ -19,8 +19,9 @@ def collect_loops(container: ProjectContainer) -> ProgramLoops:
     """Finds all loops within a Python project given a container."""
     logger.debug(f"collecting loops for project [{container.project}]")
     visitor = CollectLoopsVisitor(container)
-    for filename in container.project.files:
-        visitor.collect(filename)
+    sources = read_sources(container, container.project.files)
+    for filename, source in sources.items():
+        visitor.collect(filename, source)
     return ProgramLoops.from_body_location_ranges(
         container.project.directory,
         visitor.locations,
@@ -45,8 +46,11 @@ class CollectLoopsVisitor(ast.NodeVisitor):
     visit_AsyncFor = visit_loop
     visit_While = visit_loop
 
-    def collect(self, filename: str) -> None:
-        self.atok = ast_with_tokens(self.container, filename)
+    def collect(self, filename: str, source: str | None = None) -> None:
+        if source is None:
+            self.atok = ast_with_tokens(self.container, filename)
+        else:
+            self.atok = ast_from_source(filename, source)
         project = self.container
         logger.debug(f"collecting loops in file {filename} "
                      f"for project [{project}]")
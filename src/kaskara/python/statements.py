@@ -5,11 +5,10 @@ __all__ = ("collect_statements",)
 import ast
 import typing as t
 
-import astor
 from loguru import logger
 
-from kaskara.python.analysis import PythonStatement
-from kaskara.python.util import ast_location, ast_with_tokens
+from kaskara.python.analysis import CanonicalForm, PythonStatement
+from kaskara.python.util import ast_from_source, ast_location, ast_source_span, ast_with_tokens, read_sources
 from kaskara.statements import ProgramStatements
 
 if t.TYPE_CHECKING:
@@ -50,8 +49,9 @@ def collect_statements(container: ProjectContainer) -> ProgramStatements:
     """Finds all statements within a Python project given a container."""
     logger.debug(f"collecting statements for project [{container.project}]")
     visitor = CollectStatementsVisitor(container)
-    for filename in container.project.files:
-        visitor.collect(filename)
+    sources = read_sources(container, container.project.files)
+    for filename, source in sources.items():
+        visitor.collect(filename, source)
     return ProgramStatements(
         container.project.directory,
         visitor.statements,
@@ -64,6 +64,7 @@ class CollectStatementsVisitor(ast.NodeVisitor):
         self.atok: asttokens.ASTTokens
         self.container = container
         self.statements: list[PythonStatement] = []
+        self._canonical_forms: dict[str, str] = {}
 
     def visit_Module(self, node: ast.Module) -> None:
         for stmt in node.body:
@@ -82,12 +83,12 @@ class CollectStatementsVisitor(ast.NodeVisitor):
 
     def _collect_stmt(self, node: ast.AST) -> None:
         kind = node.__class__.__name__
-        canonical = astor.to_source(node)
         location = ast_location(self.atok, node)
-        source = self.atok.get_text(node)
+        content = ast_source_span(self.atok, node)
+        canonical = CanonicalForm(content, location.start.column, self._canonical_forms)
         stmt = PythonStatement(
             kind=kind,
-            content=source,
+            content=content,
             canonical=canonical,
             location=location,
         )
@@ -95,8 +96,11 @@ class CollectStatementsVisitor(ast.NodeVisitor):
         logger.debug(f"statement at location: {location}")
         self.statements.append(stmt)
 
-    def collect(self, filename: str) -> None:
-        self.atok = ast_with_tokens(self.container, filename)
+    def collect(self, filename: str, source: str | None = None) -> None:
+        if source is None:
+            self.atok = ast_with_tokens(self.container, filename)
+        else:
+            self.atok = ast_from_source(filename, source)
         project = self.container
         logger.debug(f"collecting statements in file {filename} "
                      f"for project [{project}]")
@@ -1,17 +1,51 @@
-__all__ = ("ast_with_tokens", "ast_location")
+__all__ = (
+    "ast_from_source",
+    "ast_with_tokens",
+    "ast_location",
+    "ast_source_span",
+    "read_sources",
+)
 
 import ast
+import io
 import os
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 
 import asttokens
 from loguru import logger
 
-from kaskara.container import ProjectContainer
+from kaskara.container import LocalProjectContainer, ProjectContainer
 from kaskara.core import FileLocationRange, Location, LocationRange
+from kaskara.exceptions import KaskaraException
+from kaskara.source import SourceSpan
 
 
-def ast_with_tokens(container: ProjectContainer,
+def read_sources(container: ProjectContainer | LocalProjectContainer,
+                 filenames: Iterable[str],
+                 ) -> dict[str, str]:
+    """Reads the source code for a number of files in a container in bulk."""
+    filenames = list(filenames)
+    logger.debug(f"reading {len(filenames)} source files "
+                 f"in project [{container.project}]")
+    assert not any(os.path.isabs(filename) for filename in filenames)
+    file_to_contents = container.read_files(filenames)
+    sources: dict[str, str] = {}
+    for filename in filenames:
+        if filename not in file_to_contents:
+            message = f"failed to read source file: {filename}"
+            raise KaskaraException(message)
+        # decode with universal newlines, as would happen when reading the file
+        contents = io.BytesIO(file_to_contents[filename])
+        sources[filename] = io.TextIOWrapper(contents, encoding="utf-8").read()
+    return sources
+
+
+def ast_from_source(filename: str, source: str) -> asttokens.ASTTokens:
+    """Parses the AST (with tokens) for the given source code of a file."""
+    return asttokens.ASTTokens(source, filename=filename, parse=True)
+
+
+def ast_with_tokens(container: ProjectContainer | LocalProjectContainer,
                     filename: str,
                     ) -> asttokens.ASTTokens:
     """Retrieves the AST (with tokens) for a given file in a container."""
@@ -20,7 +54,7 @@ def ast_with_tokens(container: ProjectContainer,
     assert not os.path.isabs(filename)
     abs_filename = os.path.join(container.project.directory, filename)
     file_contents = container.files.read(abs_filename)
-    return asttokens.ASTTokens(file_contents, filename=filename, parse=True)
+    return ast_from_source(filename, file_contents)
 
 
 def ast_location(atok: asttokens.ASTTokens,
@@ -45,3 +79,9 @@ def ast_location(atok: asttokens.ASTTokens,
     location_end = Location(line=line_end, column=col_end)
     location_range = LocationRange(location_start, location_end)
     return FileLocationRange(filename, location_range)
+
+
+def ast_source_span(atok: asttokens.ASTTokens, node: ast.AST) -> SourceSpan:
+    """Determines the span of the shared source text for a node in an AST."""
+    start, stop = atok.get_text_range(node)
+    return SourceSpan(atok.text, start, stop)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+__all__ = ("ProgramSnippets", "Snippet")
+
+import typing as t
+from collections.abc import Collection, Iterable, Iterator
+
+import attr
+from loguru import logger
+
+if t.TYPE_CHECKING:
+    from kaskara.core import FileLocationRange
+
+
+@attr.s(frozen=True, slots=True, auto_attribs=True)
+class Snippet:
+    """Describes a distinct fragment of source code within a program.
+
+    Attributes
+    ----------
+    content: str
+        The source code for the snippet, which uniquely identifies it.
+    kind: str
+        The kind of statement that the snippet represents.
+    reads: frozenset[str]
+        The names of the variables that are read by the snippet.
+    locations: tuple[FileLocationRange, ...]
+        The locations at which the snippet occurs within the program,
+        in ascending order.
+    """
+    content: str
+    kind: str = attr.ib(eq=False)
+    reads: frozenset[str] = attr.ib(eq=False, repr=False)
+    locations: tuple[FileLocationRange, ...] = attr.ib(eq=False, repr=False)
+
+    def with_relative_locations(self, base: str) -> Snippet:
+        return attr.evolve(
+            self,
+            locations=tuple(location.with_relative_location(base) for location in self.locations),
+        )
+
+    def with_locations(self, locations: Iterable[FileLocationRange]) -> Snippet:
+        """Returns a copy of this snippet that also occurs at the given locations."""
+        return attr.evolve(
+            self,
+            locations=tuple(sorted(set(self.locations).union(locations))),
+        )
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "content": self.content,
+            "kind": self.kind,
+            "reads": sorted(self.reads),
+            "locations": [str(location) for location in self.locations],
+        }
+
+
+class ProgramSnippets(Iterable[Snippet]):
+    """Provides access to the distinct snippets within a program, indexed by their content.
+
+    Snippets with the same content are combined into a single snippet that
+    occurs at each of their locations.
+    """
+    def __init__(self, contents: Iterable[Snippet]) -> None:
+        self.__content_to_snippet: dict[str, Snippet] = {}
+        for snippet in contents:
+            existing = self.__content_to_snippet.get(snippet.content)
+            if existing is not None:
+                snippet = existing.with_locations(snippet.locations)  # noqa: PLW2901
+            self.__content_to_snippet[snippet.content] = snippet
+        logger.debug(f"indexed {len(self.__content_to_snippet)} snippets")
+
+    def merge(self, other: ProgramSnippets) -> ProgramSnippets:
+        return ProgramSnippets([*self, *other])
+
+    def without_files(self, filenames: Collection[str]) -> ProgramSnippets:
+        """Creates a new instance without the occurrences of snippets in any of the given files.
+
+        Snippets that only occur within those files are removed entirely.
+        """
+        snippets: list[Snippet] = []
+        for snippet in self:
+            locations = tuple(location for location in snippet.locations if location.filename not in filenames)
+            if locations:
+                snippets.append(attr.evolve(snippet, locations=locations))
+        return ProgramSnippets(snippets)
+
+    def with_relative_locations(self, base: str) -> ProgramSnippets:
+        return ProgramSnippets(snippet.with_relative_locations(base) for snippet in self)
+
+    def __iter__(self) -> Iterator[Snippet]:
+        yield from self.__content_to_snippet.values()
+
+    def __len__(self) -> int:
+        return len(self.__content_to_snippet)
+
+    def __contains__(self, content: object) -> bool:
+        return content in self.__content_to_snippet
+
+    def __getitem__(self, content: str) -> Snippet:
+        """Retrieves the snippet with the given content.
+
+        Raises
+        ------
+        KeyError
+            If there is no snippet with the given content.
+        """
+        return self.__content_to_snippet[content]
+
+    def in_file(self, filename: str) -> Iterator[Snippet]:
+        """Returns an iterator over all snippets that occur within a given file."""
+        for snippet in self:
+            if any(location.filename == filename for location in snippet.locations):
+                yield snippet
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "snippets": [snippet.to_dict() for snippet in self],
+        }
@@ -0,0 +1,58 @@
+"""Provides shared source buffers that statements may refer to by offset."""
+from __future__ import annotations
+
+__all__ = ("SourceSpan",)
+
+import attr
+
+
+@attr.s(frozen=True, slots=True, eq=False, repr=False, auto_attribs=True)
+class SourceSpan:
+    """Refers to a contiguous range of a source buffer that is shared by a file.
+
+    Rather than each statement holding its own copy of its source text, which
+    duplicates the text of nested statements many times over, statements may
+    instead hold a span over the contents of their file. The text of a span is
+    only materialised when it is requested.
+
+    Attributes
+    ----------
+    buffer: str | bytes
+        The shared contents of the file. Offsets into a :class:`str` are given
+        in characters, whereas offsets into :class:`bytes` are given in bytes
+        and the resulting text is decoded as UTF-8.
+    start: int
+        The offset at which the span begins.
+    stop: int
+        The offset immediately after the end of the span.
+    """
+    buffer: str | bytes
+    start: int
+    stop: int
+
+    @property
+    def text(self) -> str:
+        """Materialises the source text for this span."""
+        if isinstance(self.buffer, str):
+            return self.buffer[self.start:self.stop]
+        view = memoryview(self.buffer)[self.start:self.stop]
+        return str(view, "utf-8", "replace")
+
+    def __str__(self) -> str:
+        return self.text
+
+    def __repr__(self) -> str:
+        return f"SourceSpan(start={self.start}, stop={self.stop})"
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SourceSpan):
+            return NotImplemented
+        if self.buffer is other.buffer:
+            return self.start == other.start and self.stop == other.stop
+        return self.text == other.text
+
+    def __hash__(self) -> int:
+        return hash(self.text)
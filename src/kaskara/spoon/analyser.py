@@ -14,24 +14,40 @@ from overrides import overrides
 
 from kaskara.analyser import Analyser
 from kaskara.analysis import Analysis
-from kaskara.container import ProjectContainer
-from kaskara.core import FileLocationRange
+from kaskara.compact import decode_compact, require_msgpack
+from kaskara.container import LocalProjectContainer, ProjectContainer
+from kaskara.exceptions import KaskaraException
 from kaskara.functions import ProgramFunctions
 from kaskara.loops import ProgramLoops
-from kaskara.project import Project
+from kaskara.project import LocalProject, Project
 from kaskara.spoon.analysis import SpoonFunction, SpoonStatement
 from kaskara.spoon.common import (
     JAR_PATH,
     JAVA_PATH,
+    NATIVE_BINARY_PATH,
 )
+from kaskara.spoon.server import SpoonServer
 from kaskara.statements import ProgramStatements
+from kaskara.util import as_flocrange
+
+if t.TYPE_CHECKING:
+    from kaskara.core import FileLocationRange
 
 
 @dataclass
 class SpoonAnalyser(Analyser):
-    _project: Project
-    _container: ProjectContainer
+    _project: Project | LocalProject
+    _container: ProjectContainer | LocalProjectContainer
     _workdir: str | None = field(default=None)
+    _compact: bool = field(default=False)
+    _server: SpoonServer | None = field(default=None)
+    _native: bool | None = field(default=None)
+    _argument_files: dict[tuple[str, ...], str] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self._compact:
+            # fail before the backend is run, rather than once its results are read
+            require_msgpack()
 
     @classmethod
     @contextlib.contextmanager
@@ -41,13 +57,79 @@ class SpoonAnalyser(Analyser):
         project: Project,
         *,
         mount_binaries: bool = True,
+        compact: bool = False,
+        server: bool = False,
+        native: bool | None = None,
     ) -> t.Iterator[t.Self]:
-        with project.provision(mount_kaskara_spoon=mount_binaries) as container:
-            yield cls(project, container)
+        """Creates an analyser for a given project.
+
+        Parameters
+        ----------
+        project: Project
+            The project that should be analysed.
+        mount_binaries: bool
+            Whether the kaskara-spoon binaries should be mounted into the container.
+        compact: bool
+            Whether kaskara-spoon should write its results in the compact
+            binary format described in :mod:`kaskara.compact` rather than as
+            JSON. Reading that format requires the msgpack package.
+        server: bool
+            Whether kaskara-spoon should be kept running as a server for the
+            lifetime of the analyser, rather than being started for each
+            run. This avoids paying for the startup of the JVM, and for
+            building the model of the project, on every run: the model is
+            only rebuilt once the sources of the project have changed.
+        native: bool, optional
+            Whether the native image of kaskara-spoon (see
+            :code:`post_install(native=True)`) should be used rather than its
+            JAR. By default, the native image is used if it is installed.
+
+        Raises
+        ------
+        KaskaraException
+            If the compact format is requested but the msgpack package (i.e.,
+            the :code:`compact` extra) is not installed.
+        """
+        if compact:
+            require_msgpack()
+        with contextlib.ExitStack() as stack:
+            container = stack.enter_context(project.provision(mount_kaskara_spoon=mount_binaries))
+            analyser = cls(project, container, _compact=compact, _native=native)
+            if server:
+                analyser._server = stack.enter_context(
+                    SpoonServer.launch(container, command=analyser._backend_command()),
+                )
+            yield analyser
+
+    @classmethod
+    def load_results(
+        cls,
+        project: Project | LocalProject,
+        directory: str,
+    ) -> Analysis:
+        """Loads the results of a previous run of kaskara-spoon from the host.
+
+        This allows the results of kaskara-spoon to be loaded without
+        launching a container.
+
+        Parameters
+        ----------
+        project: Project | LocalProject
+            The project to which the results belong.
+        directory: str
+            The directory on the host that holds the statements, functions,
+            and loops files produced by kaskara-spoon, either as JSON or in
+            the compact binary format.
+        """
+        analyser = cls(project, LocalProjectContainer(project))
+        return analyser._load_results(directory)
 
     @overrides
     def run(self) -> Analysis:
         container = self._container
+        if not isinstance(container, ProjectContainer):
+            error_message = "kaskara-spoon can only be executed within a container"
+            raise KaskaraException(error_message)
         dir_source = Path(self._project.directory)
         assert dir_source.is_absolute()
 
@@ -65,15 +147,21 @@ class SpoonAnalyser(Analyser):
         else:
             paths_to_index = [dir_source]
 
+        if self._server:
+            self._server.analyze(
+                (str(path) for path in paths_to_index),
+                container_output_dir,
+                compact=self._compact,
+            )
+            return self._load_results(container_output_dir)
+
         workdir = self._workdir or "/"
-        paths_to_index_arg = " ".join(str(path) for path in paths_to_index)
         command_args = [
-            JAVA_PATH,
-            "-jar",
-            JAR_PATH,
-            paths_to_index_arg,
+            *self._backend_command(),
+            self._paths_argument(container, paths_to_index),
             "-o",
             container_output_dir,
+            *(["--compact"] if self._compact else []),
             "2>&1",
         ]
         command = " ".join(command_args)
@@ -86,28 +174,67 @@ class SpoonAnalyser(Analyser):
             )
             logger.debug(f"kaskara-spoon output: {output}")
         except dockerblade.exceptions.CalledProcessError as err:
-            logger.error(f"kaskara-spoon failed:\n{err.output}")
+            err_message = err.output
+            assert isinstance(err_message, str)
+            logger.error(f"kaskara-spoon failed:\n{err_message}")
             raise
 
+        return self._load_results(container_output_dir)
+
+    def _paths_argument(self, container: ProjectContainer, paths: Sequence[Path]) -> str:
+        """Returns the argument that passes the given paths to kaskara-spoon.
+
+        The paths are written to an argument file within the container, rather
+        than being passed on the command line, so that neither the number of
+        paths nor any whitespace within them is a problem. Each distinct list
+        of paths is written only once, and is then shared by every run.
+        """
+        key = tuple(str(path) for path in paths)
+        filename = self._argument_files.get(key)
+        if filename is None:
+            filename = container.write_argument_file(key)
+            self._argument_files[key] = filename
+        return f"@{filename}"
+
+    def _backend_command(self) -> list[str]:
+        """Returns the command that launches kaskara-spoon, preferring its native image if it is installed.
+
+        Raises
+        ------
+        KaskaraException
+            If the native image is required but is not installed.
+        """
+        native = self._native
+        if native is None:
+            native = self._container.files.exists(NATIVE_BINARY_PATH)
+        elif native and not self._container.files.exists(NATIVE_BINARY_PATH):
+            message = f"native image of kaskara-spoon is not installed: {NATIVE_BINARY_PATH}"
+            raise KaskaraException(message)
+        if native:
+            logger.debug("using native image of kaskara-spoon")
+            return [NATIVE_BINARY_PATH]
+        return [JAVA_PATH, "-jar", JAR_PATH]
+
+    def _load_results(self, output_dir: str) -> Analysis:
+        """Loads the results that were written by kaskara-spoon to a given directory."""
+        container = self._container
+
         # load statements
-        filename_statements = os.path.join(container_output_dir, "statements.json")
-        statements_dict = json.loads(container.files.read(filename_statements))
+        statements_dict = self._read_database(output_dir, "statements")
         statements = self._load_statements_from_dict(
             container,
             statements_dict,
         )
 
         # load functions
-        filename_functions = os.path.join(container_output_dir, "functions.json")
-        functions_dict = json.loads(container.files.read(filename_functions))
+        functions_dict = self._read_database(output_dir, "functions")
         functions = self._load_functions_from_dict(
             container,
             functions_dict,
         )
 
         # load loops
-        filename_loops = os.path.join(container_output_dir, "loops.json")
-        loops_dict = json.loads(container.files.read(filename_loops))
+        loops_dict = self._read_database(output_dir, "loops")
         loops = self._load_loops_from_dict(
             container,
             loops_dict,
@@ -124,9 +251,21 @@ class SpoonAnalyser(Analyser):
             insertions=insertions,
         )
 
+    def _read_database(self, output_dir: str, name: str) -> Sequence[Mapping[str, t.Any]]:
+        """Reads a database that was written by kaskara-spoon either in the compact format or as JSON."""
+        container = self._container
+        filename = os.path.join(output_dir, f"{name}.msgpack")
+        if container.files.exists(filename):
+            data = container.files.read(filename, binary=True)
+            assert isinstance(data, bytes)
+            return list(decode_compact(data))
+        filename = os.path.join(output_dir, f"{name}.json")
+        database: Sequence[Mapping[str, t.Any]] = json.loads(container.files.read(filename))
+        return database
+
     def _load_statements_from_dict(
         self,
-        container: ProjectContainer,
+        container: ProjectContainer | LocalProjectContainer,
         dict_: Sequence[Mapping[str, t.Any]],
     ) -> ProgramStatements:
         """Loads the statement database from a given dictionary."""
@@ -140,7 +279,7 @@ class SpoonAnalyser(Analyser):
 
     def _load_functions_from_dict(
         self,
-        container: ProjectContainer,
+        container: ProjectContainer | LocalProjectContainer,
         dict_: Sequence[Mapping[str, t.Any]],
     ) -> ProgramFunctions:
         """Loads the function database from a given dictionary."""
@@ -154,14 +293,14 @@ class SpoonAnalyser(Analyser):
 
     def _load_loops_from_dict(
         self,
-        container: ProjectContainer,
+        container: ProjectContainer | LocalProjectContainer,
         dict_: Sequence[Mapping[str, t.Any]],
     ) -> ProgramLoops:
         """Loads the loops database from a given dictionary."""
         logger.debug("parsing loop database")
         loop_bodies: list[FileLocationRange] = []
         for loop_info in dict_:
-            loc = FileLocationRange.from_string(loop_info["body"])
+            loc = as_flocrange(loop_info["body"])
             loop_bodies.append(loc)
         loops = ProgramLoops.from_body_location_ranges(
             container.project.directory,
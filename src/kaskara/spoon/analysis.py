@@ -7,13 +7,15 @@ import typing as t
 import attr
 from overrides import overrides
 
-from kaskara.core import FileLocationRange
 from kaskara.functions import Function
 from kaskara.statements import Statement
+from kaskara.util import as_flocrange
 
 if t.TYPE_CHECKING:
     from collections.abc import Mapping
 
+    from kaskara.core import FileLocationRange
+
 
 @attr.s(frozen=True, slots=True, auto_attribs=True)
 class SpoonFunction(Function):
@@ -42,8 +44,8 @@ class SpoonFunction(Function):
     @classmethod
     def from_dict(cls, dict_: Mapping[str, t.Any]) -> t.Self:
         name: str = dict_["name"]
-        location = FileLocationRange.from_string(dict_["location"])
-        body_location = FileLocationRange.from_string(dict_["body"])
+        location = as_flocrange(dict_["location"])
+        body_location = as_flocrange(dict_["body"])
         return_type = dict_["return-type"]
         return cls(
             name=name,
@@ -80,7 +82,7 @@ class SpoonStatement(Statement):
         kind: str = dict_["kind"]
         content: str = dict_["source"]
         canonical: str = dict_["canonical"]
-        location = FileLocationRange.from_string(dict_["location"])
+        location = as_flocrange(dict_["location"])
         return cls(
             kind=kind,
             content=content,
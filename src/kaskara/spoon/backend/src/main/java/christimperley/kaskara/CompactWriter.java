@@ -0,0 +1,151 @@
+package christimperley.kaskara;
+
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.databind.node.ArrayNode;
+import com.fasterxml.jackson.databind.node.ObjectNode;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+import java.util.regex.Matcher;
+import java.util.regex.Pattern;
+import org.msgpack.jackson.dataformat.MessagePackFactory;
+
+/**
+ * Writes a list of results in the compact binary format that is decoded by kaskara.compact.
+ *
+ * <p>Rather than writing each location as a string, locations are written as arrays of the
+ * form [file, start line, start column, end line, end column], where file is an index into a
+ * table of filenames. Kinds and the names within sets of symbols are written as indices into a
+ * table of symbols. All other fields are written as they would be written to JSON.
+ */
+public final class CompactWriter {
+    private static final int VERSION = 1;
+    private static final Set<String> LOCATION_FIELDS = Set.of("location", "body");
+    private static final Set<String> SYMBOL_SET_FIELDS = Set.of(
+            "reads", "writes", "visible", "decls", "live_before", "live_after", "requires_syntax");
+    private static final Pattern LOCATION_PATTERN =
+            Pattern.compile("^(.*)@(\\d+):(\\d+)(?:::(\\d+):(\\d+))?$");
+
+    private final ObjectMapper mapper;
+    private final ObjectMapper compactMapper;
+    private final ArrayNode entries;
+    private final List<String> files = new ArrayList<>();
+    private final Map<String, Integer> fileIds = new HashMap<>();
+    private final List<String> symbols = new ArrayList<>();
+    private final Map<String, Integer> symbolIds = new HashMap<>();
+
+    /**
+     * Constructs a writer.
+     * @param mapper  The mapper that is used to convert results to their JSON form.
+     */
+    public CompactWriter(ObjectMapper mapper) {
+        this.mapper = mapper;
+        this.compactMapper = new ObjectMapper(new MessagePackFactory());
+        this.entries = this.compactMapper.createArrayNode();
+    }
+
+    /**
+     * Writes a list of results to a given stream in the compact format.
+     * @param values  The results that should be written.
+     * @param output  The stream to which the results should be written.
+     * @throws IOException  If an error occurs during the write.
+     */
+    public void write(List<?> values, OutputStream output) throws IOException {
+        for (var value : values) {
+            this.add(value);
+        }
+        this.finish(output);
+    }
+
+    /**
+     * Adds a result to those that will be written, reducing it to its compact form.
+     * @param value  The result that should be added.
+     */
+    public void add(Object value) {
+        JsonNode entry = this.mapper.valueToTree(value);
+        this.entries.add(this.compact(entry));
+    }
+
+    /**
+     * Writes all of the results that have been added to a given stream in the compact format.
+     * @param output  The stream to which the results should be written.
+     * @throws IOException  If an error occurs during the write.
+     */
+    public void finish(OutputStream output) throws IOException {
+        ObjectNode database = this.compactMapper.createObjectNode();
+        database.put("format", "kaskara-compact");
+        database.put("version", VERSION);
+        database.set("files", this.toArray(this.files));
+        database.set("symbols", this.toArray(this.symbols));
+        database.set("entries", this.entries);
+        this.compactMapper.writeValue(output, database);
+    }
+
+    private ArrayNode toArray(List<String> strings) {
+        ArrayNode array = this.compactMapper.createArrayNode();
+        strings.forEach(array::add);
+        return array;
+    }
+
+    private JsonNode compact(JsonNode entry) {
+        if (!entry.isObject()) {
+            return entry;
+        }
+        ObjectNode compact = this.compactMapper.createObjectNode();
+        var fields = entry.fields();
+        while (fields.hasNext()) {
+            var field = fields.next();
+            String key = field.getKey();
+            JsonNode value = field.getValue();
+            if (LOCATION_FIELDS.contains(key)) {
+                compact.set(key, this.compactLocation(value));
+            } else if (key.equals("kind") && value.isTextual()) {
+                compact.put(key, this.symbolId(value.asText()));
+            } else if (SYMBOL_SET_FIELDS.contains(key) && value.isArray()) {
+                ArrayNode ids = compact.putArray(key);
+                value.forEach(symbol -> ids.add(this.symbolId(symbol.asText())));
+            } else {
+                compact.set(key, value);
+            }
+        }
+        return compact;
+    }
+
+    private JsonNode compactLocation(JsonNode location) {
+        if (!location.isTextual()) {
+            return location;
+        }
+        Matcher matcher = LOCATION_PATTERN.matcher(location.asText());
+        if (!matcher.matches()) {
+            return location;
+        }
+        ArrayNode compact = this.compactMapper.createArrayNode();
+        compact.add(this.fileId(matcher.group(1)));
+        compact.add(Integer.parseInt(matcher.group(2)));
+        compact.add(Integer.parseInt(matcher.group(3)));
+        if (matcher.group(4) != null) {
+            compact.add(Integer.parseInt(matcher.group(4)));
+            compact.add(Integer.parseInt(matcher.group(5)));
+        }
+        return compact;
+    }
+
+    private int fileId(String filename) {
+        return this.fileIds.computeIfAbsent(filename, name -> {
+            this.files.add(name);
+            return this.files.size() - 1;
+        });
+    }
+
+    private int symbolId(String symbol) {
+        return this.symbolIds.computeIfAbsent(symbol, name -> {
+            this.symbols.add(name);
+            return this.symbols.size() - 1;
+        });
+    }
+}
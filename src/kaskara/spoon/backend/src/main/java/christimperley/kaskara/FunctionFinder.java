@@ -27,12 +27,7 @@ public class FunctionFinder {
         var elements = this.project.getModel().getElements(new AbstractFilter<CtMethod>() {
             @Override
             public boolean matches(CtMethod element) {
-                // function must have body
-                if (element.getBody() == null) {
-                    return false;
-                }
-                // function must appear in file
-                return element.getPosition().isValidPosition();
+                return FunctionFinder.isIndexable(element);
             }
         });
 
@@ -43,4 +38,18 @@ public class FunctionFinder {
         }
         return functions;
     }
+
+    /**
+     * Determines whether a given method should be indexed.
+     * @param element  The AST element for the method.
+     * @return  True if the method has a body and appears in a file.
+     */
+    public static boolean isIndexable(CtMethod<?> element) {
+        // function must have body
+        if (element.getBody() == null) {
+            return false;
+        }
+        // function must appear in file
+        return element.getPosition().isValidPosition();
+    }
 }
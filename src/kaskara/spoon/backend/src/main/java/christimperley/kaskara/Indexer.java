@@ -0,0 +1,79 @@
+package christimperley.kaskara;
+
+import com.fasterxml.jackson.databind.ObjectMapper;
+import java.io.IOException;
+import java.io.UncheckedIOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.LinkedHashMap;
+import java.util.Map;
+
+/**
+ * Indexes the statements, functions, and loops within a project and writes them to disk.
+ *
+ * <p>All three are found using a single traversal of the model of the project, and each is
+ * written to disk as soon as it is found. The time spent in each phase of the analysis is
+ * written to timings.json in the output directory. In JSON, each result is serialized as soon
+ * as it is found, so the scan and the write are timed as a single "scan+write" phase; in the
+ * compact format, results are only written once the scan is complete, and so the two phases
+ * are timed separately.
+ */
+public class Indexer {
+    private final Path outputDirectory;
+    private final boolean compact;
+    private final ObjectMapper mapper;
+
+    /**
+     * Constructs an indexer.
+     * @param outputDirectory  The directory to which results should be written.
+     * @param compact  Whether results should be written in the compact binary format.
+     */
+    public Indexer(Path outputDirectory, boolean compact) {
+        this.outputDirectory = outputDirectory.normalize().toAbsolutePath();
+        this.compact = compact;
+        this.mapper = new ObjectMapper();
+    }
+
+    /**
+     * Indexes a given project and writes the results to the output directory.
+     * @param project  The project that should be indexed.
+     * @param timer  Records the time spent in each phase of the analysis.
+     * @return  The name of the file to which each kind of result was written.
+     * @throws IOException  If an error occurs during the write to disk.
+     */
+    public Map<String, String> index(Project project, PhaseTimer timer) throws IOException {
+        Files.createDirectories(this.outputDirectory);
+        System.out.printf("Output will be written to: %s%n", this.outputDirectory);
+
+        Map<String, String> filenames = new LinkedHashMap<>();
+        try (var statements = this.open("statements");
+             var functions = this.open("functions");
+             var loops = this.open("loops")) {
+            System.out.println("Finding all statements, functions, and loops in project");
+            timer.start(this.compact ? "scan" : "scan+write");
+            try {
+                new ProjectScanner(statements::accept, functions::accept, loops::accept).scan(project);
+            } catch (UncheckedIOException exc) {
+                throw exc.getCause();
+            }
+            filenames.put("statements", statements.getFilename());
+            filenames.put("functions", functions.getFilename());
+            filenames.put("loops", loops.getFilename());
+            if (this.compact) {
+                timer.start("write");
+            }
+        }
+        timer.stop();
+
+        var timingsFilename = this.outputDirectory.resolve("timings.json");
+        this.mapper.writeValue(timingsFilename.toFile(), timer.getDurations());
+        filenames.put("timings", timingsFilename.toString());
+        filenames.forEach((name, filename) -> System.out.printf("Wrote %s to disk [%s]%n", name, filename));
+        return filenames;
+    }
+
+    private ResultStream open(String name) throws IOException {
+        var extension = this.compact ? "msgpack" : "json";
+        return ResultStream.open(this.outputDirectory.resolve(name + "." + extension), this.mapper, this.compact);
+    }
+}
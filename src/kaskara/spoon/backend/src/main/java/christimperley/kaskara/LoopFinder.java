@@ -27,12 +27,7 @@ public class LoopFinder {
         var elements = this.project.getModel().getElements(new AbstractFilter<CtLoop>() {
             @Override
             public boolean matches(CtLoop element) {
-                // loop must have body
-                if (element.getBody() == null) {
-                    return false;
-                }
-                // loop must appear in file
-                return element.getPosition().isValidPosition();
+                return LoopFinder.isIndexable(element);
             }
         });
 
@@ -42,4 +37,18 @@ public class LoopFinder {
         }
         return loops;
     }
+
+    /**
+     * Determines whether a given loop should be indexed.
+     * @param element  The AST element for the loop.
+     * @return  True if the loop has a body and appears in a file.
+     */
+    public static boolean isIndexable(CtLoop element) {
+        // loop must have body
+        if (element.getBody() == null) {
+            return false;
+        }
+        // loop must appear in file
+        return element.getPosition().isValidPosition();
+    }
 }
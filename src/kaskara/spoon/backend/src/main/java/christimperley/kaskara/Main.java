@@ -1,13 +1,13 @@
 package christimperley.kaskara;
 
-import com.fasterxml.jackson.databind.ObjectMapper;
-import com.fasterxml.jackson.databind.SerializationFeature;
+import java.io.BufferedReader;
+import java.io.FileDescriptor;
 import java.io.FileOutputStream;
 import java.io.IOException;
-import java.nio.file.FileSystems;
-import java.nio.file.Files;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
 import java.nio.file.Path;
-import java.nio.file.Paths;
 import java.util.List;
 import java.util.concurrent.Callable;
 import picocli.CommandLine;
@@ -17,7 +17,8 @@ import picocli.CommandLine;
 public class Main implements Callable<Integer> {
     @CommandLine.Parameters(
         index = "0..*",
-        description = "Paths to the source files or directories that should be indexed."
+        description = "Paths to the source files or directories that should be indexed. "
+            + "These may instead be listed, one per line, within a file that is given as @<file>."
     )
     private List<String> paths;
 
@@ -28,7 +29,17 @@ public class Main implements Callable<Integer> {
     )
     private String outputDirectory;
 
-    private ObjectMapper mapper;
+    @CommandLine.Option(
+        names = "--compact",
+        description = "Write results in a compact binary format (MessagePack) rather than JSON."
+    )
+    private boolean compact;
+
+    @CommandLine.Option(
+        names = "--server",
+        description = "Serve analysis requests, one JSON object per line, from stdin to stdout."
+    )
+    private boolean server;
 
     /**
      * Provides an entrypoint to the Kaskara Java analysis tool.
@@ -40,81 +51,34 @@ public class Main implements Callable<Integer> {
     }
 
     /**
-     * Prepares the output directory by ensuring that it exists.
-     */
-    private void prepareOutputDirectory() throws IOException {
-        this.outputDirectory = FileSystems.getDefault()
-                .getPath(this.outputDirectory)
-                .normalize()
-                .toAbsolutePath()
-                .toString();
-
-        Files.createDirectories(Paths.get(this.outputDirectory));
-        System.out.printf("Output will be written to: %s%n", this.outputDirectory);
-    }
-
-    /**
-     * Finds all statements within the project and writes a summary of those statements
-     * to disk.
-     * @throws IOException  If an error occurs during the write to disk.
-     */
-    private void findStatements(Project project) throws IOException {
-        System.out.println("Finding all statements in project");
-        var filename = Path.of(this.outputDirectory, "statements.json").toString();
-        var statements = StatementFinder.forProject(project).find();
-        try (var fileOutputStream = new FileOutputStream(filename)) {
-            this.mapper.writeValue(fileOutputStream, statements);
-        }
-        System.out.printf("Wrote summary of statements to disk [%s]%n",  filename);
-    }
-
-    /**
-     * Finds all functions within the project and writes a summary of those functions
-     * to disk.
-     * @throws IOException  If an error occurs during the write to disk.
+     * Serves requests from stdin until it is closed.
+     * Since stdout is reserved for responses, all other output is redirected to stderr.
      */
-    private void findFunctions(Project project) throws IOException {
-        System.out.println("Finding all functions in project");
-        var filename = Path.of(this.outputDirectory, "functions.json").toString();
-        var functions = FunctionFinder.forProject(project).find();
-        try (var fileOutputStream = new FileOutputStream(filename)) {
-            this.mapper.writeValue(fileOutputStream, functions);
-        }
-        System.out.printf("Wrote summary of functions to disk [%s]%n",  filename);
-    }
-
-    /**
-     * Finds all loops within the project and writes a summary of those functions to disk.
-     * @throws IOException  If an error occurs during the write to disk.
-     */
-    private void findLoops(Project project) throws IOException {
-        System.out.println("Finding all loops in project");
-        var filename = Path.of(this.outputDirectory, "loops.json").toString();
-        var loops = LoopFinder.forProject(project).find();
-        try (var fileOutputStream = new FileOutputStream(filename)) {
-            this.mapper.writeValue(fileOutputStream, loops);
-        }
-        System.out.printf("Wrote summary of loops to disk [%s]%n",  filename);
+    private Integer serve() throws IOException {
+        var responses = new PrintStream(new FileOutputStream(FileDescriptor.out), false, StandardCharsets.UTF_8);
+        System.setOut(System.err);
+        var requests = new BufferedReader(new InputStreamReader(System.in, StandardCharsets.UTF_8));
+        new Server(requests, responses).serve();
+        return 0;
     }
 
     @Override
     public Integer call() throws IOException {
+        if (this.server) {
+            return this.serve();
+        }
+
+        var timer = new PhaseTimer();
+        var indexer = new Indexer(Path.of(this.outputDirectory), this.compact);
+        timer.start("build");
+        var project = Project.build(this.paths);
         try {
-            this.prepareOutputDirectory();
+            indexer.index(project, timer);
         } catch (java.nio.file.AccessDeniedException exc) {
             System.err.printf("ERROR: insufficient permissions to write to output directory [%s]%n",
                     this.outputDirectory);
             return 1;
         }
-
-        // prepare the JSON output formatter
-        this.mapper = new ObjectMapper();
-        this.mapper.enable(SerializationFeature.INDENT_OUTPUT);
-
-        var project = Project.build(this.paths);
-        this.findStatements(project);
-        this.findFunctions(project);
-        this.findLoops(project);
         return 0;
     }
 }
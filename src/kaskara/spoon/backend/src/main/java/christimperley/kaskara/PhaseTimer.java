@@ -0,0 +1,44 @@
+package christimperley.kaskara;
+
+import java.util.Collections;
+import java.util.LinkedHashMap;
+import java.util.Map;
+
+/**
+ * Measures the time spent in each phase of an analysis.
+ */
+public final class PhaseTimer {
+    private final Map<String, Double> durations = new LinkedHashMap<>();
+    private String phase;
+    private long startedAt;
+
+    /**
+     * Starts timing a given phase, and stops timing the current phase, if any.
+     * @param phase  The name of the phase.
+     */
+    public void start(String phase) {
+        this.stop();
+        this.phase = phase;
+        this.startedAt = System.nanoTime();
+    }
+
+    /**
+     * Stops timing the current phase, if any.
+     */
+    public void stop() {
+        if (this.phase == null) {
+            return;
+        }
+        var seconds = (System.nanoTime() - this.startedAt) / 1e9;
+        this.durations.merge(this.phase, seconds, Double::sum);
+        System.out.printf("Finished phase [%s] in %.3f seconds%n", this.phase, seconds);
+        this.phase = null;
+    }
+
+    /**
+     * Returns the number of seconds spent in each phase, in the order in which the phases started.
+     */
+    public Map<String, Double> getDurations() {
+        return Collections.unmodifiableMap(this.durations);
+    }
+}
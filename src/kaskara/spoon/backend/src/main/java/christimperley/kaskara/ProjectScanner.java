@@ -0,0 +1,59 @@
+package christimperley.kaskara;
+
+import java.util.function.Consumer;
+import spoon.reflect.code.CtLoop;
+import spoon.reflect.code.CtStatement;
+import spoon.reflect.declaration.CtElement;
+import spoon.reflect.declaration.CtMethod;
+import spoon.reflect.visitor.CtScanner;
+
+/**
+ * Finds the statements, functions, and loops within a project using a single traversal of its model.
+ *
+ * <p>Each result is passed to its consumer as soon as it is found, rather than being collected,
+ * so that results can be written to disk while the model is traversed. The results are the same
+ * as those of {@link StatementFinder}, {@link FunctionFinder}, and {@link LoopFinder}.
+ */
+public class ProjectScanner extends CtScanner {
+    private final Consumer<Statement> statements;
+    private final Consumer<Function> functions;
+    private final Consumer<Loop> loops;
+
+    /**
+     * Constructs a scanner.
+     * @param statements  Receives each statement that is found.
+     * @param functions  Receives each function that is found.
+     * @param loops  Receives each loop that is found.
+     */
+    public ProjectScanner(Consumer<Statement> statements,
+                          Consumer<Function> functions,
+                          Consumer<Loop> loops) {
+        this.statements = statements;
+        this.functions = functions;
+        this.loops = loops;
+    }
+
+    /**
+     * Scans the entire model of a given project.
+     * @param project  The project that should be scanned.
+     */
+    public void scan(Project project) {
+        for (var module : project.getModel().getAllModules()) {
+            this.scan(module);
+        }
+    }
+
+    @Override
+    public void scan(CtElement element) {
+        if (element instanceof CtStatement statement && StatementFinder.isIndexable(statement)) {
+            this.statements.accept(Statement.forSpoonStatement(statement));
+        }
+        if (element instanceof CtMethod<?> method && FunctionFinder.isIndexable(method)) {
+            this.functions.accept(Function.forSpoonMethod(method));
+        }
+        if (element instanceof CtLoop loop && LoopFinder.isIndexable(loop)) {
+            this.loops.accept(Loop.forSpoonLoop(loop));
+        }
+        super.scan(element);
+    }
+}
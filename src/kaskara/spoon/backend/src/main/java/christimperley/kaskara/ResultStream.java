@@ -0,0 +1,111 @@
+package christimperley.kaskara;
+
+import com.fasterxml.jackson.core.JsonGenerator;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import java.io.BufferedOutputStream;
+import java.io.Closeable;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.OutputStream;
+import java.io.UncheckedIOException;
+import java.nio.file.Path;
+
+/**
+ * Writes a list of results to a file one result at a time, as each result is found.
+ *
+ * <p>In JSON, each result is serialized as soon as it is written. In the compact binary format,
+ * each result is reduced to its compact form as soon as it is written, but the file itself is
+ * only written once the stream is closed, since its tables of files and symbols come first.
+ */
+public abstract class ResultStream implements Closeable {
+    private final String filename;
+
+    protected ResultStream(String filename) {
+        this.filename = filename;
+    }
+
+    /**
+     * Opens a stream to a given file.
+     * @param filename  The name of the file to which results should be written.
+     * @param mapper  The mapper that is used to convert results to JSON.
+     * @param compact  Whether results should be written in the compact binary format.
+     * @return  The stream.
+     * @throws IOException  If the file cannot be opened.
+     */
+    public static ResultStream open(Path filename, ObjectMapper mapper, boolean compact) throws IOException {
+        var output = new BufferedOutputStream(new FileOutputStream(filename.toFile()));
+        if (compact) {
+            return new CompactStream(filename.toString(), output, new CompactWriter(mapper));
+        }
+        return new JsonStream(filename.toString(), output, mapper);
+    }
+
+    public final String getFilename() {
+        return this.filename;
+    }
+
+    /**
+     * Writes a result to the stream.
+     * @param value  The result that should be written.
+     * @throws IOException  If an error occurs during the write.
+     */
+    public abstract void write(Object value) throws IOException;
+
+    /**
+     * Writes a result to the stream, reporting any error as an unchecked exception.
+     * @param value  The result that should be written.
+     */
+    public final void accept(Object value) {
+        try {
+            this.write(value);
+        } catch (IOException exc) {
+            throw new UncheckedIOException(exc);
+        }
+    }
+
+    private static final class JsonStream extends ResultStream {
+        private final ObjectMapper mapper;
+        private final JsonGenerator generator;
+
+        JsonStream(String filename, OutputStream output, ObjectMapper mapper) throws IOException {
+            super(filename);
+            this.mapper = mapper;
+            this.generator = mapper.getFactory().createGenerator(output);
+            this.generator.writeStartArray();
+        }
+
+        @Override
+        public void write(Object value) throws IOException {
+            this.mapper.writeValue(this.generator, value);
+        }
+
+        @Override
+        public void close() throws IOException {
+            this.generator.writeEndArray();
+            this.generator.close();
+        }
+    }
+
+    private static final class CompactStream extends ResultStream {
+        private final OutputStream output;
+        private final CompactWriter writer;
+
+        CompactStream(String filename, OutputStream output, CompactWriter writer) {
+            super(filename);
+            this.output = output;
+            this.writer = writer;
+        }
+
+        @Override
+        public void write(Object value) {
+            this.writer.add(value);
+        }
+
+        @Override
+        public void close() throws IOException {
+            try (var output = this.output) {
+                this.writer.finish(output);
+            }
+        }
+    }
+}
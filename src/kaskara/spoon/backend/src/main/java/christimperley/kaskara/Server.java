@@ -0,0 +1,157 @@
+package christimperley.kaskara;
+
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.databind.node.ObjectNode;
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.PrintStream;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.stream.Stream;
+
+/**
+ * Serves analysis requests over a pair of streams, keeping the model of the project in memory
+ * between requests.
+ *
+ * <p>Each request and each response is a single line of JSON. A request has the form
+ * {"id": ..., "command": ..., ...}, and its response has the form
+ * {"id": ..., "ok": true, ...} or {"id": ..., "ok": false, "error": ...}.
+ * The following commands are supported:
+ * <ul>
+ *   <li>analyze: indexes the project at the given "paths" and writes the results to the
+ *   given "output" directory, optionally in the "compact" format. The model of the project
+ *   is only rebuilt if the paths differ from those of the previous request, or if any of
+ *   their Java files have been added, removed, or modified since the model was built.
+ *   The response gives the name of each output file ("outputs"), and whether the model
+ *   was rebuilt ("rebuilt"), along with the number of seconds spent in each phase of
+ *   the analysis ("timings").</li>
+ *   <li>invalidate: discards the model, forcing it to be rebuilt by the next request.</li>
+ *   <li>ping: does nothing.</li>
+ *   <li>shutdown: stops the server once the response has been sent.</li>
+ * </ul>
+ */
+public class Server {
+    private final BufferedReader input;
+    private final PrintStream output;
+    private final ObjectMapper mapper = new ObjectMapper();
+    private List<String> paths;
+    private Map<Path, Long> snapshot;
+    private Project project;
+    private boolean running;
+
+    /**
+     * Constructs a server.
+     * @param input  The stream from which requests are read.
+     * @param output  The stream to which responses are written.
+     */
+    public Server(BufferedReader input, PrintStream output) {
+        this.input = input;
+        this.output = output;
+    }
+
+    /**
+     * Serves requests until the input is closed or a shutdown request is received.
+     * @throws IOException  If an error occurs when reading a request.
+     */
+    public void serve() throws IOException {
+        this.running = true;
+        this.respond(this.mapper.createObjectNode().put("ok", true).put("ready", true));
+        String line;
+        while (this.running && (line = this.input.readLine()) != null) {
+            if (line.isBlank()) {
+                continue;
+            }
+            this.respond(this.handle(line));
+        }
+    }
+
+    private void respond(ObjectNode response) throws IOException {
+        this.output.println(this.mapper.writeValueAsString(response));
+        this.output.flush();
+    }
+
+    private ObjectNode handle(String line) {
+        ObjectNode response = this.mapper.createObjectNode();
+        try {
+            JsonNode request = this.mapper.readTree(line);
+            response.set("id", request.get("id"));
+            var command = request.path("command").asText();
+            switch (command) {
+                case "analyze":
+                    this.analyze(request, response);
+                    break;
+                case "invalidate":
+                    this.invalidate();
+                    break;
+                case "ping":
+                    break;
+                case "shutdown":
+                    this.running = false;
+                    break;
+                default:
+                    throw new IllegalArgumentException("unknown command: " + command);
+            }
+            response.put("ok", true);
+        } catch (Exception exc) {
+            // the model may be in an inconsistent state
+            this.invalidate();
+            response.put("ok", false);
+            response.put("error", exc.toString());
+        }
+        return response;
+    }
+
+    private void invalidate() {
+        this.paths = null;
+        this.snapshot = null;
+        this.project = null;
+    }
+
+    private void analyze(JsonNode request, ObjectNode response) throws IOException {
+        List<String> paths = new ArrayList<>();
+        request.path("paths").forEach(path -> paths.add(path.asText()));
+        var outputDirectory = Path.of(request.path("output").asText("."));
+        var compact = request.path("compact").asBoolean(false);
+
+        var timer = new PhaseTimer();
+        var snapshot = takeSnapshot(paths);
+        var rebuild = this.project == null || !paths.equals(this.paths) || !snapshot.equals(this.snapshot);
+        if (rebuild) {
+            System.out.println("Building model of project");
+            this.invalidate();
+            timer.start("build");
+            this.project = Project.build(paths);
+            this.paths = paths;
+            this.snapshot = snapshot;
+        }
+
+        var filenames = new Indexer(outputDirectory, compact).index(this.project, timer);
+        ObjectNode outputs = response.putObject("outputs");
+        filenames.forEach(outputs::put);
+        response.put("rebuilt", rebuild);
+        ObjectNode timings = response.putObject("timings");
+        timer.getDurations().forEach(timings::put);
+    }
+
+    /**
+     * Records the last modification time of each Java file at the given paths.
+     */
+    private static Map<Path, Long> takeSnapshot(List<String> paths) throws IOException {
+        Map<Path, Long> snapshot = new HashMap<>();
+        for (var path : paths) {
+            try (Stream<Path> files = Files.walk(Path.of(path))) {
+                for (var file : (Iterable<Path>) files::iterator) {
+                    if (Files.isRegularFile(file) && file.toString().endsWith(".java")) {
+                        snapshot.put(file, Files.getLastModifiedTime(file).toMillis());
+                    }
+                }
+            }
+        }
+        return snapshot;
+    }
+}
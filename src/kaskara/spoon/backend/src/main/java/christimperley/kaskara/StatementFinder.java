@@ -27,28 +27,7 @@ public class StatementFinder {
         var elements = this.project.getModel().getElements(new AbstractFilter<CtStatement>() {
             @Override
             public boolean matches(CtStatement element) {
-                // must be a top-level statement within a block
-                if (!(element.getParent() instanceof spoon.support.reflect.code.CtBlockImpl)) {
-                    return false;
-                }
-
-                // ignore blocks
-                if (element instanceof spoon.support.reflect.code.CtBlockImpl) {
-                    return false;
-                }
-
-                // ignore comments
-                if (element instanceof spoon.support.reflect.code.CtCommentImpl) {
-                    return false;
-                }
-
-                // ignore class implementations
-                if (element instanceof spoon.support.reflect.declaration.CtClassImpl) {
-                    return false;
-                }
-
-                // statement must appear in file
-                return element.getPosition().isValidPosition();
+                return StatementFinder.isIndexable(element);
             }
         });
 
@@ -59,4 +38,34 @@ public class StatementFinder {
         }
         return statements;
     }
+
+    /**
+     * Determines whether a given statement should be indexed.
+     * @param element  The AST element for the statement.
+     * @return  True if the statement is a top-level statement within a block that appears in a file.
+     */
+    public static boolean isIndexable(CtStatement element) {
+        // must be a top-level statement within a block
+        if (!(element.getParent() instanceof spoon.support.reflect.code.CtBlockImpl)) {
+            return false;
+        }
+
+        // ignore blocks
+        if (element instanceof spoon.support.reflect.code.CtBlockImpl) {
+            return false;
+        }
+
+        // ignore comments
+        if (element instanceof spoon.support.reflect.code.CtCommentImpl) {
+            return false;
+        }
+
+        // ignore class implementations
+        if (element instanceof spoon.support.reflect.declaration.CtClassImpl) {
+            return false;
+        }
+
+        // statement must appear in file
+        return element.getPosition().isValidPosition();
+    }
 }
@@ -1,7 +1,10 @@
 __all__ = (
     "IMAGE_ID_LABEL",
     "IMAGE_NAME",
+    "JAR_PATH",
     "JAVA_PATH",
+    "NATIVE_BINARY_PATH",
+    "NATIVE_IMAGE_NAME",
     "PLUGIN_LABEL",
     "PLUGIN_LABEL_VALUE",
     "VERSION_LABEL",
@@ -13,6 +16,8 @@ IMAGE_ID_LABEL: str = "kaskara.built-from-image-id"
 IMAGE_NAME: str = "christimperley/kaskara:spoon"
 JAR_PATH: str = "/opt/kaskara-spoon/kaskara-spoon.jar"
 JAVA_PATH: str = "java"
+NATIVE_BINARY_PATH: str = "/opt/kaskara-spoon/bin/kaskara-spoon"
+NATIVE_IMAGE_NAME: str = "christimperley/kaskara:spoon-native"
 PLUGIN_LABEL: str = "kaskara.plugin"
 PLUGIN_LABEL_VALUE: str = "spoon"
 VERSION_LABEL: str = "kaskara.version"
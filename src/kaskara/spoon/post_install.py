@@ -10,6 +10,7 @@ from loguru import logger
 from kaskara.spoon.common import (
     IMAGE_ID_LABEL,
     IMAGE_NAME,
+    NATIVE_IMAGE_NAME,
     PLUGIN_LABEL,
     PLUGIN_LABEL_VALUE,
     VERSION_LABEL,
@@ -18,9 +19,22 @@ from kaskara.spoon.common import (
 )
 
 
-def post_install(*, force: bool = False) -> None:
-    """Installs the Spoon plugin backend."""
-    logger.info("installing Spoon plugin backend")
+def post_install(*, force: bool = False, native: bool = False) -> None:
+    """Installs the Spoon plugin backend.
+
+    Parameters
+    ----------
+    force: bool
+        Whether the backend volume should be recreated even if it is up to
+        date.
+    native: bool
+        Whether a GraalVM native image of the backend should be built, and
+        installed alongside its JAR. The native image does not require a
+        JVM within the project container, but takes much longer to build.
+    """
+    image_name = NATIVE_IMAGE_NAME if native else IMAGE_NAME
+    dockerfile = "Dockerfile.native-image" if native else "Dockerfile"
+    logger.info(f"installing Spoon plugin backend{' (native image)' if native else ''}")
     backend_directory = pkg_resources.resource_filename(__name__, "backend")
     kaskara_version = pkg_resources.get_distribution("kaskara").version
     logger.debug(f"backend located at: {backend_directory}")
@@ -31,13 +45,14 @@ def post_install(*, force: bool = False) -> None:
         # does the image already exist?
         image: docker.models.images.Image | None = None
         try:
-            image = docker_client.images.get(IMAGE_NAME)
+            image = docker_client.images.get(image_name)
         except docker.errors.ImageNotFound:
             logger.info("Spoon plugin Docker image doesn't exist")
 
         image, _ = docker_client.images.build(
             path=backend_directory,
-            tag=IMAGE_NAME,
+            dockerfile=dockerfile,
+            tag=image_name,
             labels={
                 PLUGIN_LABEL: PLUGIN_LABEL_VALUE,
                 VERSION_LABEL: kaskara_version,
@@ -0,0 +1,200 @@
+"""Provides a client for a long-lived kaskara-spoon process.
+
+Starting kaskara-spoon from scratch for each analysis pays for the startup
+of the JVM, and for building a model of the project, every time. In server
+mode, kaskara-spoon instead keeps running within the container and serves
+requests, one line of JSON at a time, over its stdin and stdout. The model of
+the project is kept in memory between requests, and is only rebuilt once
+its source files change.
+"""
+from __future__ import annotations
+
+__all__ = ("SpoonServer",)
+
+import contextlib
+import itertools
+import json
+import typing as t
+
+from docker.utils.socket import STDOUT, SocketError, next_frame_header, read_exactly
+from loguru import logger
+
+from kaskara.exceptions import KaskaraException
+from kaskara.spoon.common import JAR_PATH, JAVA_PATH
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
+
+    from kaskara.container import ProjectContainer
+
+
+class SpoonServer:
+    """Sends requests to a kaskara-spoon process that is running in server mode within a container.
+
+    Requests are served one at a time, in the order in which they are sent.
+    Use :meth:`launch` to start a server.
+    """
+    def __init__(self, container: ProjectContainer, socket: t.Any) -> None:  # noqa: ANN401
+        self._container = container
+        self._socket = socket
+        self._buffer = b""
+        self._request_ids = itertools.count()
+
+    @classmethod
+    @contextlib.contextmanager
+    def launch(
+        cls,
+        container: ProjectContainer,
+        *,
+        command: Sequence[str] = (JAVA_PATH, "-jar", JAR_PATH),
+    ) -> Iterator[SpoonServer]:
+        """Launches kaskara-spoon in server mode within a given container.
+
+        The server is shut down upon leaving the context.
+
+        Parameters
+        ----------
+        container: ProjectContainer
+            The container in which the server should run.
+        command: Sequence[str]
+            The command that launches kaskara-spoon (e.g., its native image).
+
+        Raises
+        ------
+        KaskaraException
+            If the server fails to start.
+        """
+        api = container.dockerblade.daemon.api
+        command = [*command, "--server"]
+        logger.info(f"launching kaskara-spoon server: {' '.join(command)}")
+        exec_id = api.exec_create(
+            container.dockerblade.id,
+            command,
+            stdin=True,
+            stdout=True,
+            stderr=False,
+            tty=False,
+        )["Id"]
+        socket = api.exec_start(exec_id, socket=True)
+        server = cls(container, socket)
+        try:
+            server._read_response()
+            logger.debug("kaskara-spoon server is ready")
+            yield server
+        finally:
+            server.shutdown()
+
+    def analyze(
+        self,
+        paths: Iterable[str],
+        output_directory: str,
+        *,
+        compact: bool = False,
+    ) -> Mapping[str, str]:
+        """Indexes the project at the given paths and writes the results to a given directory.
+
+        The model of the project is reused if it is unchanged since the
+        previous request.
+
+        Returns
+        -------
+        Mapping[str, str]
+            The name of the file to which each kind of result (i.e.,
+            :code:`statements`, :code:`functions`, :code:`loops`, and
+            :code:`timings`) was written.
+
+        Raises
+        ------
+        KaskaraException
+            If the request fails.
+        """
+        response = self.request(
+            "analyze",
+            paths=list(paths),
+            output=output_directory,
+            compact=compact,
+        )
+        if response.get("rebuilt"):
+            logger.debug("kaskara-spoon server rebuilt its model of the project")
+        for phase, seconds in response.get("timings", {}).items():
+            logger.debug(f"kaskara-spoon spent {seconds:.3f} seconds in phase: {phase}")
+        outputs: Mapping[str, str] = response["outputs"]
+        return outputs
+
+    def invalidate(self) -> None:
+        """Forces the server to rebuild its model of the project upon the next request."""
+        self.request("invalidate")
+
+    def shutdown(self) -> None:
+        """Stops the server, if it is still running."""
+        if self._socket is None:
+            return
+        with contextlib.suppress(KaskaraException, OSError):
+            self.request("shutdown")
+        with contextlib.suppress(OSError):
+            self._socket.close()
+        self._socket = None
+        logger.debug("shut down kaskara-spoon server")
+
+    def request(self, command: str, **arguments: t.Any) -> Mapping[str, t.Any]:  # noqa: ANN401
+        """Sends a request to the server and waits for its response.
+
+        Raises
+        ------
+        KaskaraException
+            If the server is not running, or if the request fails.
+        """
+        if self._socket is None:
+            message = "kaskara-spoon server is not running"
+            raise KaskaraException(message)
+
+        request_id = next(self._request_ids)
+        request = {"id": request_id, "command": command, **arguments}
+        logger.trace(f"sending request to kaskara-spoon server: {request}")
+        self._write(f"{json.dumps(request)}\n".encode())
+        response = self._read_response()
+        if response.get("id") != request_id:
+            message = f"unexpected response from kaskara-spoon server: {response}"
+            raise KaskaraException(message)
+        return response
+
+    def _write(self, data: bytes) -> None:
+        """Writes the given data to the stdin of the server.
+
+        Depending on the transport used by Docker, the socket is either a
+        socket (or named pipe) or a :class:`socket.SocketIO`, which only
+        provides :code:`write`, and may not write all of the data at once.
+        """
+        if hasattr(self._socket, "sendall"):
+            self._socket.sendall(data)
+            return
+        view = memoryview(data)
+        while view:
+            written = self._socket.write(view)
+            view = view[written:]
+
+    def _read_response(self) -> Mapping[str, t.Any]:
+        line = self._read_line()
+        response: Mapping[str, t.Any] = json.loads(line)
+        if not response.get("ok"):
+            message = f"kaskara-spoon server failed to handle request: {response.get('error')}"
+            raise KaskaraException(message)
+        return response
+
+    def _read_line(self) -> bytes:
+        """Reads the next line written by the server to its stdout."""
+        while b"\n" not in self._buffer:
+            # since no TTY is allocated, docker multiplexes the output into frames
+            stream, size = next_frame_header(self._socket)
+            if size < 0:
+                message = "kaskara-spoon server terminated unexpectedly"
+                raise KaskaraException(message)
+            try:
+                data = read_exactly(self._socket, size)
+            except SocketError as err:
+                message = "kaskara-spoon server terminated unexpectedly"
+                raise KaskaraException(message) from err
+            if stream == STDOUT:
+                self._buffer += data
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return line
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-__all__ = ("Statement", "ProgramStatements")
+__all__ = ("FileStatementsView", "ProgramStatements", "Statement")
 
 import abc
 import itertools
@@ -12,9 +12,10 @@ from loguru import logger
 
 from .core import FileLine, FileLocation, FileLocationRange
 from .insertions import InsertionPoint, ProgramInsertionPoints
+from .intervals import IntervalIndex
 
 if t.TYPE_CHECKING:
-    from collections.abc import Iterable, Iterator
+    from collections.abc import Collection, Iterable, Iterator
 
 
 class Statement(abc.ABC):
@@ -69,14 +70,45 @@ class Statement(abc.ABC):
         raise NotImplementedError
 
 
+@dataclass(frozen=True, slots=True)
+class _FileStatementIndex:
+    """Indexes the statements within a single file by their start line and by their location."""
+    by_line: t.Mapping[int, t.Sequence[Statement]]
+    by_location: IntervalIndex[Statement]
+
+    @classmethod
+    def build(cls, statements: Iterable[Statement]) -> _FileStatementIndex:
+        statements = list(statements)
+        by_line: dict[int, list[Statement]] = {}
+        for statement in statements:
+            by_line.setdefault(statement.location.start.line, []).append(statement)
+        return cls(
+            by_line=by_line,
+            by_location=IntervalIndex.build(statements, _statement_location),
+        )
+
+
 @dataclass
 class ProgramStatements(t.Iterable[Statement]):
+    """Represents the set of statements within an associated program.
+
+    The statements within a file are indexed by their start line and by their
+    location upon the first lookup within that file, so that the statements
+    at a given line, or within a given range, can be found in logarithmic
+    time.
+    """
     _project_directory: str
     _statements: t.Sequence[Statement]
     _file_to_statements: t.Mapping[
         str,
         t.Sequence[Statement],
     ] = field(init=False)
+    _file_to_index: dict[str, _FileStatementIndex] = field(
+        default_factory=dict,
+        init=False,
+        repr=False,
+        compare=False,
+    )
 
     def __post_init__(self) -> None:
         file_to_statements: t.MutableMapping[
@@ -92,11 +124,14 @@ class ProgramStatements(t.Iterable[Statement]):
 
         self._file_to_statements = file_to_statements
 
-        summary = "\n".join(
-            f"  {fn}: {len(stmts)} statements" for (fn, stmts)
-            in self._file_to_statements.items()
+        # the summary is only formatted if debug messages are logged
+        logger.opt(lazy=True).debug(
+            "indexed statements by file:\n{summary}",
+            summary=lambda: "\n".join(
+                f"  {fn}: {len(stmts)} statements" for (fn, stmts)
+                in self._file_to_statements.items()
+            ),
         )
-        logger.debug(f"indexed statements by file:\n{summary}")
 
     def merge(self, other: ProgramStatements) -> ProgramStatements:
         return self.build(
@@ -104,6 +139,13 @@ class ProgramStatements(t.Iterable[Statement]):
             statements=itertools.chain(self, other),
         )
 
+    def without_files(self, filenames: Collection[str]) -> ProgramStatements:
+        """Creates a new instance without the statements in any of the given files."""
+        return self.build(
+            project_directory=self._project_directory,
+            statements=(stmt for stmt in self if stmt.location.filename not in filenames),
+        )
+
     def with_relative_locations(self, base: str) -> ProgramStatements:
         """Creates a new instance with relative file locations."""
         return self.build(
@@ -131,23 +173,46 @@ class ProgramStatements(t.Iterable[Statement]):
     def __iter__(self) -> Iterator[Statement]:
         yield from self._statements
 
-    def in_file(self, filename: str) -> ProgramStatements:
-        """Returns the statements belonging to a file."""
-        if os.path.isabs(filename):
-            start = self._project_directory
-            filename = os.path.relpath(filename, start=start)
-
-        return self.build(
-            project_directory=self._project_directory,
-            statements=self._file_to_statements.get(filename, []),
-        )
+    def in_file(self, filename: str) -> FileStatementsView:
+        """Returns a read-only view of the statements belonging to a file."""
+        filename = self._to_filename(filename)
+        return FileStatementsView(self, filename, self._file_to_statements.get(filename, ()))
 
     def at_line(self, line: FileLine) -> Iterator[Statement]:
-        """Returns an iterator over the statements located at a given line."""
-        num = line.num
-        for stmt in self.in_file(line.filename):
-            if stmt.location.start.line == num:
-                yield stmt
+        """Returns an iterator over the statements that start at a given line."""
+        index = self._index(line.filename)
+        if index is not None:
+            yield from index.by_line.get(line.num, ())
+
+    def containing(self, location: FileLocation) -> Iterator[Statement]:
+        """Returns an iterator over the statements that contain a given location, innermost first."""
+        index = self._index(location.filename)
+        if index is not None:
+            yield from index.by_location.containing(location.location)
+
+    def overlapping(self, location_range: FileLocationRange) -> Iterator[Statement]:
+        """Returns an iterator over the statements that overlap a given range, in order of their start."""
+        index = self._index(location_range.filename)
+        if index is not None:
+            yield from index.by_location.overlapping(location_range.start, location_range.stop)
+
+    def _index(self, filename: str) -> _FileStatementIndex | None:
+        """Returns the index of the statements within a given file, building it if necessary."""
+        filename = self._to_filename(filename)
+        index = self._file_to_index.get(filename)
+        if index is None:
+            statements = self._file_to_statements.get(filename)
+            if statements is None:
+                return None
+            index = _FileStatementIndex.build(statements)
+            self._file_to_index[filename] = index
+        return index
+
+    def _to_filename(self, filename: str) -> str:
+        """Returns the name under which the statements in a given file are stored."""
+        if filename in self._file_to_statements or not os.path.isabs(filename):
+            return filename
+        return os.path.relpath(filename, start=self._project_directory)
 
     def insertions(self) -> ProgramInsertionPoints:
         logger.debug("computing insertion points")
@@ -163,3 +228,60 @@ class ProgramStatements(t.Iterable[Statement]):
         db = ProgramInsertionPoints(points)
         logger.debug("computed insertion points")
         return db
+
+
+@dataclass(frozen=True, slots=True)
+class FileStatementsView(t.Iterable[Statement]):
+    """A read-only view of the statements within a single file of a :class:`ProgramStatements`.
+
+    The view refers to the statements held by its parent rather than copying
+    them, and its lookups use the index that the parent keeps for the file.
+    """
+    _parent: ProgramStatements
+    _filename: str
+    _statements: t.Sequence[Statement]
+
+    @property
+    def filename(self) -> str:
+        """The name of the file, relative to the project directory."""
+        return self._filename
+
+    def __len__(self) -> int:
+        """Returns the number of statements in this file."""
+        return len(self._statements)
+
+    def __iter__(self) -> Iterator[Statement]:
+        yield from self._statements
+
+    def to_dict(self) -> dict[str, t.Any]:
+        return {
+            "statements": [stmt.to_dict() for stmt in self],
+        }
+
+    def in_file(self, filename: str) -> FileStatementsView:
+        """Returns a read-only view of the statements belonging to a file."""
+        if self._includes(filename):
+            return self
+        return FileStatementsView(self._parent, filename, ())
+
+    def at_line(self, line: FileLine) -> Iterator[Statement]:
+        """Returns an iterator over the statements that start at a given line."""
+        if self._includes(line.filename):
+            yield from self._parent.at_line(line)
+
+    def containing(self, location: FileLocation) -> Iterator[Statement]:
+        """Returns an iterator over the statements that contain a given location, innermost first."""
+        if self._includes(location.filename):
+            yield from self._parent.containing(location)
+
+    def overlapping(self, location_range: FileLocationRange) -> Iterator[Statement]:
+        """Returns an iterator over the statements that overlap a given range, in order of their start."""
+        if self._includes(location_range.filename):
+            yield from self._parent.overlapping(location_range)
+
+    def _includes(self, filename: str) -> bool:
+        return self._parent._to_filename(filename) == self._filename
+
+
+def _statement_location(statement: Statement) -> FileLocationRange:
+    return statement.location
@@ -0,0 +1,42 @@
+"""Provides a flyweight table for the symbol names that are reported by the backends."""
+from __future__ import annotations
+
+__all__ = ("SymbolTable",)
+
+import typing as t
+
+if t.TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class SymbolTable:
+    """Interns symbol names and the sets of names that refer to them.
+
+    The same names, and often the very same sets of names (e.g., the
+    variables that are visible within a given scope), are reported for a
+    great many statements. Rather than holding a separate copy of each, the
+    results that are loaded using a single table share one object for each
+    distinct name and for each distinct set of names.
+    """
+    __slots__ = ("_name_sets", "_names")
+
+    def __init__(self) -> None:
+        self._names: dict[str, str] = {}
+        self._name_sets: dict[frozenset[str], frozenset[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def name(self, name: str) -> str:
+        """Returns the shared copy of a given name."""
+        return self._names.setdefault(name, name)
+
+    def names(self, names: Iterable[str]) -> frozenset[str]:
+        """Returns the shared set that holds exactly the given names."""
+        if isinstance(names, frozenset):
+            shared = self._name_sets.get(names)
+            if shared is not None:
+                return shared
+        intern = self.name
+        name_set = frozenset([intern(name) for name in names])
+        return self._name_sets.setdefault(name_set, name_set)
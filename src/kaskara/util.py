@@ -2,6 +2,8 @@ __all__ = (
     "abs_to_rel_filename",
     "abs_to_rel_floc",
     "abs_to_rel_flocrange",
+    "as_floc",
+    "as_flocrange",
     "dockerblade_from_env",
     "rel_to_abs_floc",
 )
@@ -13,6 +15,20 @@ import dockerblade
 from kaskara.core import FileLocation, FileLocationRange
 
 
+def as_floc(location: str | FileLocation) -> FileLocation:
+    """Parses a file location, unless it has already been decoded."""
+    if isinstance(location, FileLocation):
+        return location
+    return FileLocation.from_string(location)
+
+
+def as_flocrange(location: str | FileLocationRange) -> FileLocationRange:
+    """Parses a file location range, unless it has already been decoded."""
+    if isinstance(location, FileLocationRange):
+        return location
+    return FileLocationRange.from_string(location)
+
+
 def dockerblade_from_env() -> dockerblade.DockerDaemon:
     docker_url: str | None = os.environ.get("DOCKER_HOST")
     return dockerblade.DockerDaemon(docker_url)
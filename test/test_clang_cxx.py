@@ -1,13 +1,21 @@
+import json
 import os
+import sys
 
+import attr
 import docker as _docker
 import dockerblade as _dockerblade
 import pytest
 
 import kaskara
 from kaskara.clang.analyser import ClangAnalyser
+from kaskara.clang.analysis import ClangFunction, ClangStatement, StatementFacts
+from kaskara.clang.incremental import IncrementalIndex
 from kaskara.clang.post_install import post_install as install_clang_backend
-from kaskara.core import FileLocation
+from kaskara.container import LocalProjectContainer
+from kaskara.core import FileLine, FileLocation, FileLocationRange
+from kaskara.functions import ProgramFunctions
+from kaskara.symbols import SymbolTable
 
 DIR_HERE = os.path.dirname(__file__)
 
@@ -77,3 +85,436 @@ def test_find_statements(bt_clang) -> None:
 
     statements_in_file = list(statements.in_file("/workspace/src/blackboard.cpp"))
     assert len(statements_in_file) > 0
+    assert all(statement.content for statement in statements_in_file)
+
+
+def test_index_all(bt_clang) -> None:
+    analyzer = bt_clang
+    analysis = analyzer._index_all()
+
+    assert list(analysis.functions) == list(analyzer._find_functions())
+    assert list(analysis.statements) == list(analyzer._find_statements())
+    assert set(analysis.loops._covered_by_loop_bodies) == set(analyzer._find_loops()._covered_by_loop_bodies)
+    assert list(analysis.insertions) == list(analyzer._find_insertions())
+
+    assert analysis.snippets is not None
+    expected_snippets = analyzer._find_snippets()
+    assert {snippet.content: snippet.locations for snippet in analysis.snippets} == {
+        snippet.content: snippet.locations for snippet in expected_snippets
+    }
+
+
+def test_index_all_with_jobs(bt_project) -> None:
+    project = attr.evolve(
+        bt_project,
+        files=frozenset({
+            "/workspace/src/basic_types.cpp",
+            "/workspace/src/blackboard.cpp",
+            "/workspace/src/tree_node.cpp",
+        }),
+    )
+    with ClangAnalyser.for_project(project) as analyzer:
+        expected = analyzer.run().to_dict()
+    with ClangAnalyser.for_project(project, jobs=3) as analyzer:
+        actual = analyzer.run().to_dict()
+
+    assert actual["functions"] == expected["functions"]
+    assert actual["statements"] == expected["statements"]
+
+
+def test_index_all_with_ast_cache(bt_project) -> None:
+    volume_name = "kaskara-test-ast-cache"
+    docker = _docker.from_env()
+    try:
+        with ClangAnalyser.for_project(bt_project) as analyzer:
+            expected = analyzer.run().to_dict()
+
+        # the first run populates the cache, and the second reuses it
+        for _ in range(2):
+            with ClangAnalyser.for_project(bt_project, ast_cache_volume=volume_name) as analyzer:
+                actual = analyzer.run().to_dict()
+            assert actual["functions"] == expected["functions"]
+            assert actual["statements"] == expected["statements"]
+    finally:
+        docker.volumes.get(volume_name).remove(force=True)
+
+
+def test_load_ndjson_results(tmp_path) -> None:
+    source = "int main() {\n  int x = 0;\n  while (x < 10) {\n    x++;\n  }\n  return x;\n}\n"
+    (tmp_path / "main.cpp").write_text(source)
+    filename = str(tmp_path / "main.cpp")
+    project = kaskara.LocalProject(directory=str(tmp_path), files={"main.cpp"})
+
+    loops = [{"kind": "while", "location": f"{filename}@3:3::5:3", "body": f"{filename}@3:18::5:3"}]
+    functions = [{
+        "name": "main",
+        "location": f"{filename}@1:1::7:1",
+        "body": f"{filename}@1:12::7:1",
+        "return-type": "int",
+        "global": True,
+        "pure": False,
+    }]
+    statements = [
+        {
+            "location": f"{filename}@{line}:3::{line}:{column}",
+            "offsets": [source.index(content), source.index(content) + len(content)],
+            "canonical": content,
+            "kind": kind,
+            "reads": reads,
+            "writes": ["x"],
+        }
+        for line, column, content, kind, reads in (
+            (2, 12, "int x = 0", "DeclStmt", []),
+            (4, 8, "x++", "UnaryOperator", ["x"]),
+        )
+    ]
+
+    results_directory = tmp_path / "results"
+    results_directory.mkdir()
+    for name, records in (("loops", loops), ("functions", functions), ("statements", statements)):
+        lines = "".join(f"{json.dumps(record)}\n" for record in records)
+        (results_directory / f"{name}.ndjson").write_text(lines)
+    analysis = ClangAnalyser.load_results(project, str(results_directory))
+
+    # without the insertion points of the backend, one is placed after every statement
+    assert [str(point.location) for point in analysis.insertions] == ["main.cpp@2:12", "main.cpp@4:8"]
+
+    insertions = [{"location": f"{filename}@4:8", "visible": ["x"]}]
+    (results_directory / "insertion-points.ndjson").write_text(f"{json.dumps(insertions[0])}\n")
+    analysis = ClangAnalyser.load_results(project, str(results_directory))
+    assert [str(point.location) for point in analysis.insertions] == ["main.cpp@4:8"]
+    assert [point.visible for point in analysis.insertions] == [frozenset({"x"})]
+    assert analysis.snippets is None
+
+    # snippets with the same content are combined
+    snippets = [
+        {"kind": "void-call", "contents": "f()", "locations": [f"{filename}@4:5::4:7"], "reads": []},
+        {"kind": "void-call", "contents": "f()", "locations": [f"{filename}@2:3::2:5"], "reads": []},
+    ]
+    (results_directory / "snippets.ndjson").write_text("".join(f"{json.dumps(s)}\n" for s in snippets))
+    analysis = ClangAnalyser.load_results(project, str(results_directory))
+    assert analysis.snippets is not None
+    assert len(analysis.snippets) == 1
+    assert [str(location) for location in analysis.snippets["f()"].locations] == [
+        "main.cpp@2:3::2:5",
+        "main.cpp@4:5::4:7",
+    ]
+
+    assert [statement.content for statement in analysis.statements] == ["int x = 0", "x++"]
+    assert [function.name for function in analysis.functions] == ["main"]
+    assert analysis.is_inside_loop(FileLocation.from_string("main.cpp@4:5"))
+
+    # the same results may also be given as JSON arrays
+    for name, records in (
+        ("loops", loops),
+        ("functions", functions),
+        ("statements", statements),
+        ("insertion-points", insertions),
+        ("snippets", snippets),
+    ):
+        (results_directory / f"{name}.ndjson").unlink()
+        (results_directory / f"{name}.json").write_text(json.dumps(records))
+    assert ClangAnalyser.load_results(project, str(results_directory)).to_dict() == analysis.to_dict()
+
+
+def test_incremental_index(tmp_path) -> None:
+    source = "#include \"util.h\"\nint main() {\n  return f();\n}\n"
+    (tmp_path / "main.cpp").write_text(source)
+    (tmp_path / "util.h").write_text("int f() { return 0; }\n")
+    filename = str(tmp_path / "main.cpp")
+    project = kaskara.LocalProject(directory=str(tmp_path), files={"main.cpp"})
+    container = LocalProjectContainer(project)
+
+    statements = [{
+        "location": f"{filename}@3:3::3:13",
+        "offsets": [source.index("return f()"), source.index("return f()") + 10],
+        "canonical": "return f()",
+        "kind": "ReturnStmt",
+        "reads": [],
+        "writes": [],
+    }]
+    results_directory = tmp_path / "results"
+    results_directory.mkdir()
+    for name, records in (("loops", []), ("functions", []), ("statements", statements)):
+        (results_directory / f"{name}.ndjson").write_text("".join(f"{json.dumps(r)}\n" for r in records))
+    analysis = ClangAnalyser.load_results(project, str(results_directory))
+
+    dependencies = [filename, str(tmp_path / "util.h")]
+    index = IncrementalIndex(analysis, {"main.cpp": container.hash_files(dependencies)})
+    assert index.outdated({"main.cpp", "other.cpp"}, container.hash_files(index.tracked_files())) == {"other.cpp"}
+
+    index_filename = str(tmp_path / "index.pkl")
+    index.save(index_filename)
+    index = IncrementalIndex.load(index_filename)
+    assert len(list(index.analysis.statements)) == 1
+
+    # changing an included header invalidates the translation unit
+    (tmp_path / "util.h").write_text("int f() { return 1; }\n")
+    assert index.outdated({"main.cpp"}, container.hash_files(index.tracked_files())) == {"main.cpp"}
+    assert not list(index.analysis.without_files({"main.cpp"}).statements)
+
+    with pytest.raises(kaskara.exceptions.KaskaraException):
+        IncrementalIndex.load(str(tmp_path / "util.h"))
+
+
+def test_index_isolates_failed_files(tmp_path, monkeypatch) -> None:
+    files = {f"file{i}.cpp" for i in range(7)}
+    for filename in files:
+        (tmp_path / filename).write_text("int main() { return 0; }\n")
+    project = kaskara.LocalProject(directory=str(tmp_path), files=files)
+    analyser = ClangAnalyser(project, LocalProjectContainer(project), _batch_size=4)
+
+    attempts = []
+
+    def index(files, *, dependencies=False, time_limit=None):
+        attempts.append(list(files))
+        if "file5.cpp" in files:
+            raise kaskara.exceptions.KaskaraException("crashed")
+        return analyser._read_analysis(frozenset(files)), ({} if dependencies else None)
+
+    monkeypatch.setattr(analyser, "_index", index)
+    analysis = analyser.run()
+    assert analyser.failed_files == {"file5.cpp"}
+    assert analysis.files == files
+    assert attempts[0] == ["file0.cpp", "file1.cpp", "file2.cpp", "file3.cpp"]
+    assert ["file5.cpp"] in attempts
+
+    incremental = analyser.run_incremental()
+    assert incremental.failed == {"file5.cpp"}
+    assert "file5.cpp" not in incremental.dependencies
+
+    project = attr.evolve(project, ignore_errors=False)
+    analyser = ClangAnalyser(project, LocalProjectContainer(project))
+    monkeypatch.setattr(analyser, "_index", index)
+    with pytest.raises(kaskara.exceptions.KaskaraException):
+        analyser.run()
+
+
+def test_statements_without_facts(tmp_path) -> None:
+    project = kaskara.LocalProject(directory=str(tmp_path), files={"main.cpp"})
+    facts = StatementFacts.profile("locations")
+    assert facts.to_backend_args() == ["--no-read-write", "--no-visibility", "--no-liveness"]
+
+    statement = ClangStatement.from_dict(project, {
+        "location": f"{tmp_path}/main.cpp@2:3::2:11",
+        "content": "int x = 0",
+        "canonical": "int x = 0;",
+        "kind": "DeclStmt",
+        "requires_syntax": [],
+    })
+    assert statement.reads is None
+    assert statement.visible is None
+    assert statement.live_after is None
+    assert statement.to_dict()["live_before"] is None
+
+    with pytest.raises(kaskara.exceptions.KaskaraException):
+        StatementFacts.profile("fast")
+
+
+def test_statements_share_symbols() -> None:
+    project = kaskara.LocalProject(directory="/workspace", files={"main.cpp"})
+    symbols = SymbolTable()
+    first, second = (
+        ClangStatement.from_dict(
+            project,
+            {
+                "location": f"/workspace/main.cpp@{line}:3::{line}:8",
+                "content": "x = y",
+                "canonical": "x = y",
+                "kind": "BinaryOperator",
+                "reads": ["y"],
+                "writes": ["x"],
+                "visible": ["x", "y"],
+            },
+            symbols=symbols,
+        )
+        for line in (2, 3)
+    )
+    assert first.visible == frozenset({"x", "y"})
+    assert first.visible is second.visible
+    assert first.reads is second.reads
+    assert next(iter(first.writes)) is next(iter(second.writes))
+    assert first.live_before is first.live_after
+
+
+def test_functions_encloses_innermost() -> None:
+    def function(name: str, location: str) -> ClangFunction:
+        return ClangFunction(
+            name=name,
+            location=FileLocationRange.from_string(location),
+            body_location=FileLocationRange.from_string(location),
+            return_type="void" if name == "lambda" else "int",
+            is_global=True,
+            is_pure=False,
+        )
+
+    functions = ProgramFunctions.from_functions("/workspace", [
+        function("main", "main.cpp@1:1::9:2"),
+        function("lambda", "main.cpp@3:12::5:4"),
+        function("helper", "main.cpp@11:1::13:2"),
+        function("other", "other.cpp@1:1::3:2"),
+    ])
+
+    def encloses(location: str) -> str | None:
+        func = functions.encloses(FileLocation.from_string(location))
+        return func.name if func else None
+
+    assert encloses("main.cpp@2:3") == "main"
+    assert encloses("main.cpp@3:12") == "lambda"
+    assert encloses("main.cpp@4:5") == "lambda"
+    assert encloses("main.cpp@5:4") == "main"
+    assert encloses("main.cpp@10:1") is None
+    assert encloses("main.cpp@12:1") == "helper"
+    assert encloses("/workspace/main.cpp@4:5") == "lambda"
+    assert encloses("missing.cpp@1:1") is None
+    assert functions.in_file("/workspace/main.cpp").encloses(FileLocation.from_string("main.cpp@4:5")).name == "lambda"
+
+    analysis = kaskara.Analysis(
+        files=frozenset({"main.cpp", "other.cpp"}),
+        loops=kaskara.loops.ProgramLoops.from_body_location_ranges("/workspace", []),
+        functions=functions,
+        statements=kaskara.statements.ProgramStatements.build("/workspace", []),
+        insertions=kaskara.insertions.ProgramInsertionPoints([]),
+    )
+    assert analysis.is_inside_void_function(FileLocation.from_string("main.cpp@4:5"))
+    assert not analysis.is_inside_void_function(FileLocation.from_string("main.cpp@2:3"))
+
+
+def test_statements_lookup_by_line_and_range() -> None:
+    project = kaskara.LocalProject(directory="/workspace", files={"main.cpp"})
+    statements = kaskara.statements.ProgramStatements.build("/workspace", [
+        ClangStatement.from_dict(project, {
+            "location": f"/workspace/main.cpp@{location}",
+            "content": "",
+            "canonical": "",
+            "kind": kind,
+        })
+        for location, kind in (
+            ("2:3::5:4", "WhileStmt"),
+            ("3:5::3:9", "UnaryOperator"),
+            ("4:5::4:12", "CallExpr"),
+            ("6:3::6:12", "ReturnStmt"),
+        )
+    ])
+
+    def kinds(found) -> list[str]:
+        return [stmt.kind for stmt in found]
+
+    assert kinds(statements.at_line(FileLine("main.cpp", 3))) == ["UnaryOperator"]
+    assert kinds(statements.at_line(FileLine("/workspace/main.cpp", 6))) == ["ReturnStmt"]
+    assert kinds(statements.at_line(FileLine("main.cpp", 1))) == []
+    assert kinds(statements.at_line(FileLine("other.cpp", 3))) == []
+
+    assert kinds(statements.containing(FileLocation.from_string("main.cpp@3:6"))) == ["UnaryOperator", "WhileStmt"]
+    assert kinds(statements.containing(FileLocation.from_string("main.cpp@5:4"))) == []
+
+    overlapping = statements.overlapping(FileLocationRange.from_string("main.cpp@4:1::6:4"))
+    assert kinds(overlapping) == ["WhileStmt", "CallExpr", "ReturnStmt"]
+    overlapping = statements.overlapping(FileLocationRange.from_string("main.cpp@5:4::6:3"))
+    assert kinds(overlapping) == []
+
+    in_file = statements.in_file("/workspace/main.cpp")
+    assert len(in_file) == 4
+    assert in_file.filename == "main.cpp"
+    assert kinds(in_file.at_line(FileLine("main.cpp", 4))) == ["CallExpr"]
+    assert kinds(in_file.at_line(FileLine("other.cpp", 4))) == []
+    assert len(statements.in_file("other.cpp")) == 0
+
+
+def test_statements_read_unlisted_sources(tmp_path) -> None:
+    source = "int main() {\n  return 0;\n}\n"
+    (tmp_path / "real").mkdir()
+    (tmp_path / "real" / "main.cpp").write_text(source)
+    (tmp_path / "main.cpp").symlink_to(tmp_path / "real" / "main.cpp")
+    project = kaskara.LocalProject(directory=str(tmp_path), files={"main.cpp"})
+    analyser = ClangAnalyser(project, LocalProjectContainer(project))
+
+    # the backend refers to the file by its real path rather than via the symlink
+    start = source.index("return")
+    statements = analyser._read_statements_from_jsn([{
+        "location": f"{tmp_path}/real/main.cpp@2:3::2:11",
+        "offsets": [start, start + len("return 0")],
+        "canonical": "return 0;",
+        "kind": "ReturnStmt",
+    }])
+    assert [statement.content for statement in statements] == ["return 0"]
+
+    with pytest.raises(kaskara.exceptions.KaskaraException, match="missing source code"):
+        analyser._read_statements_from_jsn([{
+            "location": f"{tmp_path}/missing.cpp@1:1::1:5",
+            "offsets": [0, 4],
+            "canonical": "x;",
+            "kind": "DeclRefExpr",
+        }])
+
+
+def test_compact_requires_msgpack(tmp_path, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "msgpack", None)
+    project = kaskara.LocalProject(directory=str(tmp_path), files={"main.cpp"})
+    with pytest.raises(kaskara.exceptions.KaskaraException, match="compact"):
+        ClangAnalyser(project, LocalProjectContainer(project), _compact=True)
+    with pytest.raises(kaskara.exceptions.KaskaraException, match="compact"), \
+            ClangAnalyser.for_project(project, compact=True):
+        pass
+
+
+def test_load_compact_results(tmp_path) -> None:
+    msgpack = pytest.importorskip("msgpack")
+    source = "int main() {\n  int x = 0;\n  while (x < 10) {\n    x++;\n  }\n  return x;\n}\n"
+    (tmp_path / "main.cpp").write_text(source)
+    filename = str(tmp_path / "main.cpp")
+    project = kaskara.LocalProject(directory=str(tmp_path), files={"main.cpp"})
+
+    databases = {
+        "loops": [{"kind": 0, "location": [0, 3, 3, 5, 3], "body": [0, 3, 18, 5, 3]}],
+        "functions": [{
+            "name": "main",
+            "location": [0, 1, 1, 7, 1],
+            "body": [0, 1, 12, 7, 1],
+            "return-type": "int",
+            "global": True,
+            "pure": False,
+        }],
+        "statements": [
+            {
+                "location": [0, 2, 3, 2, 12],
+                "offsets": [15, 24],
+                "canonical": "int x = 0",
+                "kind": 1,
+                "reads": [],
+                "writes": [3],
+                "visible": [3],
+            },
+            {
+                "location": [0, 4, 5, 4, 8],
+                "offsets": [49, 52],
+                "canonical": "x++",
+                "kind": 2,
+                "reads": [3],
+                "writes": [3],
+                "visible": [3],
+            },
+        ],
+        "insertion-points": [{"location": [0, 4, 8], "visible": [3]}],
+    }
+    results_directory = tmp_path / "results"
+    results_directory.mkdir()
+    for name, entries in databases.items():
+        database = {
+            "format": "kaskara-compact",
+            "version": 1,
+            "files": [filename],
+            "symbols": ["while", "DeclStmt", "UnaryOperator", "x"],
+            "entries": entries,
+        }
+        (results_directory / f"{name}.msgpack").write_bytes(msgpack.packb(database))
+    analysis = ClangAnalyser.load_results(project, str(results_directory))
+
+    statements = list(analysis.statements)
+    assert [statement.content for statement in statements] == ["int x = 0", "x++"]
+    assert [str(statement.location) for statement in statements] == ["main.cpp@2:3::2:12", "main.cpp@4:5::4:8"]
+    assert [statement.kind for statement in statements] == ["DeclStmt", "UnaryOperator"]
+    assert statements[0].visible is statements[1].visible == frozenset({"x"})
+    assert [function.name for function in analysis.functions] == ["main"]
+    assert [str(point.location) for point in analysis.insertions] == ["main.cpp@4:8"]
+    assert analysis.is_inside_loop(FileLocation.from_string("main.cpp@4:5"))
@@ -1,13 +1,23 @@
+import ast
+import io
 import os
+import pickle
 
 import docker as _docker
+import astor
 import dockerblade as _dockerblade
 import pytest
 
 import kaskara
-from kaskara.core import FileLine
+from kaskara.container import LocalProjectContainer
+from kaskara.core import FileLine, FileLocation, FileLocationRange
 from kaskara.functions import ProgramFunctions
 from kaskara.loops import ProgramLoops
+from kaskara.python.analyser import PythonAnalyser
+from kaskara.python.analysis import PythonStatement
+from kaskara.python.cache import PythonAnalysisCache
+from kaskara.python.collector import collect_source
+from kaskara.source import SourceSpan
 from kaskara.statements import ProgramStatements
 
 DIR_HERE = os.path.dirname(__file__)
@@ -89,3 +99,177 @@ def test_collect_loops(flask):
         body_locations = list(loops._covered_by_loop_bodies)
 
         assert len(body_locations) == 3
+
+
+def test_collect_file(flask):
+    with flask.provision() as container:
+        filename = "flask/helpers.py"
+        analysis = kaskara.python.collector.collect_file(container, filename)
+
+        functions_visitor = kaskara.python.functions.CollectFunctionsVisitor(container)
+        functions_visitor.collect(filename)
+        statements_visitor = kaskara.python.statements.CollectStatementsVisitor(container)
+        statements_visitor.collect(filename)
+        loops_visitor = kaskara.python.loops.CollectLoopsVisitor(container)
+        loops_visitor.collect(filename)
+
+        assert list(analysis.functions) == functions_visitor.functions
+        assert list(analysis.statements) == statements_visitor.statements
+        assert list(analysis.loops) == loops_visitor.locations
+
+
+def test_analyse_local_project(tmp_path):
+    source = (
+        "def add(x, y):\n"
+        "    total = x\n"
+        "    for _ in range(y):\n"
+        "        total += 1\n"
+        "    return total\n"
+    )
+    (tmp_path / "example.py").write_text(source)
+    project = kaskara.LocalProject(str(tmp_path), {"example.py"})
+
+    with PythonAnalyser.for_project(project) as analyser:
+        analysis = analyser.run()
+
+    assert [f.name for f in analysis.functions] == ["add"]
+    statements_at_line = list(analysis.statements.at_line(FileLine("example.py", 5)))
+    assert [s.content for s in statements_at_line] == ["return total"]
+    assert analysis.is_inside_loop(FileLocation.from_string("example.py@4:9"))
+
+
+def test_analyse_with_cache(tmp_path):
+    project_directory = tmp_path / "project"
+    project_directory.mkdir()
+    (project_directory / "a.py").write_text("def f():\n    return 1\n")
+    (project_directory / "b.py").write_text("def g():\n    return 2\n")
+    project = kaskara.LocalProject(str(project_directory), {"a.py", "b.py"})
+    cache = PythonAnalysisCache(str(tmp_path / "cache"))
+
+    def analyse() -> kaskara.Analysis:
+        with PythonAnalyser.for_project(project, cache=cache) as analyser:
+            return analyser.run()
+
+    expected = analyse().to_dict()
+    assert all(cache.load(f, (project_directory / f).read_text()) for f in ("a.py", "b.py"))
+    assert analyse().to_dict() == expected
+
+    (project_directory / "b.py").write_text("def h():\n    return 3\n")
+    assert cache.load("b.py", (project_directory / "b.py").read_text()) is None
+    assert {f.name for f in analyse().functions} == {"f", "h"}
+
+
+CANONICAL_SOURCE = (
+    "import os\n"
+    "\n"
+    "\n"
+    "def classify(x, *args):\n"
+    "    \"\"\"Classifies a value.\"\"\"\n"
+    "    if x < 0:\n"
+    "        return 'negative'\n"
+    "    elif x == 0:\n"
+    "        total = [\n"
+    "    1,\n"
+    "            2]\n"
+    "    else:\n"
+    "        for y in args:\n"
+    "            if y: x += y\n"
+    "    return f'{x}'\n"
+    "\n"
+    "\n"
+    "class Example:\n"
+    "    def method(self):\n"
+    "        try:\n"
+    "            os.remove('a')\n"
+    "        except OSError:\n"
+    "            pass\n"
+)
+
+
+def test_lazy_canonical_matches_eager():
+    tree = ast.parse(CANONICAL_SOURCE)
+    position_to_node = {
+        (node.lineno, node.col_offset): node
+        for node in ast.walk(tree) if isinstance(node, ast.stmt)
+    }
+    statements = collect_source("example.py", CANONICAL_SOURCE).statements
+    assert len(statements) == 16
+    for statement in statements:
+        node = position_to_node[statement.location.start.line, statement.location.start.column]
+        assert statement.canonical == astor.to_source(node)
+
+
+def test_pickled_statement_has_no_ast():
+    class RecordingUnpickler(pickle.Unpickler):
+        modules: set[str] = set()
+
+        def find_class(self, module, name):
+            self.modules.add(module)
+            return super().find_class(module, name)
+
+    statements = collect_source("example.py", CANONICAL_SOURCE).statements
+    unpickler = RecordingUnpickler(io.BytesIO(pickle.dumps(statements)))
+    unpickled = unpickler.load()
+    assert not {"ast", "_ast"} & unpickler.modules
+    assert [s.canonical for s in unpickled] == [s.canonical for s in statements]
+
+
+def test_read_files(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("x = 1\n")
+    (tmp_path / "b.py").write_bytes("s = 'caf\u00e9'\n".encode())
+    project = kaskara.LocalProject(str(tmp_path), {"pkg/a.py", "b.py"})
+    container = LocalProjectContainer(project)
+
+    contents = container.read_files(["pkg/a.py", str(tmp_path / "b.py"), "missing.py"])
+    assert contents == {
+        "pkg/a.py": b"x = 1\n",
+        str(tmp_path / "b.py"): "s = 'caf\u00e9'\n".encode(),
+    }
+    assert container.read_files([]) == {}
+
+
+def test_analyse_with_workers(tmp_path):
+    for index in range(6):
+        (tmp_path / f"module{index}.py").write_text(
+            f"def f{index}(xs):\n"
+            f"    total = {index}\n"
+            "    for x in xs:\n"
+            "        if x:\n"
+            "            total += x\n"
+            "    return total\n",
+        )
+    project = kaskara.LocalProject(str(tmp_path), {f"module{index}.py" for index in range(6)})
+
+    def analyse(workers: int) -> kaskara.Analysis:
+        with PythonAnalyser.for_project(project, workers=workers) as analyser:
+            return analyser.run()
+
+    sequential = analyse(workers=1)
+    parallel = analyse(workers=3)
+    assert parallel.to_dict() == sequential.to_dict()
+    assert list(parallel.statements) == list(sequential.statements)
+
+
+def test_source_span():
+    text = "x = 1\ny = 'caf\u00e9'\n"
+    span = SourceSpan(text, 6, len(text) - 1)
+    assert str(span) == "y = 'caf\u00e9'"
+    assert len(span) == len("y = 'caf\u00e9'")
+
+    # offsets into bytes are byte offsets, and the text is decoded as UTF-8
+    data = text.encode()
+    byte_span = SourceSpan(data, 6, len(data) - 1)
+    assert str(byte_span) == str(span)
+    assert byte_span == span
+    assert hash(byte_span) == hash(span) == hash(str(span))
+    assert span != SourceSpan(text, 0, 5)
+
+    # statements compare and hash by their text, however it is held
+    location = FileLocationRange.from_string("example.py@2:0::2:12")
+    with_span = PythonStatement(kind="Assign", content=span, canonical="y = 'caf\u00e9'\n", location=location)
+    with_str = PythonStatement(kind="Assign", content=str(span), canonical="y = 'caf\u00e9'\n", location=location)
+    assert with_span.content == with_str.content == "y = 'caf\u00e9'"
+    assert with_span == with_str
+    assert hash(with_span) == hash(with_str)
+    assert len({with_span, with_str}) == 1